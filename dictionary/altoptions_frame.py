@@ -1,5 +1,5 @@
 import tkinter as tk
-import tkinter.font as tkFont
+from resource_cache import resources
 
 
 class AltsFrm(tk.Frame):
@@ -42,8 +42,8 @@ class AltsFrm(tk.Frame):
             lab.grid(column=0, row=i, sticky=tk.W, pady=0)
 
             if not self.labFont:
-                font = tkFont.Font(font=lab['font'])  # current app font
-                self.labFont = font.configure(size=self.labFontSize)
+                # the app font with a changed size
+                self.labFont = resources.font(size=self.labFontSize)
             lab.config(font=self.labFont)
 
             # when a label is clicked on, the corresponding video is played
@@ -46,6 +46,14 @@ class AutocompleteEntry(ttk.Entry):
         self.bind('<KeyPress>', self.deleteDefaultText)
         self.bind('<FocusOut>', self.insertDefaultText)
 
+    def setEntries(self, entries):
+        """Replace the list of expressions offered to the user.
+
+        Arguments:
+            entries (list): a list of all possible expressions (str)
+        """
+        self.entries = entries
+
     def createListboxWin(self):
         """Create a listbox with matches in a toplevel window."""
         self.listboxWin = tk.Toplevel()
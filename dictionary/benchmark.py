@@ -0,0 +1,79 @@
+"""benchmark module
+
+Micro-benchmarks of the geometry behind the sign placement: the Vect
+and Ellipse operations done on every mouse event while the ellipse is
+dragged on the DrawingCanvas, and the relief of the user's ellipse
+computed on every sign search. The time and the memory allocated per
+call are printed for each of them.
+
+Run from the 'dictionary' directory:
+
+    python benchmark.py [--repeat N]
+"""
+
+
+import argparse
+import timeit
+import tracemalloc
+from drawing_canvas import Vect, Ellipse
+from search_engine import SearchEngine
+
+
+CANVAS_SIZE = (250, 250)  # the size of the canvas in the application
+COUNT = 10000  # number of vectors kept alive in the 'Vect' benchmark
+
+
+def measure(fcn, number):
+    """Return a 2-tuple (seconds per call, bytes allocated per call).
+
+    Arguments:
+        fcn: a function without arguments
+        number (int): the number of calls timed
+    """
+    fcn()  # warm up
+    seconds = min(timeit.repeat(fcn, number=number, repeat=3)) / number
+    tracemalloc.start()
+    fcn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def benchmarks():
+    """Return a list of 3-tuples (name, function, relative number of calls)
+    of the benchmarks.
+    """
+    ellipse = Ellipse(Vect(60, 80), Vect(190, 170))
+    ellipse.changeAngle(0.5)
+    center, a, b = ellipse.center, ellipse.a, ellipse.b
+
+    searchEng = SearchEngine('dict.db', '.', 0, CANVAS_SIZE)
+    reliefFcn = searchEng._getReliefFcn(125, 125, 70, 40, 0.5)
+
+    return [('{} x Vect(x, y)'.format(COUNT),
+             lambda: [Vect(i, i) for i in range(COUNT)], 0.01),
+            ('center + a - b', lambda: center + a - b, 1),
+            ('center + (1, 2)', lambda: center + (1, 2), 1),
+            ('Ellipse.calcMarkCoords()', ellipse.calcMarkCoords, 1),
+            ('relief',
+             lambda: searchEng._getRelief(reliefFcn, vectorized=True),
+             0.01)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the sign placement geometry.')
+    parser.add_argument('--repeat', type=int, default=10000,
+                        help='number of calls of the quickest benchmarks')
+    args = parser.parse_args()
+
+    print('{:<28}{:>14}{:>14}'.format('benchmark', 'us per call',
+                                      'bytes'))
+    for name, fcn, share in benchmarks():
+        number = max(1, int(args.repeat * share))
+        seconds, peak = measure(fcn, number)
+        print('{:<28}{:>14.2f}{:>14}'.format(name, seconds * 1e6, peak))
+
+
+if __name__ == '__main__':
+    main()
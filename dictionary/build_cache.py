@@ -0,0 +1,282 @@
+"""build_cache module
+
+A script that precomputes the data used by the Dictionary application
+to avoid decoding the video files at runtime. The results are stored
+in the 'cache' directory, the application works without them, only slower.
+
+Run from the 'dictionary' directory:
+
+    python build_cache.py posters
+    python build_cache.py strips [--step N]
+    python build_cache.py keyframes
+    python build_cache.py videometa [--processes N]
+    python build_cache.py dedupe
+    python build_cache.py sprites
+    python build_cache.py similarity
+
+commands:
+    posters: store the first frames of the videos, scaled to the width
+        of the main video and of the thumbnails
+    strips: store every N-th frame of the videos (default is every frame),
+        scaled to the width of the thumbnails, as memory-mappable frame strips
+    keyframes: store the frame counts and the keyframes of the videos
+    videometa: store the metadata of the videos (frame size, frame rate,
+        frame count, duration, file size, content hash) in the 'videometa'
+        table of the application database
+    dedupe: report the video files with the same content, and the bytes
+        and the decoding they save (the duplicates are played from one
+        canonical file, and the caches are built only for the canonical
+        files, both based on the 'videometa' table)
+    sprites: pack the handshape images, resized to the size they are
+        displayed at in the handshape selection, into one sprite atlas
+    similarity: store the handshape similarity matrix derived from the
+        groups of similar handshapes in the 'handshapesimilarity' table
+        of the application database, as a seed to be tuned (an existing
+        table is left as it is)
+"""
+
+
+import argparse
+import concurrent.futures
+import os
+import sqlite3
+import numpy as np
+from main_frame import MainFrm
+from shape_select_frame import ShapeSelectFrm
+from sprite_atlas import SpriteAtlas
+from keyframe_index import KeyframeIndex
+from video_frame import MyVideoCapture, scaleFrame
+from video_library import VideoLibrary
+from search_engine import SearchEngine
+from video_meta import (loadVideoMeta, probeVideo, findDuplicates,
+                        canonicalNames)
+
+
+def listVideos(vfdir, dbpath=None):
+    """Return a sorted list of paths to the video files in 'vfdir'.
+
+    If a database is given, the files that are duplicates of other files
+    according to its 'videometa' table are left out.
+    """
+    duplicates = {}
+    if dbpath:
+        duplicates = canonicalNames(loadVideoMeta(dbpath))
+    return [os.path.join(vfdir, vf) for vf in sorted(os.listdir(vfdir))
+            if vf not in duplicates]
+
+
+def buildPosters(vfdir, cachedir, dbpath):
+    """Store the first frame of each video in the poster cache.
+
+    Each frame is stored scaled to the widths of the main video
+    and of the thumbnail videos.
+
+    Arguments:
+        vfdir (str): a path to the directory with video files
+        cachedir (str): a path to the directory with caches
+        dbpath (str): the database file path, the video files that are
+            duplicates according to its 'videometa' table are skipped
+    """
+    videoLib = VideoLibrary(0, cachedir)
+    widths = (MainFrm.THUMB_WIDTH, MainFrm.VIDEO_WIDTH)
+
+    def posters():
+        for video_source in listVideos(vfdir, dbpath):
+            flag, frame = MyVideoCapture(video_source).getFrame()
+            if not flag:
+                print('cannot read {}, skipped'.format(video_source))
+                continue
+            for width in widths:
+                yield video_source, scaleFrame(frame, width)
+
+    videoLib.posterCache.build(posters())
+    print('posters stored in {}'.format(videoLib.posterCache.dbpath))
+
+
+def buildStrips(vfdir, cachedir, dbpath, step):
+    """Store a thumbnail-sized frame strip of each video.
+
+    Arguments:
+        vfdir (str): a path to the directory with video files
+        cachedir (str): a path to the directory with caches
+        dbpath (str): the database file path, the video files that are
+            duplicates according to its 'videometa' table are skipped
+        step (int): every step-th frame of a video is stored
+    """
+    videoLib = VideoLibrary(0, cachedir)
+    width = MainFrm.THUMB_WIDTH
+
+    def strips():
+        for video_source in listVideos(vfdir, dbpath):
+            video = MyVideoCapture(video_source)
+            frames = []
+            flag, frame = video.getFrame(width)
+            while flag:
+                frames.append(frame)
+                video.skipFrames(step - 1)
+                flag, frame = video.getFrame(width)
+            if not frames:
+                print('cannot read {}, skipped'.format(video_source))
+                continue
+            yield video_source, video.fps, np.stack(frames)
+
+    videoLib.strips.build(strips(), width, step)
+    print('strips stored in {}'.format(videoLib.strips.stripdir))
+
+
+def buildKeyframes(vfdir, cachedir, dbpath):
+    """Store the frame counts and the keyframes of the videos.
+
+    Arguments:
+        vfdir (str): a path to the directory with video files
+        cachedir (str): a path to the directory with caches
+        dbpath (str): the database file path, the video files that are
+            duplicates according to its 'videometa' table are skipped
+    """
+    index = KeyframeIndex(os.path.join(cachedir, 'keyframes.json'))
+    index.build(listVideos(vfdir, dbpath))
+    print('keyframe index stored in {}'.format(index.path))
+
+
+def buildVideoMeta(vfdir, dbpath, processes):
+    """Probe the videos in parallel and store their metadata in the
+    'videometa' table of the database.
+
+    Arguments:
+        vfdir (str): a path to the directory with video files
+        dbpath (str): the database file path
+        processes (int): the number of processes probing the videos,
+            None means the number of CPUs
+    """
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        metas = list(executor.map(probeVideo, listVideos(vfdir)))
+
+    with sqlite3.connect(dbpath) as conn:
+        cursor = conn.cursor()
+        cursor.execute('DROP TABLE IF EXISTS videometa')
+        cursor.execute('CREATE TABLE videometa(\
+                        videofile varchar(60) PRIMARY KEY, width integer, \
+                        height integer, fps real, frames integer, \
+                        duration real, size integer, hash char(40))')
+        cursor.executemany('INSERT INTO videometa VALUES \
+                            (?, ?, ?, ?, ?, ?, ?, ?)',
+                           [(name,) + tuple(meta) for name, meta in metas])
+    print('metadata of {} videos stored in {}'.format(len(metas), dbpath))
+
+
+def reportDuplicates(dbpath):
+    """Print the groups of the video files with the same content, and
+    the disk space and the decoding saved by playing and caching only
+    one file of each group.
+
+    Arguments:
+        dbpath (str): the database file path
+    """
+    meta = loadVideoMeta(dbpath)
+    if not meta:
+        print('no video metadata in {}, run "python build_cache.py '
+              'videometa" first'.format(dbpath))
+        return
+    duplicates = findDuplicates(meta)
+    for name in sorted(duplicates):
+        print('{}: {}'.format(name, ', '.join(duplicates[name])))
+
+    names = [name for group in duplicates.values() for name in group]
+    savedBytes = sum(meta[name].size for name in names)
+    savedFrames = sum(meta[name].frames for name in names)
+    print('{} of {} video files are duplicates'.format(len(names),
+                                                       len(meta)))
+    print('saved: {} bytes of cached video files, decoding of {} frames '
+          'per pass over all the videos'.format(savedBytes, savedFrames))
+
+
+def buildSprites(imgdir, cachedir):
+    """Pack the handshape images into a sprite atlas.
+
+    Arguments:
+        imgdir (str): a path to the directory with images
+        cachedir (str): a path to the directory with caches
+    """
+    atlas = SpriteAtlas(os.path.join(cachedir, 'handshapes'))
+    paths = [os.path.join(imgdir, '{:02d}.png'.format(i + 1))
+             for i in range(ShapeSelectFrm.SHAPES_COUNT)]
+    atlas.build(paths, ShapeSelectFrm.LAB_WIDTH, ShapeSelectFrm.LAB_HEIGHT)
+    print('sprite atlas stored in {}.png'.format(atlas.path))
+
+
+def buildSimilarity(dbpath):
+    """Store the handshape similarity matrix derived from the handshape
+    groups in the 'handshapesimilarity' table of the database, unless
+    the table exists already.
+
+    Only the pairs of different shapes with a non-zero similarity are
+    stored, each pair once.
+
+    Arguments:
+        dbpath (str): the database file path
+    """
+    similarity = SearchEngine.seedSimilarity()
+    pairs = [(i, j, similarity[i, j])
+             for i in range(1, len(similarity))
+             for j in range(i + 1, len(similarity))
+             if similarity[i, j] > 0]
+
+    with sqlite3.connect(dbpath) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' \
+                        AND name='handshapesimilarity'")
+        if cursor.fetchone():
+            print('the handshapesimilarity table exists in {}, drop it '
+                  'to store the seed again'.format(dbpath))
+            return
+        cursor.execute('CREATE TABLE handshapesimilarity(\
+                        shape1 integer, shape2 integer, similarity real, \
+                        PRIMARY KEY (shape1, shape2))')
+        cursor.executemany('INSERT INTO handshapesimilarity VALUES \
+                            (?, ?, ?)', pairs)
+    print('similarity of {} pairs of handshapes stored in {}'.format(
+        len(pairs), dbpath))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Precompute the data used by the Dictionary application.')
+    parser.add_argument('command', choices=['posters', 'strips', 'keyframes',
+                                            'videometa', 'dedupe',
+                                            'sprites', 'similarity'])
+    parser.add_argument('--step', type=int, default=1,
+                        help='store every N-th frame in the strips')
+    parser.add_argument('--vfdir', default='videofiles',
+                        help='the directory with video files')
+    parser.add_argument('--imgdir', default='images',
+                        help='the directory with images')
+    parser.add_argument('--cachedir', default='cache',
+                        help='the directory where the results are stored')
+    parser.add_argument('--dbpath', default='dict.db',
+                        help='the database where the video metadata and '
+                             'the handshape similarity are stored')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='the number of processes probing the videos '
+                             '(default is the number of CPUs)')
+    args = parser.parse_args()
+
+    vfdir = os.path.abspath(args.vfdir)
+    imgdir = os.path.abspath(args.imgdir)
+    cachedir = os.path.abspath(args.cachedir)
+    dbpath = os.path.abspath(args.dbpath)
+    os.makedirs(cachedir, exist_ok=True)
+
+    if args.command == 'posters':
+        buildPosters(vfdir, cachedir, dbpath)
+    elif args.command == 'strips':
+        buildStrips(vfdir, cachedir, dbpath, args.step)
+    elif args.command == 'keyframes':
+        buildKeyframes(vfdir, cachedir, dbpath)
+    elif args.command == 'videometa':
+        buildVideoMeta(vfdir, dbpath, args.processes)
+    elif args.command == 'dedupe':
+        reportDuplicates(dbpath)
+    elif args.command == 'sprites':
+        buildSprites(imgdir, cachedir)
+    elif args.command == 'similarity':
+        buildSimilarity(dbpath)
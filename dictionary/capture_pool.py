@@ -0,0 +1,166 @@
+import collections
+import threading
+try:  # relative imports used in tests
+    from .video_frame import MyVideoCapture
+except:
+    from video_frame import MyVideoCapture
+
+
+class CapturePool():
+    """A bounded pool of open video captures (MyVideoCapture objects).
+
+    A capture is taken from the pool by acquire() and must be given back
+    by release() when it is no longer read. The released captures stay
+    open, so that the next acquire() of the same video only rewinds
+    the capture to the first frame instead of opening the file again.
+
+    The number of open captures is limited by 'maxOpen': to open a new
+    capture, the least recently released idle capture is closed. If all
+    the captures are in use, acquire() waits until one is released,
+    at most 'timeout' seconds, then it opens the capture over the limit
+    (this is counted in the 'overflows' metric).
+
+    The pool may be shared by several threads.
+
+    Methods:
+        acquire(video_source, block=True, rewind=True):
+            Return a capture of a video, positioned at the first frame.
+        release(capture):
+            Give a capture back to the pool.
+        close():
+            Close all the idle captures.
+        stats():
+            Return the pool metrics.
+    """
+
+    def __init__(self, maxOpen, timeout=1):
+        """Create an empty pool.
+
+        Arguments:
+            maxOpen (int): the maximal number of open captures
+            timeout (float): max time in seconds to wait for a capture
+                to be released when the limit is reached (default is 1)
+        """
+        self.maxOpen = maxOpen
+        self.timeout = timeout
+        # the captures that are not in use: capture -> video_source,
+        # the least recently released first
+        self.idle = collections.OrderedDict()
+        self.busy = set()  # the captures in use
+        self.opening = 0  # number of captures being opened
+        self.opened = 0  # number of captures opened
+        self.reused = 0  # number of acquires served by a rewind
+        self.overflows = 0  # number of captures opened over the limit
+        self.peak = 0  # max number of captures open at a time
+        self.condition = threading.Condition()
+
+    def __len__(self):
+        """Return the number of open captures."""
+        return len(self.idle) + len(self.busy) + self.opening
+
+    def acquire(self, video_source, block=True, rewind=True):
+        """Return a capture of 'video_source' positioned at the first frame.
+
+        Arguments:
+            video_source (str): a path to the video file
+            block (bool): if False, return None at once when all
+                the captures are in use (default is True)
+            rewind (bool): if False, an idle capture of the video is
+                returned at the position where it was left, see
+                MyVideoCapture.position (default is True)
+        """
+        with self.condition:
+            capture = self.findIdle(video_source)
+            if capture is None:
+                if not self.makeRoom(block):
+                    return None
+                self.opening += 1
+            else:
+                self.busy.add(capture)
+
+        if capture is not None and not rewind:
+            return capture
+        if capture is not None:
+            # reuse the open capture
+            if capture.rewind():
+                with self.condition:
+                    self.reused += 1
+                return capture
+            # the capture can't seek, open the video again in its place
+            with self.condition:
+                self.busy.discard(capture)
+                capture.release()
+                self.opening += 1
+
+        capture = MyVideoCapture(video_source)
+        with self.condition:
+            self.opening -= 1
+            self.opened += 1
+            self.busy.add(capture)
+            self.peak = max(self.peak, len(self))
+        return capture
+
+    def findIdle(self, video_source):
+        """Remove an idle capture of 'video_source' from the idle captures
+        and return it, or None if there is none. The lock must be held.
+        """
+        for capture, source in self.idle.items():
+            if source == video_source:
+                del self.idle[capture]
+                return capture
+        return None
+
+    def makeRoom(self, block=True):
+        """Make room for a new capture, the lock must be held.
+
+        Close the least recently released idle capture if the limit is
+        reached, wait for a capture to be released if all are in use.
+        Return False if all are in use and 'block' is False.
+        """
+        if len(self) >= self.maxOpen and not self.idle:
+            if not block:
+                return False
+            self.condition.wait_for(
+                lambda: len(self) < self.maxOpen or self.idle, self.timeout)
+        if len(self) >= self.maxOpen:
+            if self.idle:
+                capture, source = self.idle.popitem(last=False)
+                capture.release()
+            else:
+                self.overflows += 1
+        return True
+
+    def release(self, capture):
+        """Give 'capture' back to the pool, it stays open for reuse.
+
+        If the pool is over its limit, the capture is closed instead.
+        """
+        with self.condition:
+            self.busy.discard(capture)
+            if len(self) < self.maxOpen:
+                self.idle[capture] = capture.videoSource
+            else:
+                capture.release()
+            self.condition.notify()
+
+    def close(self):
+        """Close all the idle captures."""
+        with self.condition:
+            for capture in self.idle:
+                capture.release()
+            self.idle.clear()
+            self.condition.notify_all()
+
+    def stats(self):
+        """Return a dict with the current number of open captures ('open',
+        'busy', 'idle') and the counters 'opened', 'reused', 'overflows'
+        and 'peak'.
+        """
+        with self.condition:
+            return {'open': len(self),
+                    'busy': len(self.busy),
+                    'idle': len(self.idle),
+                    'opened': self.opened,
+                    'reused': self.reused,
+                    'overflows': self.overflows,
+                    'peak': self.peak}
@@ -78,10 +78,12 @@ class CatFrm(tk.Frame):
                            sticky=tk.N+tk.E+tk.S+tk.W,
                            pady=(0, self.verticalSpace))
 
-        # create empty scrolledlist
+        # create empty scrolledlist, only its visible rows are rendered,
+        # so switching to a large category is as fast as to a small one
         self.scrolledlist = ScrolledList(self,
                                          self.scrolledlistHandler,
-                                         self.height)
+                                         self.height,
+                                         virtual=True)
         self.scrolledlist.grid(column=1, row=5,
                                sticky=tk.N+tk.E+tk.W,
                                pady=(0, self.verticalSpace))
@@ -102,7 +104,6 @@ class CatFrm(tk.Frame):
         self.subcatvar.set(' -- Zvolte podkategorii --')
         wordlist = self.searchEng.findWords(self.catvar, 'cat')
         self.scrolledlist.setOptions(wordlist)
-        self.scrolledlist.treeview.yview_moveto(0)
 
     def subcatHandler(self, event):
         """Update the options in the scrolled list to the words
@@ -111,7 +112,6 @@ class CatFrm(tk.Frame):
         self.subcatcb.selection_clear()  # remove highlighting from combobox
         wordlist = self.searchEng.findWords(self.subcatvar, 'subcat')
         self.scrolledlist.setOptions(wordlist)
-        self.scrolledlist.treeview.yview_moveto(0)
 
     def scrolledlistHandler(self, selection):
         """Search for the word translation and display the result."""
@@ -0,0 +1,340 @@
+"""decode_pool module
+
+classes:
+    DecodePool: a pool of processes decoding videos into shared memory
+    SharedFrameSource: reads the frames of one video from shared memory
+"""
+
+
+import multiprocessing
+import queue
+import time
+import numpy as np
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+try:  # relative imports used in tests
+    from .video_frame import MyVideoCapture, FrameProducer
+except:
+    from video_frame import MyVideoCapture, FrameProducer
+
+
+# layout of the header at the beginning of each shared-memory block,
+# an int64 array with the following items:
+WRITTEN = 0  # number of frames written by the worker
+READ = 1  # number of frames released by the reader
+FINISHED = 2  # 1 when the worker has written all the frames
+HEADER_ITEMS = 3
+HEADER_SIZE = 8 * HEADER_ITEMS
+
+POLL_INTERVAL = 0.005  # s between checks of the ring buffer state
+
+
+class DecodePool():
+    """A pool of worker processes that decode videos into shared memory.
+
+    Each worker decodes one video at a time: it decodes and scales
+    the frames, and writes them into a ring buffer of 'numSlots' frames
+    in a shared-memory block that it has created for the video. The UI
+    process reads the frames directly from the block through
+    a SharedFrameSource, so the decoding doesn't compete with Tk for
+    the GIL, and no frame is pickled or copied between the processes.
+
+    The workers are started when the first video is opened. The pool
+    is only available if the multiprocessing.shared_memory module is
+    (Python 3.8 and newer), see DecodePool.available().
+
+    Methods:
+        open(video_source, width, step, onOpen, onEnd):
+            Start decoding a video in an idle worker.
+        close():
+            Stop the workers.
+    """
+
+    def __init__(self, processes, numSlots):
+        """Initialize the attributes.
+
+        Arguments:
+            processes (int): the number of worker processes
+            numSlots (int): the number of frames in each ring buffer
+        """
+        self.processes = processes
+        self.numSlots = numSlots
+        self.workers = []
+        self.idle = []  # the workers that don't decode any video
+        # the shared-memory blocks that are no longer read, but can't be
+        # closed yet because a frame read from them is still in use
+        self.detached = []
+        self.closeTimeout = 1  # s to wait for a worker process to exit
+
+    @staticmethod
+    def available():
+        """Return True if decoding into shared memory is supported."""
+        return shared_memory is not None
+
+    def start(self):
+        """Start the worker processes.
+
+        The workers are spawned rather than forked, a fork of the process
+        running Tk and the producer threads is not safe.
+        """
+        context = multiprocessing.get_context('spawn')
+        for i in range(self.processes):
+            worker = Worker(context, self.numSlots)
+            self.workers.append(worker)
+            self.idle.append(worker)
+
+    def open(self, video_source, width, step=1, onOpen=None, onEnd=None):
+        """Start decoding a video in an idle worker.
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the frames
+            step (int): only every step-th frame is decoded (default is 1)
+            onOpen: a function called with the frame rate of the video
+                when the worker has opened it (default is None)
+            onEnd: a function called with the list of all the frames
+                of the video, when they all have been read (default is None)
+        Returns:
+            a SharedFrameSource, or None if all the workers are busy
+        """
+        if not self.workers:
+            self.start()
+        if not self.idle:
+            return None
+        worker = self.idle.pop()
+        jobId = worker.submit(video_source, width, step)
+        return SharedFrameSource(self, worker, jobId, onOpen, onEnd)
+
+    def release(self, worker):
+        """Return a worker to the idle workers."""
+        if worker in self.workers and worker not in self.idle:
+            self.idle.append(worker)
+
+    def detach(self, shm):
+        """Close a shared-memory block that is no longer read.
+
+        If a frame view into the block still exists, closing is retried
+        on the next call.
+        """
+        self.detached.append(shm)
+        stillUsed = []
+        for block in self.detached:
+            try:
+                block.close()
+            except BufferError:
+                stillUsed.append(block)
+        self.detached = stillUsed
+
+    def close(self):
+        """Stop the workers, wait until they unlink their shared memory."""
+        for worker in self.workers:
+            worker.close()
+        for worker in self.workers:
+            worker.process.join(self.closeTimeout)
+        self.workers = []
+        self.idle = []
+
+
+class Worker():
+    """A worker process of a DecodePool and the means to talk to it.
+
+    The jobs are numbered, a job is cancelled by setting 'self.cancelled'
+    to its number. The worker reports the shared-memory block of a job
+    in 'self.results'.
+    """
+
+    def __init__(self, context, numSlots):
+        self.tasks = context.Queue()
+        self.results = context.Queue()
+        self.cancelled = context.Value('q', 0, lock=False)
+        self.lastJob = 0
+        self.process = context.Process(target=decodeWorker,
+                                       args=(self.tasks, self.results,
+                                             self.cancelled, numSlots),
+                                       daemon=True)
+        self.process.start()
+
+    def submit(self, video_source, width, step):
+        """Send a job to the worker, return the job number."""
+        self.lastJob += 1
+        self.tasks.put((self.lastJob, video_source, width, step))
+        return self.lastJob
+
+    def cancel(self, jobId):
+        """Make the worker stop the job with the number 'jobId'."""
+        self.cancelled.value = max(self.cancelled.value, jobId)
+
+    def close(self):
+        """Make the worker process exit."""
+        self.cancel(self.lastJob)
+        self.tasks.put(None)
+
+
+class SharedFrameSource():
+    """Frames of a video read from the ring buffer of a DecodePool worker.
+
+    A SharedFrameSource has the same interface as a FrameProducer, so that
+    it can be used by VideoFrm in its place. The frames returned by get()
+    are views into the shared memory, a frame stays valid until the next
+    frame is requested, or the source is stopped.
+    """
+
+    END = FrameProducer.END
+
+    def __init__(self, pool, worker, jobId, onOpen, onEnd):
+        self.pool = pool
+        self.worker = worker
+        self.jobId = jobId
+        self.onOpen = onOpen
+        self.onEnd = onEnd
+        self.shm = None
+        self.header = None
+        self.slots = None
+        self.holding = False  # True if the reader holds a slot
+        self.finished = False
+        self.frames = []  # copies of the frames read, passed to 'onEnd'
+
+    def start(self):
+        """Do nothing, the worker has been started by DecodePool.open()."""
+
+    def attach(self):
+        """Attach the shared-memory block of the job, if it is reported.
+
+        Raises queue.Empty if the worker hasn't opened the video yet.
+        Returns False if the worker could not read the video, or it has
+        exited.
+        """
+        while True:
+            try:
+                jobId, name, shape, fps = self.worker.results.get_nowait()
+            except queue.Empty:
+                if not self.worker.process.is_alive():
+                    return False
+                raise
+            if jobId == self.jobId:
+                break
+            # a report of a cancelled job, ignore it
+        if name is None:
+            return False
+        # the worker owns the block and unlinks it, the spawned workers
+        # share the resource tracker of this process, so attaching to
+        # the block doesn't make it tracked twice
+        self.shm = shared_memory.SharedMemory(name=name)
+        self.header = np.ndarray(HEADER_ITEMS, dtype=np.int64,
+                                 buffer=self.shm.buf)
+        self.slots = np.ndarray((self.pool.numSlots,) + tuple(shape),
+                                dtype=np.uint8, buffer=self.shm.buf,
+                                offset=HEADER_SIZE)
+        if self.onOpen:
+            self.onOpen(fps)
+        return True
+
+    def get(self):
+        """Return the next frame without blocking.
+
+        Raises queue.Empty if no frame is ready. After the last frame,
+        SharedFrameSource.END is returned.
+        """
+        if self.finished:
+            return self.END
+        if self.shm is None and not self.attach():
+            self.finish()
+            return self.END
+        if self.holding:
+            # release the slot of the previous frame
+            self.header[READ] += 1
+            self.holding = False
+        read = self.header[READ]
+        if read < self.header[WRITTEN]:
+            frame = self.slots[read % len(self.slots)]
+            self.holding = True
+            if self.onEnd:
+                self.frames.append(frame.copy())
+            return frame
+        if self.header[FINISHED]:
+            frames = self.frames
+            self.finish()
+            if self.onEnd:
+                self.onEnd(frames)
+            return self.END
+        raise queue.Empty
+
+    def stop(self):
+        """Stop reading the frames, cancel the job if it hasn't finished."""
+        if not self.finished:
+            self.worker.cancel(self.jobId)
+            self.finish()
+
+    def finish(self):
+        """Detach the shared memory and return the worker to the pool."""
+        self.finished = True
+        self.frames = []
+        if self.shm is not None:
+            self.header = None
+            self.slots = None
+            self.pool.detach(self.shm)
+            self.shm = None
+        self.pool.release(self.worker)
+
+
+def decodeWorker(tasks, results, cancelled, numSlots):
+    """The main function of a worker process: decode the videos from
+    'tasks' until None is received.
+    """
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        jobId, video_source, width, step = task
+        if cancelled.value >= jobId:
+            continue
+        decodeVideo(jobId, video_source, width, step, results, cancelled,
+                    numSlots)
+
+
+def decodeVideo(jobId, video_source, width, step, results, cancelled,
+                numSlots):
+    """Decode a video into a ring buffer in a new shared-memory block.
+
+    The block is reported in 'results' as a 4-tuple (jobId, name, shape,
+    fps). The worker writes the frames ahead of the reader as long as
+    there are free slots. The block is unlinked when the reader has
+    released all the frames, or when the job is cancelled.
+    """
+    video = MyVideoCapture(video_source)
+    flag, frame = video.getFrame(width)
+    if not flag:
+        results.put((jobId, None, None, video.fps))
+        return
+
+    shm = shared_memory.SharedMemory(
+        create=True, size=HEADER_SIZE + numSlots * frame.nbytes)
+    header = np.ndarray(HEADER_ITEMS, dtype=np.int64, buffer=shm.buf)
+    slots = np.ndarray((numSlots,) + frame.shape, dtype=np.uint8,
+                       buffer=shm.buf, offset=HEADER_SIZE)
+    try:
+        header[:] = 0
+        results.put((jobId, shm.name, frame.shape, video.fps))
+        while flag:
+            while header[WRITTEN] - header[READ] >= numSlots:
+                # the ring buffer is full, wait for the reader
+                if cancelled.value >= jobId:
+                    return
+                time.sleep(POLL_INTERVAL)
+            if cancelled.value >= jobId:
+                return
+            slots[header[WRITTEN] % numSlots] = frame
+            header[WRITTEN] += 1
+            if step > 1:
+                video.skipFrames(step - 1)
+            flag, frame = video.getFrame(width)
+        header[FINISHED] = 1
+        # keep the block until the reader has released all the frames
+        while header[READ] < header[WRITTEN] and cancelled.value < jobId:
+            time.sleep(POLL_INTERVAL)
+    finally:
+        del header, slots  # the views must be released before closing
+        shm.close()
+        shm.unlink()
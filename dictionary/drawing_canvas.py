@@ -1,6 +1,7 @@
 import tkinter as tk
 import math
 import cmath
+import numpy as np
 
 
 class DrawingCanvas(tk.Canvas):
@@ -8,10 +9,28 @@ class DrawingCanvas(tk.Canvas):
 
     An ellipse can be draw on the canvas. The ellipse can then be moved,
     resized and rotated.
+
+    While the ellipse is being dragged, the mouse motion events are
+    coalesced: only the last mouse position is kept, and the ellipse is
+    recalculated and redrawn at most once per 'self.redrawDelay' ms.
+    The items on the canvas are moved by updating their coordinates,
+    they are recreated only when the mode changes.
+
+    The function 'onChange' (if given) is called whenever the ellipse
+    has been drawn, moved, resized or rotated, i.e. at most once per
+    redraw.
     """
 
-    def __init__(self, parent, **options):
+    def __init__(self, parent, onChange=None, **options):
+        """Create the canvas.
+
+        Arguments:
+            parent: a parent tkinter widget
+            onChange: a function without arguments called when
+                the ellipse has changed (default is None)
+        """
         super().__init__(parent, **options)
+        self.onChange = onChange
         self.settings = {'width': 4,          # ellipse settings
                          'outline': 'red',
                          'fill': 'black',
@@ -44,6 +63,11 @@ class DrawingCanvas(tk.Canvas):
         self.scaleMode = False
         self.rotateMode = False
 
+        self.redrawDelay = 16  # min time in ms between redraws when dragging
+        self.motionJob = None  # keeps reference to the scheduled redraw
+        self.motionPoint = None  # the last mouse position while dragging
+        self.motionFcn = None  # updates the ellipse to 'self.motionPoint'
+
         self.bind('<ButtonPress-1>', self.onPress)
         self.bind('<B1-Motion>', self.onMotion)
         self.bind('<ButtonRelease-1>', self.onRelease)
@@ -59,12 +83,14 @@ class DrawingCanvas(tk.Canvas):
         if self.drawMode:
             # draw an ellipse
             if self.id:
-                self.delete(self.id)
-            self.id = self.create_oval(self.topLeft.x,
-                                       self.topLeft.y,
-                                       event.x, event.y,
-                                       **self.settings,
-                                       tags='ellipse')
+                self.coords(self.id, self.topLeft.x, self.topLeft.y,
+                            event.x, event.y)
+            else:
+                self.id = self.create_oval(self.topLeft.x,
+                                           self.topLeft.y,
+                                           event.x, event.y,
+                                           **self.settings,
+                                           tags='ellipse')
 
     def onRelease(self, event):
         """Create an Ellipse object and set the ellipse bindings."""
@@ -82,6 +108,8 @@ class DrawingCanvas(tk.Canvas):
             # change mode
             self.drawMode = False
             self.switchToScaleMode()
+            if self.onChange:
+                self.onChange()
 
     def onDoubleClick(self, event):
         """On ellipse double-click change the mode between scale and rotate."""
@@ -190,17 +218,18 @@ class DrawingCanvas(tk.Canvas):
         self.bind('<ButtonRelease-1>', self.stopMove)
 
     def doMove(self, event):
-        """Recalculate the ellipse params and redraw the items on canvas."""
-        endPoint = Vect(event)
+        """Schedule moving the ellipse to the mouse position."""
+        self.scheduleMotion(event, self.applyMove)
+
+    def applyMove(self, endPoint):
+        """Recalculate the ellipse params after a move to 'endPoint'."""
         shift = endPoint - self.startPoint
         self.ellipse.recalcCornersOnMove(shift)
         self.ellipse.calcMarkCoords()
 
-        self.redrawItems()
-        self.startPoint = Vect(event)
-
     def stopMove(self, event):
         """Reset the bindings to state before moving the ellipse."""
+        self.flushMotion()
         self.bind('<B1-Motion>', self.onMotion)
         self.bind('<ButtonRelease-1>', self.onRelease)
 
@@ -220,17 +249,20 @@ class DrawingCanvas(tk.Canvas):
         self.bind('<ButtonRelease-1>', self.stopScale)
 
     def doScale(self, event):
-        """Recalculate the ellipse params and redraw the items on canvas."""
-        endPoint = Vect(event)
+        """Schedule scaling the ellipse to the mouse position."""
+        self.scheduleMotion(event, self.applyScale)
+
+    def applyScale(self, endPoint):
+        """Recalculate the ellipse params after the mark has been dragged
+        to 'endPoint'.
+        """
         mouseMove = endPoint - self.startPoint
         self.ellipse.recalcCornersOnScale(mouseMove, self.movingMark)
         self.ellipse.calcMarkCoords()
 
-        self.redrawItems()
-        self.startPoint = Vect(event)
-
     def stopScale(self, event):
         """Reset cursor shape and bindings to state before scaling."""
+        self.flushMotion()
         # reset the cursor shape
         self.config(cursor='')
         self.tag_bind(self.markIds[self.movingMark], '<Leave>',
@@ -252,21 +284,23 @@ class DrawingCanvas(tk.Canvas):
         self.bind('<ButtonRelease-1>', self.stopRotate)
 
     def doRotate(self, event):
-        """Recalculate the ellipse params and redraw the items on canvas."""
+        """Schedule rotating the ellipse to the mouse position."""
+        self.scheduleMotion(event, self.applyRotate)
+
+    def applyRotate(self, endPoint):
+        """Recalculate the ellipse params after a rotation to 'endPoint'."""
         # calculate the angle difference
         startAngle = self.startPoint.getAngle(self.ellipse.center)
-        endAngle = Vect(event).getAngle(self.ellipse.center)
+        endAngle = endPoint.getAngle(self.ellipse.center)
         diffAngle = endAngle - startAngle
 
         # update the parameters of the ellipse
         self.ellipse.changeAngle(diffAngle)
         self.ellipse.calcMarkCoords()
 
-        self.redrawItems()
-        self.startPoint = Vect(event)
-
     def stopRotate(self, event):
         """Reset cursor shape and bindings to state before rotation."""
+        self.flushMotion()
         # reset the cursor shape
         self.config(cursor='')
         self.tag_bind('marks', '<Leave>', lambda ev: self.config(cursor=''))
@@ -274,36 +308,78 @@ class DrawingCanvas(tk.Canvas):
         self.bind('<B1-Motion>', self.onMotion)
         self.bind('<ButtonRelease-1>', self.onRelease)
 
+    def scheduleMotion(self, event, motionFcn):
+        """Remember the mouse position of a motion event and schedule
+        the update of the ellipse, unless it is scheduled already.
+
+        Arguments:
+            event: the motion event
+            motionFcn: a function that recalculates the ellipse params
+                for a new mouse position (Vect)
+        """
+        self.motionPoint = Vect(event)
+        self.motionFcn = motionFcn
+        if self.motionJob is None:
+            self.motionJob = self.after(self.redrawDelay, self.applyMotion)
+
+    def applyMotion(self):
+        """Update the ellipse to the last mouse position and redraw it."""
+        self.motionJob = None
+        self.motionFcn(self.motionPoint)
+        self.startPoint = self.motionPoint
+        self.redrawItems()
+        if self.onChange:
+            self.onChange()
+
+    def flushMotion(self):
+        """Apply the scheduled update of the ellipse right away."""
+        if self.motionJob is not None:
+            self.after_cancel(self.motionJob)
+            self.applyMotion()
+
     def redrawItems(self):
         """Redraw the ellipse and the scaling/rotation marks.
 
         If the angle of the ellipse rotation is zero (i.e. the ellipse
         is horizontal) draw it as an oval, otherwise draw it as a polygon.
+        The items are moved to their new coordinates, the ellipse item
+        is recreated only when it changes between an oval and a polygon.
         """
         # redraw the ellipse
-        self.delete(self.id)
         if self.ellipse.angle == 0:
-            self.id = self.create_oval(self.ellipse.topLeft.x,
-                                       self.ellipse.topLeft.y,
-                                       self.ellipse.bottomRight.x,
-                                       self.ellipse.bottomRight.y,
-                                       **self.settings,
-                                       tags='ellipse')
+            itemType = 'oval'
+            coords = (self.ellipse.topLeft.x,
+                      self.ellipse.topLeft.y,
+                      self.ellipse.bottomRight.x,
+                      self.ellipse.bottomRight.y)
         else:
+            itemType = 'polygon'
             # get tuple of points covering (densely enough) the ellipse border
-            polygonPoints = self.getPolygonPoints()
-            # draw the rotated ellipse - as a polygon
-            self.id = self.create_polygon(polygonPoints,
-                                          **self.settings,
-                                          tags='ellipse')
-
-        # redraw the marks
-        if self.scaleMode:
-            mode = 'scale'
+            coords = self.getPolygonPoints()
+
+        if self.type(self.id) == itemType:
+            self.coords(self.id, coords)
         else:
-            mode = 'rotate'
-        self.delete('marks')
-        self.drawMarks(mode=mode)
+            self.delete(self.id)
+            if itemType == 'oval':
+                self.id = self.create_oval(coords,
+                                           **self.settings,
+                                           tags='ellipse')
+            else:
+                # draw the rotated ellipse - as a polygon
+                self.id = self.create_polygon(coords,
+                                              **self.settings,
+                                              tags='ellipse')
+            # keep the marks above the ellipse
+            self.tag_raise('marks', self.id)
+
+        # move the marks
+        for mark, position in self.ellipse.markCoords.items():
+            self.coords(self.markIds[mark],
+                        position.x - self.markSize,
+                        position.y - self.markSize,
+                        position.x + self.markSize,
+                        position.y + self.markSize)
 
     def getPolygonPoints(self, steps=100):
         """Get coordinates of points placed around the ellipse border.
@@ -313,16 +389,13 @@ class DrawingCanvas(tk.Canvas):
         Returns:
             a tuple of points' coords: (x0, y0, x1, y1, ...)
         """
-        points = []
-        for i in range(steps):
-            # the angle for this step
-            theta = 2 * math.pi * float(i) / steps
-
-            point = (self.ellipse.center + math.cos(theta) * self.ellipse.a +
-                     math.sin(theta) * self.ellipse.b)
-            points.append(point.x)
-            points.append(point.y)
-        return tuple(points)
+        theta = np.linspace(0, 2 * math.pi, steps, endpoint=False)
+        cos, sin = np.cos(theta), np.sin(theta)
+        center, a, b = self.ellipse.center, self.ellipse.a, self.ellipse.b
+        points = np.empty(2 * steps)
+        points[0::2] = center.x + cos * a.x + sin * b.x
+        points[1::2] = center.y + cos * a.y + sin * b.y
+        return tuple(points.tolist())
 
 
 class Ellipse():
@@ -342,6 +415,11 @@ class Ellipse():
             where: mark-name (str), mark-position (Vect)
     """
 
+    # the marks as (mark-name, i, j): mark-position = center + i*a + j*b
+    MARK_OFFSETS = (('r', 1, 0), ('tr', 1, -1), ('t', 0, -1),
+                    ('tl', -1, -1), ('l', -1, 0), ('bl', -1, 1),
+                    ('b', 0, 1), ('br', 1, 1))
+
     def __init__(self, topLeft, bottomRight):
         """Initialize an ellipse object.
 
@@ -364,14 +442,12 @@ class Ellipse():
     def calcMarkCoords(self):
         """Calculate the coords of the scaling/rotating marks."""
         self.calcParams()
-        self.markCoords['r'] = self.center + self.a
-        self.markCoords['tr'] = self.center + self.a - self.b
-        self.markCoords['t'] = self.center - self.b
-        self.markCoords['tl'] = self.center - self.a - self.b
-        self.markCoords['l'] = self.center - self.a
-        self.markCoords['bl'] = self.center - self.a + self.b
-        self.markCoords['b'] = self.center + self.b
-        self.markCoords['br'] = self.center + self.a + self.b
+        cx, cy = self.center.x, self.center.y
+        ax, ay = self.a.x, self.a.y
+        bx, by = self.b.x, self.b.y
+        # position of a mark = center + i*a + j*b
+        for mark, i, j in self.MARK_OFFSETS:
+            self.markCoords[mark] = Vect(cx + i*ax + j*bx, cy + i*ay + j*by)
 
     def calcParams(self):
         """Calculate the ellipse parameters.
@@ -382,12 +458,14 @@ class Ellipse():
         self.center = (self.topLeft + self.bottomRight) / 2
         ab = self.bottomRight - self.center  # ab = self.a + self.b
 
-        # direction of major and minor axes
-        dirA = Vect(math.cos(self.angle), math.sin(self.angle))
-        dirB = Vect(- math.sin(self.angle), math.cos(self.angle))
+        # direction of major and minor axes: (cos, sin) and (-sin, cos)
+        cos, sin = math.cos(self.angle), math.sin(self.angle)
 
-        self.a = ab.projectOn(dirA)
-        self.b = ab.projectOn(dirB)
+        # projections of 'ab' on the (unit) directions
+        projA = ab.x * cos + ab.y * sin
+        projB = - ab.x * sin + ab.y * cos
+        self.a = Vect(projA * cos, projA * sin)
+        self.b = Vect(- projB * sin, projB * cos)
 
     def recalcCornersOnMove(self, shift):
         """Recalculate the coords of the topLeft and bottomRight corners
@@ -454,11 +532,17 @@ class Vect():
     A vector may be regarded as representing a point in plane as well.
     (the point = endpoint of the vector)
 
+    The vectors are never modified in place, all the operations return
+    new Vect objects. To keep them small and quick to create, the Vect
+    objects have no '__dict__', only the two slots.
+
     Attributes:
         x (float): x coordinate
         y (float): y coordinate
     """
 
+    __slots__ = ('x', 'y')
+
     def __init__(self, *args):
         """Initialize a Vect object.
 
@@ -476,29 +560,27 @@ class Vect():
             self.x = event.x
             self.y = event.y
         else:
-            x, y = args[0], args[1]
-            self.x = x
-            self.y = y
+            self.x, self.y = args
 
     def __add__(self, other):
         """Add 'self' and 'other'.
 
         'other' might be of type Vect, 2-tuple.
         """
-        try:
+        if isinstance(other, Vect):
             return Vect(self.x + other.x, self.y + other.y)
-        except AttributeError:
-            return self + Vect(*other)
+        x, y = other
+        return Vect(self.x + x, self.y + y)
 
     def __sub__(self, other):
         """Subtract 'other' from 'self'.
 
         'other' might be of type Vect, 2-tuple.
         """
-        try:
+        if isinstance(other, Vect):
             return Vect(self.x - other.x, self.y - other.y)
-        except AttributeError:
-            return self - Vect(*other)
+        x, y = other
+        return Vect(self.x - x, self.y - y)
 
     def __iadd__(self, other):
         """Incremental addition."""
@@ -522,7 +604,7 @@ class Vect():
 
     def __abs__(self):
         """Return the length of the vector."""
-        return abs(complex(self))
+        return math.hypot(self.x, self.y)
 
     def __repr__(self):
         return 'Vect({}, {})'.format(self.x, self.y)
@@ -545,7 +627,8 @@ class Vect():
         """Return the angel coordinate of a point repesented by 'self' vector
         with respect to a given origin."""
 
-        return cmath.phase(complex(self) - complex(origin)) % (2 * math.pi)
+        return (math.atan2(self.y - origin.y, self.x - origin.x) %
+                (2 * math.pi))
 
     def rotate(self, alpha, center=None):
         """Rotate the point represented by 'self' vector by angle alpha
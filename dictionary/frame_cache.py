@@ -0,0 +1,89 @@
+import collections
+import threading
+
+
+class FrameCache():
+    """A least-recently-used cache of decoded video frames.
+
+    The frames of a video, decoded and scaled to the width they are displayed
+    at, are stored as a list of numpy arrays under a key of the form
+    (video_source, width). When the total size of the stored frames exceeds
+    the memory budget, the least recently used videos are evicted.
+
+    The cache may be shared by several threads.
+
+    Methods:
+        get(key):
+            Return the list of frames stored under the key, or None.
+        put(key, frames):
+            Store the list of frames under the key.
+        clear():
+            Remove all the stored frames.
+    """
+
+    def __init__(self, maxBytes):
+        """Create an empty cache.
+
+        Arguments:
+            maxBytes (int): the memory budget of the cache in bytes
+        """
+        self.maxBytes = maxBytes
+        self.size = 0  # the current size of the stored frames in bytes
+        self.entries = collections.OrderedDict()  # key -> (frames, size)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        """Return the list of frames stored under 'key', or None if missing.
+
+        Arguments:
+            key: a 2-tuple (video_source (str), width (int))
+        """
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            frames, size = self.entries[key]
+            return frames
+
+    def put(self, key, frames):
+        """Store 'frames' under 'key', evict the least recently used entries
+        if the memory budget is exceeded.
+
+        The frames larger than the whole memory budget are not stored.
+
+        Arguments:
+            key: a 2-tuple (video_source (str), width (int))
+            frames (list): a list of numpy arrays
+        """
+        size = sum(frame.nbytes for frame in frames)
+        if size > self.maxBytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            while self.size + size > self.maxBytes:
+                # evict the least recently used entry
+                self._remove(next(iter(self.entries)))
+            self.entries[key] = (frames, size)
+            self.size += size
+
+    def clear(self):
+        """Remove all the stored frames."""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        """Remove the entry stored under 'key', the lock must be held."""
+        frames, size = self.entries.pop(key)
+        self.size -= size
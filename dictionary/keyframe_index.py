@@ -0,0 +1,170 @@
+import os
+import json
+import struct
+
+
+class KeyframeIndex():
+    """An index of the frame counts and keyframes of the videos.
+
+    The index is created by the build_cache.py script from the sample
+    tables of the mp4 files (see readMp4Index()) and stored in a JSON file
+    of the form:
+        {"<videofile>": {"frames": 95, "keyframes": [0, 50]}, ...}
+    where the keyframes are 0-based frame numbers.
+
+    A frame can be decoded without decoding the whole video from its
+    beginning: the decoder is positioned at the nearest keyframe before
+    the frame and it decodes forward from there. So the cost of a seek is
+    bounded by the distance between the keyframes.
+
+    Methods:
+        frameCount(video_source):
+            Return the number of frames of a video, or None.
+        keyframeBefore(video_source, index):
+            Return the nearest keyframe at or before a frame.
+        build(videos):
+            Index the videos and store the index.
+    """
+
+    def __init__(self, path):
+        """Read the index, if present.
+
+        Arguments:
+            path (str): the index file path
+        """
+        self.path = path
+        self.videos = {}  # video file name -> {'frames':, 'keyframes':}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.videos = json.load(f)
+
+    def frameCount(self, video_source):
+        """Return the number of frames of a video, or None if the video
+        is not in the index.
+
+        Arguments:
+            video_source (str): a path to the video file
+        """
+        entry = self.videos.get(os.path.basename(video_source))
+        if entry is None:
+            return None
+        return entry['frames']
+
+    def keyframeBefore(self, video_source, index):
+        """Return the nearest keyframe at or before the frame 'index'.
+
+        If the video is not in the index, 0 is returned (the first frame
+        is always a keyframe).
+
+        Arguments:
+            video_source (str): a path to the video file
+            index (int): a 0-based frame number
+        """
+        entry = self.videos.get(os.path.basename(video_source))
+        if entry is None:
+            return 0
+        keyframe = 0
+        for frame in entry['keyframes']:
+            if frame > index:
+                break
+            keyframe = frame
+        return keyframe
+
+    def build(self, videos):
+        """Index the videos and store the index.
+
+        Arguments:
+            videos: an iterable of paths to the video files
+        """
+        index = {}
+        for video_source in videos:
+            found = readMp4Index(video_source)
+            if found is None:
+                print('cannot index {}, skipped'.format(video_source))
+                continue
+            frames, keyframes = found
+            index[os.path.basename(video_source)] = {'frames': frames,
+                                                     'keyframes': keyframes}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(index, f)
+        self.videos = index
+
+
+def readMp4Index(path):
+    """Read the frame count and the keyframes of the video track
+    of an mp4 file.
+
+    The frame count is the number of samples in the sample size box
+    ('stsz'), the keyframes are listed in the sync sample box ('stss'),
+    if there is none, all the frames are keyframes.
+
+    Arguments:
+        path (str): the mp4 file path
+    Returns:
+        a 2-tuple (frame count (int), list of 0-based keyframes), or None
+        if the file has no video track
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    moov = findBox(data, 0, len(data), ['moov'])
+    if moov is None:
+        return None
+    for boxType, start, end in iterBoxes(data, *moov):
+        if boxType != b'trak':
+            continue
+        hdlr = findBox(data, start, end, ['mdia', 'hdlr'])
+        # the handler type follows the version, flags and pre-defined fields
+        if hdlr is None or data[hdlr[0] + 8:hdlr[0] + 12] != b'vide':
+            continue
+        stbl = findBox(data, start, end, ['mdia', 'minf', 'stbl'])
+        if stbl is None:
+            return None
+        stsz = findBox(data, stbl[0], stbl[1], ['stsz'])
+        if stsz is None:
+            return None
+        # version and flags, sample size, sample count
+        frames = struct.unpack('>I', data[stsz[0] + 8:stsz[0] + 12])[0]
+        stss = findBox(data, stbl[0], stbl[1], ['stss'])
+        if stss is None:
+            return frames, list(range(frames))
+        count = struct.unpack('>I', data[stss[0] + 4:stss[0] + 8])[0]
+        samples = struct.unpack('>{}I'.format(count),
+                                data[stss[0] + 8:stss[0] + 8 + 4 * count])
+        # the sample numbers are 1-based
+        return frames, [sample - 1 for sample in samples]
+    return None
+
+
+def iterBoxes(data, start, end):
+    """Generate 3-tuples (type, content start, end) of the mp4 boxes
+    in data[start:end].
+    """
+    while start + 8 <= end:
+        size, boxType = struct.unpack('>I4s', data[start:start + 8])
+        header = 8
+        if size == 1:
+            # 64-bit size follows the type
+            size = struct.unpack('>Q', data[start + 8:start + 16])[0]
+            header = 16
+        elif size == 0:
+            # the box extends to the end
+            size = end - start
+        if size < header:
+            return
+        yield boxType, start + header, start + size
+        start += size
+
+
+def findBox(data, start, end, path):
+    """Return (content start, end) of the box at 'path' (a list of box
+    types) within data[start:end], or None if there is none.
+    """
+    for boxType, boxStart, boxEnd in iterBoxes(data, start, end):
+        if boxType == path[0].encode():
+            if len(path) == 1:
+                return boxStart, boxEnd
+            found = findBox(data, boxStart, boxEnd, path[1:])
+            if found:
+                return found
+    return None
@@ -0,0 +1,118 @@
+import threading
+
+
+class LiveSearch():
+    """Runs searches in a worker thread, only the latest query matters.
+
+    Used for the searches started by the user's input as it is being
+    edited. A new query supersedes the previous one: if the previous query
+    is still waiting, it's replaced, if it's being searched, the search
+    is told to stop - the search function gets a function 'isCancelled'
+    that returns True from then on, and its result is discarded.
+
+    The worker thread is started with the first query. The results are
+    picked up by poll(), so that they can be displayed in the Tk thread.
+
+    Methods:
+        submit(query):
+            Start searching for a query, supersede the previous one.
+        cancel():
+            Discard the waiting and the running search.
+        poll():
+            Return the result of the latest query if it's ready.
+        busy():
+            Return True if a search is waiting or running.
+        close():
+            Stop the worker thread.
+    """
+
+    def __init__(self, searchFcn):
+        """Initialize the attributes.
+
+        Arguments:
+            searchFcn: a function that does the search, called as
+                searchFcn(query, isCancelled) in the worker thread,
+                it may return None if the search has been cancelled
+        """
+        self.searchFcn = searchFcn
+        self.condition = threading.Condition()
+        self.generation = 0  # incremented by each query and cancel
+        self.pending = None  # (generation, query) waiting for the worker
+        self.running = False  # whether the worker is searching
+        self.result = None  # (generation, result) of the last search
+        self.closed = False
+        self.thread = None
+
+    def submit(self, query):
+        """Start searching for 'query' in the worker thread, supersede
+        the previous query.
+        """
+        with self.condition:
+            self.generation += 1
+            self.pending = (self.generation, query)
+            self.result = None
+            self.condition.notify()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.work,
+                                               daemon=True)
+                self.thread.start()
+
+    def cancel(self):
+        """Discard the waiting query and the result of the running one."""
+        with self.condition:
+            self.generation += 1
+            self.pending = None
+            self.result = None
+
+    def poll(self):
+        """Return the result of the latest query, or None if it's not
+        ready (or has already been returned, or has been cancelled).
+        """
+        with self.condition:
+            if self.result is None or self.result[0] != self.generation:
+                return None
+            result = self.result[1]
+            self.result = None
+            return result
+
+    def busy(self):
+        """Return True if a search is waiting or running."""
+        with self.condition:
+            return self.pending is not None or self.running
+
+    def close(self):
+        """Stop the worker thread after the running search."""
+        with self.condition:
+            self.closed = True
+            self.generation += 1
+            self.pending = None
+            self.condition.notify()
+
+    def work(self):
+        """Search for the queries as they come, runs in the worker thread."""
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                generation, query = self.pending
+                self.pending = None
+                self.running = True
+
+            def isCancelled(generation=generation):
+                return generation != self.generation
+
+            try:
+                result = self.searchFcn(query, isCancelled)
+            except BaseException:
+                # the exception is printed by the threading module,
+                # the next query starts a new worker thread
+                with self.condition:
+                    self.running = False
+                    self.thread = None
+                raise
+            with self.condition:
+                self.running = False
+                if result is not None and not isCancelled():
+                    self.result = (generation, result)
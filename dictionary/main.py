@@ -45,14 +45,21 @@
 #############################################################################
 
 
+import time
+startTime = time.perf_counter()  # reference point of the startup-time mode
+
 import tkinter as tk
 from tkinter import ttk
-import tkinter.font as tkFont
 import os
+import argparse
 from search_engine import SearchEngine
+from video_library import VideoLibrary
+from video_frame import VideoFrm
 from main_frame import MainFrm
 from categories_frame import CatFrm
 from sign_input_frame import SignInputFrm
+from resource_cache import resources
+from sprite_atlas import SpriteAtlas
 
 
 class Dictionary():
@@ -60,7 +67,8 @@ class Dictionary():
 
     Creates the root application window with all its descending widgets,
     as well as an object (self.searchEng) that provides the logic behind
-    the application.
+    the application, and an object (self.videoLib) that provides the frames
+    of the played videos.
 
     The root application window (self.root) contains:
     - the main frame (self.mainfrm) where the result of search is displayed,
@@ -68,6 +76,10 @@ class Dictionary():
     - a notebook (self.notebook) that switches between:
         - a frame (self.catfrm) for choosing a word from a category
         - a frame (self.signfrm) where sign components may be entered
+
+    To make the application start faster, 'self.signfrm' is built only
+    when its tab is selected for the first time. Until then, the tab holds
+    an empty placeholder frame (self.signtab).
     """
 
     BORDER = 38  # the main window border width
@@ -76,8 +88,11 @@ class Dictionary():
     TAB_PADX = 25  # notebook's tab padding
     TAB_PADY = 2
     BGCOLOR = 'white'  # background color
+    FONT_FAMILY = 'DejaVu Sans'  # the application font family
+    SIGN_TAB_TEXT = 'Překlad z ČZJ do ČJ'  # title of the sign-input tab
 
-    def __init__(self, dbpath, vfdir, imgdir):
+    def __init__(self, dbpath, vfdir, imgdir, cachedir, decodeProcesses=0,
+                 thumbFrameStep=1, liveSignSearch=False):
         """Build the application.
 
         Arguments:
@@ -85,19 +100,52 @@ class Dictionary():
             vfdir (str): a path to the directory where video files with
                 translations to sign language are located
             imgdir (str): a path to the directory where images are located
+            cachedir (str): a path to the directory with the data
+                precomputed by build_cache.py
+            decodeProcesses (int): the number of processes decoding
+                the videos, 0 means decoding in threads (default is 0)
+            thumbFrameStep (int): only every n-th frame of the thumbnail
+                videos is decoded (default is 1)
+            liveSignSearch (bool): whether the sign search runs while
+                the sign placement is being edited (default is False)
         """
         self.dbpath = dbpath
         self.vfdir = vfdir
         self.imgdir = imgdir
+        self.cachedir = cachedir
 
         self.altsmax = 10  # number of alternatives showed when word not found
         self.canvasSize = (250, 250)  # canvas for specifying sign placement
+        # memory budget for the decoded frames of played videos in bytes
+        self.frameCacheSize = 256 * 2**20
+        # worker processes decoding the videos (for several videos playing
+        # at once on a weak CPU), 0 means decoding in threads
+        self.decodeProcesses = decodeProcesses
+        # every n-th frame of the thumbnail videos is played (to reduce
+        # the decoding work when several thumbnails play at once)
+        self.thumbFrameStep = thumbFrameStep
+        # the sign search result is updated as the user edits the placement
+        self.liveSignSearch = liveSignSearch
 
         # the SearchEngine object provides the logic behind the dictionary app
         self.searchEng = SearchEngine(self.dbpath,
                                       self.vfdir,
                                       self.altsmax,
                                       self.canvasSize)
+        # the VideoLibrary object provides the frames of the played videos
+        self.videoLib = VideoLibrary(self.frameCacheSize,
+                                     self.cachedir,
+                                     self.decodeProcesses,
+                                     videoMeta=self.searchEng.getVideoMeta(),
+                                     thumbWidth=MainFrm.THUMB_WIDTH,
+                                     thumbFrameStep=self.thumbFrameStep)
+        # the fonts are created by the shared resource cache, the fonts
+        # with no family given are of the application font family
+        resources.configure(defaultFamily=self.FONT_FAMILY)
+        # the handshape images are copied out of the sprite atlas built
+        # by build_cache.py, if there is one
+        resources.addAtlas(SpriteAtlas(os.path.join(self.cachedir,
+                                                    'handshapes')))
         self.makeWidgets()
 
     def makeWidgets(self):
@@ -110,7 +158,7 @@ class Dictionary():
         self.root.minsize(width=self.WIN_MIN_WIDTH,
                           height=self.WIN_MIN_HEIGHT)
 
-        self.font = tkFont.Font(family='DejaVu Sans', size=11)
+        self.font = resources.font(size=11)
         self.root.option_add('*Font', self.font)
 
         self.root.columnconfigure(0, weight=2)  # empty column
@@ -124,6 +172,7 @@ class Dictionary():
                                self.vfdir,
                                self.imgdir,
                                self.searchEng,
+                               self.videoLib,
                                self.altsmax,
                                self.BORDER,
                                bg=self.BGCOLOR,
@@ -194,20 +243,39 @@ class Dictionary():
         self.catfrm.grid(column=0, row=0, sticky=tk.N+tk.E+tk.S+tk.W)
         self.notebook.add(self.catfrm, text='Výběr podle kategorií')
 
-        # create the sign-input frame
+        # create a placeholder for the sign-input frame,
+        # the frame itself is created when its tab is selected
+        self.signfrm = None
+        self.signtab = tk.Frame(self.notebook, bg=self.BGCOLOR)
+        self.notebook.add(self.signtab, text=self.SIGN_TAB_TEXT)
+        self.notebook.bind('<<NotebookTabChanged>>', self.onTabChanged)
+
+        # update to make sure that toplevel windows will be placed correctly
+        self.root.update()
+
+    def onTabChanged(self, event):
+        """Build the sign-input frame when its tab is selected first time."""
+        if (self.signfrm is None and
+                self.notebook.select() == str(self.signtab)):
+            self.makeSignFrm()
+
+    def makeSignFrm(self):
+        """Create the sign-input frame in place of 'self.signtab'."""
         self.signfrm = SignInputFrm(self.notebook,
                                     self.imgdir,
                                     self.searchEng.signSearch,
                                     self.mainfrm.showResult,
                                     self.canvasSize,
+                                    liveSearch=self.liveSignSearch,
                                     bg=self.BGCOLOR,
                                     padx=self.BORDER,
                                     pady=20)
         self.signfrm.grid(column=0, row=0, sticky=tk.N+tk.E+tk.S+tk.W)
-        self.notebook.add(self.signfrm, text='Překlad z ČZJ do ČJ')
-
-        # update to make sure that toplevel windows will be placed correctly
-        self.root.update()
+        self.notebook.insert(self.signtab, self.signfrm,
+                             text=self.SIGN_TAB_TEXT)
+        self.notebook.select(self.signfrm)
+        self.notebook.forget(self.signtab)
+        self.signtab.destroy()
 
     def positionWindow(self):
         """Position the application window in the center of the screen."""
@@ -219,11 +287,54 @@ class Dictionary():
         self.root.geometry('+{}+{}'.format(xOffset, yOffset))
 
 
+def reportStartupTime(dictionary):
+    """Print the time to first paint of the application window and quit."""
+    elapsed = time.perf_counter() - startTime
+    print('time to first paint: {:.0f} ms'.format(elapsed * 1000))
+    dictionary.root.destroy()
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--startup-time',
+                        action='store_true',
+                        help='print the time to first paint and exit')
+    parser.add_argument('--render-stats',
+                        action='store_true',
+                        help='print the average frame render time on exit')
+    parser.add_argument('--decode-processes',
+                        type=int,
+                        default=0,
+                        metavar='N',
+                        help='decode the videos in N worker processes')
+    parser.add_argument('--thumb-frame-step',
+                        type=int,
+                        default=1,
+                        metavar='N',
+                        help='play every N-th frame of the thumbnail videos')
+    parser.add_argument('--live-sign-search',
+                        action='store_true',
+                        help='update the sign search result while the sign '
+                             'placement is being edited')
+    args = parser.parse_args()
+
     dbpath = os.path.abspath('dict.db')
     vfdir = os.path.abspath('videofiles')
     imgdir = os.path.abspath('images')
+    cachedir = os.path.abspath('cache')
 
-    dictionary = Dictionary(dbpath, vfdir, imgdir)
+    dictionary = Dictionary(dbpath, vfdir, imgdir, cachedir,
+                            args.decode_processes, args.thumb_frame_step,
+                            args.live_sign_search)
     dictionary.positionWindow()
+    if args.startup_time:
+        # the window is painted when the event loop gets idle for first time
+        dictionary.root.after_idle(lambda: reportStartupTime(dictionary))
     dictionary.root.mainloop()
+    if args.render_stats:
+        print('rendered frames: {}, average render time: {:.2f} ms'.format(
+            VideoFrm.renderedFrames, VideoFrm.renderCost()))
+        print('video captures: {}'.format(
+            dictionary.videoLib.captures.stats()))
+    dictionary.videoLib.close()
+    resources.clear()
@@ -1,9 +1,10 @@
 import tkinter as tk
-import tkinter.font as tkFont
 from searchentry_frame import EntFrm
 from video_frame import VideoFrm
 from altoptions_frame import AltsFrm
-from scrolled_frame import ScrolledFrame
+from thumbnail_strip import ThumbnailStrip
+from playback_scheduler import PlaybackScheduler
+from resource_cache import resources
 
 
 class MainFrm(tk.Frame):
@@ -13,7 +14,7 @@ class MainFrm(tk.Frame):
     'self.entfrm' -- a frame with an entry for inserting a word
     'self.lab' -- a label where the word that has been looked up is displayed
     'self.videofrm' -- a large video frame where a video with a sign is played
-    'self.thumbfrm' -- a frame containing thumbnail video frames,
+    'self.thumbfrm' -- a strip of thumbnail video frames,
                        czech to czech sign language:
                            the thumbnails are displayed when there is more
                            than one possible translation to sign language
@@ -43,9 +44,18 @@ class MainFrm(tk.Frame):
     LAB_FONT_SIZE_SMALLEST = 16
     LENGTH_NORMAL_FONT = 33  # max word length for using normal font size
     LENGTH_SMALL_FONT = 37  # max word length for using small font size
-
-    def __init__(self, parent, dbpath, vfdir, imgdir, searchEng, altsmax,
-                 border, **options):
+    # time in ms that displaying the due frames of all videos may take,
+    # when exceeded, the thumbnail videos are throttled
+    FRAME_BUDGET = 15
+    # number of the thumbnail videos following the first result whose
+    # beginnings are decoded in advance
+    PREFETCH_COUNT = 3
+    # time in ms that the mouse cursor has to rest on a thumbnail
+    # to play its video
+    HOVER_PLAY_DELAY = 300
+
+    def __init__(self, parent, dbpath, vfdir, imgdir, searchEng, videoLib,
+                 altsmax, border, **options):
         """Initialize a MainFrm object, create the widgets.
 
         Arguments:
@@ -54,6 +64,7 @@ class MainFrm(tk.Frame):
             vfdir (str): a path to the directory with video files
             imgdir (str): a path to the directory with images
             searchEng: an object that provides searching operations
+            videoLib: an object that provides the video frames
             altsmax (int): number of alternative words shown when the word
                 from the user is not found in the database
             border (int): the main window border width
@@ -63,7 +74,10 @@ class MainFrm(tk.Frame):
         self.vfdir = vfdir
         self.imgdir = imgdir
         self.searchEng = searchEng
-        self.thumbs = []   # a list of frames where thumbnail videos live
+        self.videoLib = videoLib
+        # drives the playback of all the videos in the frame
+        self.scheduler = PlaybackScheduler(self, self.FRAME_BUDGET)
+        self.hoverJob = None  # keeps reference to the scheduled hover play
 
         # a frame where alternative options are displayed when the given word
         # is not found in the database
@@ -92,6 +106,7 @@ class MainFrm(tk.Frame):
                              self.imgdir,
                              self.searchEng,
                              self.showResult,
+                             self.showPhrase,
                              bg=self.bgcolor)
         self.entfrm.grid(column=0, row=1,
                          sticky=tk.N+tk.E+tk.S+tk.W,
@@ -110,6 +125,8 @@ class MainFrm(tk.Frame):
 
         # create the main video frame
         self.videofrm = VideoFrm(self,
+                                 self.videoLib,
+                                 self.scheduler,
                                  self.VIDEO_WIDTH,
                                  self.VIDEO_HEIGHT,
                                  self.imgdir)
@@ -119,14 +136,25 @@ class MainFrm(tk.Frame):
         self.createThumbFrm()
 
     def createThumbFrm(self):
-        """Create a frame for displaying thumbnail videos."""
-        self.thumbfrm = ScrolledFrame(self,
-                                      # canvas size:
-                                      width=self.VIDEO_WIDTH,
-                                      height=self.THUMB_HEIGHT +
-                                      2 * self.HIGHLIGHT_BORDER,
-                                      orient='horizontal',
-                                      bg=self.bgcolor)
+        """Create a strip for displaying thumbnail videos."""
+        self.thumbfrm = ThumbnailStrip(
+            self,
+            self.videoLib,
+            self.scheduler,
+            self.VIDEO_WIDTH,
+            self.THUMB_WIDTH,
+            self.THUMB_HEIGHT,
+            self.HIGHLIGHT_BORDER,
+            self.THUMB_PADX,
+            # double-click on the thumbnail plays the thumbnail video
+            # in the large video frame
+            onDoubleClick=lambda i, event: self.onThumbClick(i),
+            # moving the mouse cursor across a thumbnail scrubs through
+            # the thumbnail video, when the cursor rests on the thumbnail,
+            # the video is played (in the thumbnail frame)
+            onHover=lambda i, event: self.onThumbHover(i, event.x),
+            onLeave=lambda i, event: self.cancelHoverPlay(),
+            bg=self.bgcolor)
         # frame size:
         self.thumbfrm.config(width=self.VIDEO_WIDTH,
                              height=self.THUMB_HEIGHT +
@@ -162,11 +190,44 @@ class MainFrm(tk.Frame):
                 # there's more than one match
                 # (this is always the case for the sign search)
                 self.createThumbnails(alist)
+            # the next results are likely to be played in the large video
+            # frame, decode their beginnings in advance
+            nextVideos = [vf for word, vf in alist[1:1+self.PREFETCH_COUNT]]
+            self.videoLib.prefetch(nextVideos, self.VIDEO_WIDTH)
         else:
             # the word was not found
             # display alternative options
+            self.videoLib.prefetch([], self.VIDEO_WIDTH)
             self.showNotFound(alist)
 
+    def showPhrase(self, playlist, missing):
+        """Play the videos of the expressions of a phrase one after another
+        in the large video frame, show them in thumbnails.
+
+        Arguments:
+            playlist (list): 2-tuples (expression (str), videofile (str))
+                in the phrase order
+            missing (list): the words of the phrase that were not found
+        """
+        self.deleteThumbnails()
+        text = ' '.join(word for word, videofile in playlist)
+        if missing:
+            text += ' (nenalezeno: {})'.format(', '.join(missing))
+        self.showWord(text)
+        if len(playlist) > 1:
+            self.createThumbnails(playlist)
+
+        def onClip(i):
+            # highlight the thumbnail of the video being played
+            self.thumbfrm.select(i)
+            self.thumbfrm.see(i)
+
+        self.videofrm.playPlaylist([vf for word, vf in playlist], onClip)
+        # the pre-rolled next video is decoded by the video frame itself,
+        # decode the beginnings of the following ones in advance
+        nextVideos = [vf for word, vf in playlist[2:2+self.PREFETCH_COUNT]]
+        self.videoLib.prefetch(nextVideos, self.VIDEO_WIDTH)
+
     def showWordAndVideo(self, word, videofile):
         """Show 'word' on 'self.lab' label and play the corresponding video.
 
@@ -174,6 +235,17 @@ class MainFrm(tk.Frame):
             word (str): the word to be displayed
             videofile (str): name of the video file
         """
+        self.showWord(word)
+        # play the video file
+        self.videofrm.play(video_source=videofile)
+
+    def showWord(self, word):
+        """Show 'word' on 'self.lab' label, display the large video frame
+        if it's replaced by the alternative options.
+
+        Arguments:
+            word (str): the word to be displayed
+        """
         self.labvar.set(word)
         if len(word) <= self.LENGTH_NORMAL_FONT:
             self.setLabFontSize(self.LAB_FONT_SIZE)
@@ -187,79 +259,59 @@ class MainFrm(tk.Frame):
             self.altsfrm.destroy()
             self.altsfrm = None
             self.videofrm = VideoFrm(self,
+                                     self.videoLib,
+                                     self.scheduler,
                                      self.VIDEO_WIDTH,
                                      self.VIDEO_HEIGHT,
                                      self.imgdir)
             self.videofrm.grid(column=0, row=3)
-        # play the video file
-        self.videofrm.play(video_source=videofile)
 
     def createThumbnails(self, find):
-        """Create the thumbnail video frames.
+        """Show the thumbnail video frames, the first one highlighted.
 
         Arguments:
             find (list): a list of 2-tuples (word, videofile) where
                 word (str) is the word that is being translated
                 videofile (str) is name of video file
         """
+        self.thumbfrm.show(find)
 
-        self.thumbfrm.rowconfigure(0,
-                                   minsize=self.THUMB_HEIGHT +
-                                   2 * self.HIGHLIGHT_BORDER)
-
-        for i in range(len(find)):
-            self.thumbfrm.columnconfigure(i,
-                                          minsize=self.THUMB_WIDTH +
-                                          2 * self.HIGHLIGHT_BORDER +
-                                          self.THUMB_PADX)
-
-            # create the thumbnails and collect them in self.thumbs variable
-            thumb = VideoFrm(self.thumbfrm.interior,
-                             self.THUMB_WIDTH,
-                             self.THUMB_HEIGHT,
-                             thumb=True,
-                             border=self.HIGHLIGHT_BORDER,
-                             bg=self.bgcolor)
-            thumb.grid(column=i, row=0, padx=(0, self.THUMB_PADX))
-            self.thumbs.append(thumb)
-            thumb.showFirstPic(find[i][1])
-
-            # double-click on the thumbnail plays the thumbnail video
-            # in the large video frame
-            def callback(word, vf, i):
-                return lambda event: self.onThumbClick(word, vf, i)
-            thumb.canvas.bind('<Double-Button-1>', callback(*find[i], i))
-
-            # when the mouse cursor enters a thumbnail,
-            # the thumbnail video is played (in the thumbnail frame)
-            def playThumb(i):
-                vs = find[i][1]
-                return lambda event: self.thumbs[i].play(video_source=vs)
-            thumb.canvas.bind('<Enter>', playThumb(i))
-
-        # highlight the thumbnail that is currently displayed
-        # in the large video frame (i.e. the 1st one)
-        self.thumbs[0].lightOn()
-
-    def onThumbClick(self, word, vf, i):
+    def onThumbHover(self, i, x):
+        """Show the frame of the thumbnail video at the cursor position 'x',
+        play the video if the cursor rests on the thumbnail.
+        """
+        self.cancelHoverPlay()
+        vf = self.thumbfrm.results[i][1]
+        self.thumbfrm.widget(i).scrub(vf, x)
+
+        def play():
+            self.hoverJob = None
+            thumb = self.thumbfrm.widget(i)
+            # the thumbnail may have been scrolled out of view
+            if thumb is not None:
+                thumb.play(vf)
+        self.hoverJob = self.after(self.HOVER_PLAY_DELAY, play)
+
+    def cancelHoverPlay(self):
+        """Cancel the scheduled play of a hovered thumbnail video."""
+        if self.hoverJob:
+            self.after_cancel(self.hoverJob)
+            self.hoverJob = None
+
+    def onThumbClick(self, i):
         """Highlight the clicked-on thumbnail and play its video.
 
         Remove highlighting from the previously highlighted thumbnail.
         Play the video from the clicked-on thumbnail in the large video frame.
         """
-        self.thumbs[i].lightOn()
-        for thumb in self.thumbs[:i]+self.thumbs[i+1:]:
-            thumb.lightOff()
+        self.thumbfrm.select(i)
+        word, vf = self.thumbfrm.results[i]
         self.showWordAndVideo(word, vf)
 
     def deleteThumbnails(self):
-        """Delete the thumbnail video frames."""
-        for thumb in self.thumbs:
-            thumb.destroy()
-        self.thumbs = []
-        # create a new, empty thumbfrm
-        self.thumbfrm.destroy()
-        self.createThumbFrm()
+        """Remove the thumbnail video frames from display."""
+        self.cancelHoverPlay()
+        self.thumbfrm.show([])
 
     def showNotFound(self, altoptions):
         """Show a 'Not found' notification and possible alternatives."""
@@ -289,6 +341,5 @@ class MainFrm(tk.Frame):
 
     def setLabFontSize(self, size):
         """Set font size in 'self.lab'."""
-        font = tkFont.Font(font=self.lab['font'])  # get current app font
-        font.configure(size=size, weight='bold')  # adjust it
-        self.lab.config(font=font)  # use the changed font in the label
+        # the app font with a changed size, bold
+        self.lab.config(font=resources.font(size=size, weight='bold'))
@@ -1,8 +1,7 @@
 import tkinter as tk
-import tkinter.font as tkFont
 import os
 from drawing_canvas import DrawingCanvas
-import tools
+from resource_cache import resources
 
 
 class PlacementFrm(tk.Frame):
@@ -17,15 +16,19 @@ class PlacementFrm(tk.Frame):
     - 'searchButton' button that starts a search for signs
     """
 
-    def __init__(self, parent, imgdir, canvasSize, **options):
+    def __init__(self, parent, imgdir, canvasSize, onChange=None,
+                 **options):
         """Set constants and create the widgets.
 
         Arguments:
             parent: a parent tkinter widget
             imgdir (str): a path to the directory with images
             canvasSize (tuple): a 2-tuple with width and height of the canvas
+            onChange: a function without arguments called when the ellipse
+                has been drawn, changed or deleted (default is None)
         """
         super().__init__(parent, **options)
+        self.onChange = onChange
         self.bgcolor = options.get('bg', self['bg'])
 
         self.hintIconPath = os.path.join(imgdir, 'hint_icon.png')
@@ -75,9 +78,9 @@ class PlacementFrm(tk.Frame):
                                        pady=(0, self.labPady))
 
         # create hint icon
-        self.icon = tools.getImage(self.hintIconPath,
-                                   width=self.hintSize,
-                                   height=self.hintSize)
+        self.icon = resources.image(self.hintIconPath,
+                                    width=self.hintSize,
+                                    height=self.hintSize)
         self.hintIcon = tk.Label(self, image=self.icon, bg=self.bgcolor)
         self.hintIcon.grid(column=1, row=0,
                            sticky=tk.N+tk.W,
@@ -88,6 +91,7 @@ class PlacementFrm(tk.Frame):
 
         # create a canvas
         self.canvas = DrawingCanvas(self,
+                                    onChange=self.onChange,
                                     width=self.canvasWidth,
                                     height=self.canvasHeight,
                                     borderwidth=self.canvasBorder,
@@ -96,15 +100,15 @@ class PlacementFrm(tk.Frame):
                          sticky=tk.S,
                          columnspan=2,
                          rowspan=2)
-        self.image = tools.getImage(self.canvasImagePath,
-                                    width=self.canvasWidth,
-                                    height=self.canvasHeight)
+        self.image = resources.image(self.canvasImagePath,
+                                     width=self.canvasWidth,
+                                     height=self.canvasHeight)
         self.canvas.create_image(2, 2, image=self.image, anchor=tk.NW)
 
         # create delete button
-        self.delImg = tools.getImage(self.delIconPath,
-                                     width=self.delIconSize,
-                                     height=self.delIconSize)
+        self.delImg = resources.image(self.delIconPath,
+                                      width=self.delIconSize,
+                                      height=self.delIconSize)
         delButton = tk.Button(self,
                               image=self.delImg,
                               command=self.onDelete,
@@ -122,9 +126,9 @@ class PlacementFrm(tk.Frame):
         delButton.bind('<Leave>', self.onButLeave)
 
         # create search button
-        self.searchImg = tools.getImage(self.searchIconPath,
-                                        width=self.searchIconSize,
-                                        height=self.searchIconSize)
+        self.searchImg = resources.image(self.searchIconPath,
+                                         width=self.searchIconSize,
+                                         height=self.searchIconSize)
         searchButton = tk.Button(self,
                                  image=self.searchImg,
                                  command=self.master.onSearchPress,
@@ -178,10 +182,13 @@ class PlacementFrm(tk.Frame):
         self.canvas.delete(tk.ALL)
         self.canvas.create_image(2, 2, image=self.image, anchor=tk.NW)
         self.canvas.ellipse = None
+        self.canvas.id = None
         self.canvas.drawMode = True
         self.canvas.moveMode = False
         self.canvas.scaleMode = False
         self.canvas.rotateMode = False
+        if self.onChange:
+            self.onChange()
 
     def onButEnter(self, text):
         """Call the after() method to show a button caption."""
@@ -221,6 +228,4 @@ class PlacementFrm(tk.Frame):
 
     def setCaptFont(self, msg):
         """Set the caption font to be the app font with a changed size."""
-        font = tkFont.Font(font=msg['font'])  # the application's font
-        font.configure(size=self.captFontSize)
-        self.captFont = font                  # caption/hint font
+        self.captFont = resources.font(size=self.captFontSize)
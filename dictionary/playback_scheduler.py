@@ -0,0 +1,102 @@
+import time
+
+
+class PlaybackScheduler():
+    """A scheduler that drives all the video players from one timer.
+
+    The players (VideoFrm objects) that are playing a video are registered
+    in the scheduler. Each player has a deadline - the monotonic time when
+    its next frame is due. On each timer tick, the players whose deadline
+    has passed are advanced in the order of their deadlines. The timer is
+    then set to the earliest of the new deadlines.
+
+    There is a global frame budget - the time that a tick may take. When
+    the budget is exceeded, the players with lower priority (thumbnails)
+    are not advanced in that tick, their frames are postponed, unless they
+    have already been postponed 'maxSkips' times in a row.
+
+    A player must have a method advance(now) that displays the frame due
+    at the monotonic time 'now' and returns the time when the next frame
+    is due, or None if the video has finished.
+
+    Methods:
+        register(player, priority):
+            Start driving the player.
+        unregister(player):
+            Stop driving the player.
+    """
+
+    HIGH = 0  # priority of the main video
+    LOW = 1  # priority of the thumbnail videos
+
+    def __init__(self, widget, frameBudget):
+        """Initialize the attributes.
+
+        Arguments:
+            widget: a tkinter widget used to schedule the timer ticks
+            frameBudget (float): the time that one tick may take, in ms
+        """
+        self.widget = widget
+        self.frameBudget = frameBudget / 1000
+        self.maxSkips = 3
+        # player -> [deadline (float), priority (int), skips (int)]
+        self.players = {}
+        self.job = None  # keeps reference to the timer scheduled with after
+        self.jobTime = None  # the deadline the timer is scheduled for
+
+    def __contains__(self, player):
+        return player in self.players
+
+    def register(self, player, priority):
+        """Start driving 'player', its first frame is due immediately.
+
+        Arguments:
+            player: an object with an advance(now) method
+            priority (int): PlaybackScheduler.HIGH or PlaybackScheduler.LOW
+        """
+        self.players[player] = [time.monotonic(), priority, 0]
+        self.schedule()
+
+    def unregister(self, player):
+        """Stop driving 'player'."""
+        self.players.pop(player, None)
+
+    def schedule(self):
+        """Set the timer to the earliest deadline of the players."""
+        if not self.players:
+            return
+        deadline = min(entry[0] for entry in self.players.values())
+        if self.job:
+            if self.jobTime <= deadline:
+                return
+            self.widget.after_cancel(self.job)
+        delay = max(0, round((deadline - time.monotonic()) * 1000))
+        self.job = self.widget.after(delay, self.tick)
+        self.jobTime = deadline
+
+    def tick(self):
+        """Advance the players whose frames are due."""
+        self.job = None
+        start = time.monotonic()
+        due = [(player, entry) for player, entry in self.players.items()
+               if entry[0] <= start]
+        due.sort(key=lambda item: (item[1][0], item[1][1]))
+
+        for player, entry in due:
+            if player not in self.players:
+                # unregistered by one of the previous players
+                continue
+            overBudget = time.monotonic() - start > self.frameBudget
+            if (overBudget and entry[1] != self.HIGH and
+                    entry[2] < self.maxSkips):
+                # throttle the player, postpone its frame
+                entry[0] = start + self.frameBudget
+                entry[2] += 1
+                continue
+            entry[2] = 0
+            deadline = player.advance(time.monotonic())
+            if deadline is None:
+                self.unregister(player)
+            else:
+                entry[0] = deadline
+        self.schedule()
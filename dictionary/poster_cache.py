@@ -0,0 +1,77 @@
+import sqlite3
+import os
+import numpy as np
+
+
+class PosterCache():
+    """A cache of the first frames (posters) of the videos.
+
+    The posters are precomputed by the build_cache.py script, scaled to the
+    widths of the video canvases, and stored as raw RGB data in a BLOB table
+    of a separate SQLite database:
+
+        posters(videofile, width, height, data)
+
+    where 'videofile' is the name of the video file (without directory).
+    If the database doesn't exist, the cache is empty and get() always
+    returns None.
+
+    Methods:
+        get(video_source, width):
+            Return the poster of a video scaled to a given width, or None.
+        build(posters):
+            Store the posters in the database.
+    """
+
+    def __init__(self, dbpath):
+        """Initialize the attributes.
+
+        Arguments:
+            dbpath (str): the poster database file path
+        """
+        self.dbpath = dbpath
+        self.available = os.path.exists(dbpath)
+
+    def get(self, video_source, width):
+        """Return the poster of a video scaled to 'width', or None if the
+        poster is not in the cache.
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the poster
+        Returns:
+            numpy array of shape (height, width, 3) or None
+        """
+        if not self.available:
+            return None
+        with sqlite3.connect(self.dbpath) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT height, data FROM posters WHERE \
+                            videofile=? AND width=?',
+                           (os.path.basename(video_source), width))
+            find = cursor.fetchone()
+        if find is None:
+            return None
+        height, data = find
+        return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+
+    def build(self, posters):
+        """Create the database and store the posters in it.
+
+        Arguments:
+            posters: an iterable of 2-tuples (video_source (str), frame), where
+                frame is a numpy array of shape (height, width, 3)
+        """
+        with sqlite3.connect(self.dbpath) as conn:
+            cursor = conn.cursor()
+            cursor.execute('CREATE TABLE IF NOT EXISTS posters(\
+                            videofile varchar(60), width integer, \
+                            height integer, data blob, \
+                            PRIMARY KEY (videofile, width))')
+            for video_source, frame in posters:
+                height, width = frame.shape[:2]
+                cursor.execute('INSERT OR REPLACE INTO posters VALUES \
+                                (?, ?, ?, ?)',
+                               (os.path.basename(video_source), width,
+                                height, np.ascontiguousarray(frame).tobytes()))
+        self.available = True
@@ -0,0 +1,101 @@
+import os
+import json
+import numpy as np
+
+
+class PreviewStrips():
+    """Low-resolution preview clips of the videos, stored as frame strips.
+
+    A frame strip is a .npy file with all the frames of a video scaled to
+    the thumbnail width, an uint8 array of shape (frames, height, width, 3).
+    The strips are created by the build_cache.py script and served through
+    numpy memory maps, so that playing a preview costs an array slice
+    instead of decoding the video.
+
+    The strip directory contains one '<videofile>.npy' file per video and
+    an 'index.json' file of the form:
+        {"width": 160, "step": 1, "fps": {"<videofile>": 25.0, ...}}
+    where 'step' says that every step-th frame of the video is stored,
+    and 'fps' maps the video file names to the frame rates of the strips
+    (null if the frame rate of the video is unknown).
+
+    Methods:
+        get(video_source, width):
+            Return the strip of a video, or None if there's none.
+        frameRate(video_source):
+            Return the frame rate of a strip, or None if there's none.
+        build(strips, width, step):
+            Store the strips in the strip directory.
+    """
+
+    def __init__(self, stripdir):
+        """Read the strip index, if present.
+
+        Arguments:
+            stripdir (str): a path to the directory with the strips
+        """
+        self.stripdir = stripdir
+        self.width = None  # width of the stored frames
+        self.step = 1
+        self.rates = {}  # video file name -> frame rate of its strip
+        self.strips = {}  # video file name -> memory-mapped strip
+
+        indexpath = os.path.join(stripdir, 'index.json')
+        if os.path.exists(indexpath):
+            with open(indexpath) as f:
+                index = json.load(f)
+            self.width = index['width']
+            self.step = index['step']
+            self.rates = index['fps']
+
+    def get(self, video_source, width):
+        """Return the memory-mapped strip of a video, or None if there is
+        no strip of the video with frames of the given width.
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the frames
+        Returns:
+            numpy memmap of shape (frames, height, width, 3) or None
+        """
+        name = os.path.basename(video_source)
+        if width != self.width or name not in self.rates:
+            return None
+        if name not in self.strips:
+            path = os.path.join(self.stripdir, name + '.npy')
+            self.strips[name] = np.load(path, mmap_mode='r')
+        return self.strips[name]
+
+    def frameRate(self, video_source):
+        """Return the frame rate of the strip of a video, or None if there
+        is no strip of the video or its frame rate is unknown.
+
+        Arguments:
+            video_source (str): a path to the video file
+        """
+        return self.rates.get(os.path.basename(video_source))
+
+    def build(self, strips, width, step):
+        """Store the strips and create the index.
+
+        Arguments:
+            strips: an iterable of 3-tuples (video_source (str), fps (float),
+                frames), where frames is an uint8 numpy array of shape
+                (frames, height, width, 3), and fps is 0 if the frame rate
+                of the video is unknown
+            width (int): the width of the frames
+            step (int): every step-th frame of the videos is in the strips
+        """
+        os.makedirs(self.stripdir, exist_ok=True)
+        rates = {}
+        for video_source, fps, frames in strips:
+            name = os.path.basename(video_source)
+            np.save(os.path.join(self.stripdir, name + '.npy'), frames)
+            rates[name] = fps / step if fps else None
+
+        with open(os.path.join(self.stripdir, 'index.json'), 'w') as f:
+            json.dump({'width': width, 'step': step, 'fps': rates}, f)
+        self.width = width
+        self.step = step
+        self.rates = rates
+        self.strips = {}
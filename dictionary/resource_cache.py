@@ -0,0 +1,132 @@
+import os
+import tkinter.font as tkFont
+try:  # relative imports used in tests
+    from . import tools
+except:
+    import tools
+
+
+class ResourceCache():
+    """A cache of the images and fonts shared by all the widgets.
+
+    An image is loaded from its file and resized only on the first request
+    for a given (path, width, height), a font is created only on the first
+    request for a given (family, size, weight). The later requests return
+    the same PhotoImage or Font object.
+
+    Tk deletes an image when its Python object is garbage-collected, even
+    if a widget still displays it. The cache keeps a reference to every
+    image and font it has created, so the widgets don't have to, until
+    clear() is called (when the application is closed).
+
+    The images can be taken from sprite atlases (see SpriteAtlas) instead
+    of their files: an image contained in an added atlas at the requested
+    size is copied out of the atlas, without decoding and resampling it.
+
+    The module-level 'resources' object is shared by the whole application,
+    its default font family is set by configure() before any widget is
+    built.
+
+    Methods:
+        configure(defaultFamily):
+            Set the font family used when none is given.
+        addAtlas(atlas):
+            Take the images contained in a sprite atlas from the atlas.
+        image(path, width, height):
+            Return the image from a file resized to the given size.
+        font(family, size, weight):
+            Return the font of the given family, size and weight.
+        clear():
+            Release all the images and fonts.
+    """
+
+    def __init__(self, defaultFamily='TkDefaultFont'):
+        """Create an empty cache.
+
+        Arguments:
+            defaultFamily (str): the font family used when none is given
+                (default is 'TkDefaultFont')
+        """
+        self.defaultFamily = defaultFamily
+        self.images = {}  # (path, width, height) -> PhotoImage
+        self.fonts = {}  # (family, size, weight) -> Font
+        self.atlases = []  # SpriteAtlas objects to take the images from
+        self.loads = 0  # number of image files loaded
+
+    def configure(self, defaultFamily):
+        """Set the font family used when none is given.
+
+        It can't be changed once a font has been created, the fonts
+        created before would be of the previous family.
+
+        Arguments:
+            defaultFamily (str): the font family
+        """
+        if self.fonts:
+            raise RuntimeError('the default font family must be set '
+                               'before the first font is created')
+        self.defaultFamily = defaultFamily
+
+    def addAtlas(self, atlas):
+        """Take the images contained in 'atlas' (a SpriteAtlas) from it.
+
+        The images are looked up in the atlas by their file names.
+        """
+        self.atlases.append(atlas)
+
+    def image(self, path, width, height):
+        """Return a PhotoImage of the image file 'path' resized to
+        'width' x 'height', load it on the first request only.
+
+        Arguments:
+            path (str): the image file path
+            width, height (int): the size of the image
+        """
+        key = (path, width, height)
+        image = self.images.get(key)
+        if image is None:
+            name = os.path.basename(path)
+            for atlas in self.atlases:
+                if atlas.has(name, width, height):
+                    image = atlas.get(name)
+                    break
+            else:
+                image = tools.getImage(path, width, height)
+                self.loads += 1
+            self.images[key] = image
+        return image
+
+    def font(self, family=None, size=None, weight='normal'):
+        """Return a Font of the given family, size and weight, create it
+        on the first request only.
+
+        Arguments:
+            family (str): the font family, 'self.defaultFamily' is used
+                if None (default is None)
+            size (int): the font size in points, the default size of
+                the family is used if None (default is None)
+            weight (str): 'normal' or 'bold' (default is 'normal')
+        """
+        if family is None:
+            family = self.defaultFamily
+        key = (family, size, weight)
+        font = self.fonts.get(key)
+        if font is None:
+            options = {'family': family, 'weight': weight}
+            if size is not None:
+                options['size'] = size
+            font = tkFont.Font(**options)
+            self.fonts[key] = font
+        return font
+
+    def clear(self):
+        """Release all the images and fonts, they are deleted in Tk when
+        no widget refers to them any more.
+        """
+        self.images.clear()
+        self.fonts.clear()
+        for atlas in self.atlases:
+            atlas.unload()
+
+
+resources = ResourceCache()
@@ -1,22 +1,47 @@
 import tkinter as tk
 from tkinter import ttk
-from autoscrollbar import AutoScrollbar
+try:  # relative imports used in tests
+    from .autoscrollbar import AutoScrollbar
+except:
+    from autoscrollbar import AutoScrollbar
 
 
 class ScrolledList(tk.Frame):
-    """A scrolled list for displaying words."""
+    """A scrolled list for displaying words.
 
-    def __init__(self, parent, handlerfcn, height):
+    In the virtual mode, the treeview has only as many rows as fit in its
+    height, and they display a window of the options from a backing list.
+    The list handles the scrolling, the selection and the keyboard
+    navigation itself, so setting the options takes the same time whatever
+    their number. Otherwise, all the options are inserted in the treeview
+    at once, by one loop running in Tcl.
+
+    Methods:
+        setOptions(options):
+            Update the content of the scrolled list.
+        yview(*args):
+            Scroll the virtual list, called by the scrollbar.
+    """
+
+    WHEEL_ROWS = 5  # number of rows scrolled by a mouse wheel step
+
+    def __init__(self, parent, handlerfcn, height, virtual=False):
         """Create an empty scrolled list.
 
         Arguments:
             parent: a parent tkinter widget
             handlerfcn: a function that does the search, takes a (str) argument
             height (int): height of the scrolled list in lines
+            virtual (bool): whether only the visible rows are rendered
+                (default is False)
         """
         super().__init__(parent)
         self.handlerfcn = handlerfcn
         self.height = height
+        self.virtual = virtual
+        self.options = []  # the options of the virtual list
+        self.top = 0  # index of the option displayed in the first row
+        self.selected = None  # index of the selected option
         self.makeWidgets()
 
     def makeWidgets(self):
@@ -26,9 +51,6 @@ class ScrolledList(tk.Frame):
                                 height=self.height,
                                 selectmode='browse',
                                 show='tree')
-        sbar.config(command=treeview.yview)
-        treeview.config(yscrollcommand=sbar.set)
-
         sbar.grid(column=1, row=0)
         treeview.grid(column=0, row=0, sticky=tk.N+tk.E+tk.S+tk.W)
         self.rowconfigure(0, weight=1)
@@ -37,20 +59,149 @@ class ScrolledList(tk.Frame):
         treeview.bind('<Double-1>', self.handler)
         treeview.bind('<Return>', self.handler)
         self.treeview = treeview
+        self.sbar = sbar
+
+        if not self.virtual:
+            sbar.config(command=treeview.yview)
+            treeview.config(yscrollcommand=sbar.set)
+            return
+
+        sbar.config(command=self.yview)
+        # the rows displaying the visible options
+        self.rows = [treeview.insert('', tk.END, text='')
+                     for i in range(self.height)]
+        treeview.bind('<Button-1>', self.onClick)
+        treeview.bind('<Button-4>',
+                      lambda event: self.yview('scroll', -self.WHEEL_ROWS,
+                                               'units'))
+        treeview.bind('<Button-5>',
+                      lambda event: self.yview('scroll', self.WHEEL_ROWS,
+                                               'units'))
+        treeview.bind('<MouseWheel>', self.onWheel)
+        keys = {'<Up>': -1,
+                '<Down>': 1,
+                '<Prior>': -self.height,
+                '<Next>': self.height}
+        for key, step in keys.items():
+            def onKey(step):
+                return lambda event: self.moveSelection(step)
+            treeview.bind(key, onKey(step))
+        treeview.bind('<Home>', lambda event: self.moveSelection(
+            -len(self.options)))
+        treeview.bind('<End>', lambda event: self.moveSelection(
+            len(self.options)))
+        self.render()
 
     def handler(self, event):
         """Fetch the selection text and do the search."""
+        if self.virtual:
+            if self.selected is not None:
+                self.handlerfcn(self.options[self.selected])
+            return
         iid = self.treeview.selection()[0]
         selection = self.treeview.item(iid, option='text')
         self.handlerfcn(selection)
 
     def setOptions(self, options):
-        """Update the content of the scrolled list.
+        """Update the content of the scrolled list, scroll it to the top.
 
         Arguments:
             options: a list of strings
         """
+        if self.virtual:
+            self.options = options
+            self.top = 0
+            self.selected = None
+            self.render()
+            return
         items = self.treeview.get_children()
         self.treeview.delete(*items)
-        for option in options:
-            self.treeview.insert("", tk.END, text=option)
+        # insert the options by a loop in Tcl, the list is passed at once
+        self.tk.call('set', '::scrolledListOptions', tuple(options))
+        self.tk.eval('foreach option $::scrolledListOptions '
+                     '{%s insert {} end -text $option}' % self.treeview)
+        self.tk.call('unset', '::scrolledListOptions')
+        self.treeview.yview_moveto(0)
+
+    def render(self):
+        """Display the visible options of the virtual list in the rows."""
+        for k, iid in enumerate(self.rows):
+            index = self.top + k
+            if index < len(self.options):
+                self.treeview.item(iid, text=self.options[index])
+                self.treeview.move(iid, '', k)
+            else:
+                # hide the rows below the last option
+                self.treeview.detach(iid)
+
+        if (self.selected is not None and
+                self.top <= self.selected < self.top + self.height):
+            iid = self.rows[self.selected - self.top]
+            self.treeview.selection_set(iid)
+            self.treeview.focus(iid)
+        else:
+            self.treeview.selection_set(())
+
+        count = len(self.options)
+        if count <= self.height:
+            self.sbar.set(0, 1)
+        else:
+            self.sbar.set(self.top / count, (self.top + self.height) / count)
+
+    def yview(self, *args):
+        """Scroll the virtual list, the arguments are those of the scrollbar
+        command: ('moveto', fraction) or ('scroll', number, 'units'/'pages').
+        """
+        if args[0] == 'moveto':
+            self.scrollTo(int(float(args[1]) * len(self.options)))
+        elif args[0] == 'scroll':
+            if args[2] == 'pages':
+                self.scrollTo(self.top + int(args[1]) * self.height)
+            else:
+                self.scrollTo(self.top + int(args[1]))
+        return 'break'
+
+    def scrollTo(self, top):
+        """Display the options from the index 'top' on."""
+        top = min(max(0, top), max(0, len(self.options) - self.height))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def onWheel(self, event):
+        """Scroll the virtual list by a mouse wheel step.
+
+        Only the sign of 'event.delta' is used, it is a multiple of 120
+        on Windows, but a small number on macOS.
+        """
+        if event.delta:
+            step = -self.WHEEL_ROWS if event.delta > 0 else self.WHEEL_ROWS
+            self.yview('scroll', step, 'units')
+        return 'break'
+
+    def onClick(self, event):
+        """Select the option in the clicked row."""
+        iid = self.treeview.identify_row(event.y)
+        if iid:
+            self.selected = self.top + self.rows.index(iid)
+            self.render()
+        self.treeview.focus_set()
+        return 'break'
+
+    def moveSelection(self, step):
+        """Move the selection by 'step' options and scroll the list
+        so that the selected option is visible.
+        """
+        if not self.options:
+            return 'break'
+        if self.selected is None:
+            self.selected = self.top
+        else:
+            self.selected = min(max(0, self.selected + step),
+                                len(self.options) - 1)
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.height:
+            self.top = self.selected - self.height + 1
+        self.render()
+        return 'break'
@@ -1,13 +1,15 @@
 import sqlite3
 import os
 import math
+import collections
+import threading
 import numpy as np
 from difflib import SequenceMatcher
 try:  # relative imports used in tests
-    from .drawing_canvas import Vect
+    from .video_meta import loadVideoMeta
     from . import tools
 except:
-    from drawing_canvas import Vect
+    from video_meta import loadVideoMeta
     import tools
 
 
@@ -25,10 +27,35 @@ class SearchEngine():
             Return a list of words contained in a given (sub)category.
         search(lookupword):
             Look up the word in the database.
+        searchPhrase(phrase):
+            Translate a phrase expression by expression.
         signSearch(userSign):
             Search the database for signs similar to the sign from user input.
+        getVideoMeta():
+            Return the metadata of the video files.
+        seedSimilarity():
+            Return the handshape similarity matrix derived from the groups.
     """
 
+    PUNCTUATION = '.,;:!?"()'  # stripped from the words of a phrase
+    SHAPES_COUNT = 54  # handshapes are numbered 1..SHAPES_COUNT
+    # similarity of two different handshapes of the same group in the seed
+    # of the similarity matrix, see seedSimilarity()
+    GROUP_SIMILARITY = 0.5
+    # all the possible 54 handshapes are divided into
+    # 11 groups of visually similar shapes (roman nums I-XI)
+    GROUPS = {1: 'I', 2: 'I', 3: 'I', 4: 'I', 5: 'I',
+              6: 'II', 7: 'II', 8: 'II', 9: 'III', 10: 'III',
+              11: 'IV', 12: 'IV', 13: 'IV', 14: 'III', 15: 'III',
+              16: 'IV', 17: 'III', 18: 'III', 19: 'IV', 20: 'II',
+              21: 'V', 22: 'V', 23: 'V', 24: 'V', 25: 'V',
+              26: 'V', 27: 'V', 28: 'II', 29: 'VI', 30: 'VI',
+              31: 'VI', 32: 'VI', 33: 'VI', 34: 'VI', 35: 'VI',
+              36: 'VI', 37: 'VII', 38: 'VII', 39: 'VII',
+              40: 'VII', 41: 'VII', 42: 'VII', 43: 'VII', 44: 'VII',
+              45: 'VII', 46: 'VII', 47: 'VII', 48: 'VII', 49: 'VIII',
+              50: 'IX', 51: 'IX', 52: 'X', 53: 'XI', 54: 'XI'}
+
     def __init__(self, dbpath, vfdir, altsmax, canvasSize):
         """Initialize the attributes.
 
@@ -48,20 +75,34 @@ class SearchEngine():
         self.vflist = os.listdir(self.vfdir)
 
         self.allsigns = []
-        self.signsmax = 15
-        # all the possible 54 handshapes are divided into
-        # 11 groups of visually similar shapes (roman nums I-XI)
-        self.groups = {1: 'I', 2: 'I', 3: 'I', 4: 'I', 5: 'I',
-                       6: 'II', 7: 'II', 8: 'II', 9: 'III', 10: 'III',
-                       11: 'IV', 12: 'IV', 13: 'IV', 14: 'III', 15: 'III',
-                       16: 'IV', 17: 'III', 18: 'III', 19: 'IV', 20: 'II',
-                       21: 'V', 22: 'V', 23: 'V', 24: 'V', 25: 'V',
-                       26: 'V', 27: 'V', 28: 'II', 29: 'VI', 30: 'VI',
-                       31: 'VI', 32: 'VI', 33: 'VI', 34: 'VI', 35: 'VI',
-                       36: 'VI', 37: 'VII', 38: 'VII', 39: 'VII',
-                       40: 'VII', 41: 'VII', 42: 'VII', 43: 'VII', 44: 'VII',
-                       45: 'VII', 46: 'VII', 47: 'VII', 48: 'VII', 49: 'VIII',
-                       50: 'IX', 51: 'IX', 52: 'X', 53: 'XI', 54: 'XI'}
+        # the placements of 'self.allsigns' as row spans, see _loadSigns()
+        self.spanSigns = self.spanRows = None
+        self.spanStarts = self.spanEnds = None
+        self.dbAreas = None  # the areas of the placements of the signs
+        self.hasPlacement = None  # whether the signs have a placement
+        # active shapes of the signs, a row per sign padded with zeros
+        self.signShapes = None
+        # postings lists: handshape -> indices of the signs having it
+        self.shapeSigns = None
+        self.signTypes = None  # types of the signs
+        self.passiveShapes = None  # passive shapes of the signs, -1 if None
+        # handshape similarity matrix, see _loadSimilarity()
+        self.similarity = None
+        # (handshapes and type, distances) of the last sign search
+        self.lastBase = None
+        # least-recently-used cache of the placement distances:
+        # user placement -> (cumulative relief, area, distances of the signs)
+        self.placeCache = collections.OrderedDict()
+        self.placeCacheSize = 32  # max number of the cached placements
+        self.placeLock = threading.Lock()  # the searches may run in threads
+        self.signsmax = 100
+
+        # max number of words of an expression looked up in a phrase
+        # (the longest expressions in the database have 9 words)
+        self.maxExprWords = 10
+        # max number of expressions looked up by one query, SQLite limits
+        # the number of parameters of a query (to 999 in older versions)
+        self.maxQueryParams = 500
 
         # length that fits into the label where czech translation is shown
         self.maxTextLength = 42
@@ -159,6 +200,74 @@ class SearchEngine():
             altoptions = self._findAltOpts(lookupword)
             return (False, altoptions)
 
+    def searchPhrase(self, phrase):
+        """Translate a phrase expression by expression.
+
+        The phrase is split into the longest expressions found in the
+        database, from left to right. All the candidate expressions (the
+        sequences of consecutive words of the phrase) are looked up by
+        a query per 'self.maxQueryParams' expressions. The first
+        translation of each expression (in the table order) is used.
+
+        Arguments:
+            phrase (str): the phrase to be translated
+        Returns:
+            2-tuple: (a-list, missing) where a-list contains the items
+                (expression (str), video-file (str)) in the phrase order
+                and missing is a list of the words that were not found
+        """
+        words = [word.strip(self.PUNCTUATION) for word in phrase.split()]
+        words = [word for word in words if word]
+        candidates = set()
+        for start in range(len(words)):
+            for end in range(start + 1,
+                             min(start + self.maxExprWords, len(words)) + 1):
+                candidates.add(' '.join(words[start:end]))
+        if not candidates:
+            return ([], [])
+
+        candidates = list(candidates)
+        find = []
+        with sqlite3.connect(self.dbpath) as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(candidates), self.maxQueryParams):
+                chunk = candidates[i:i + self.maxQueryParams]
+                placeholders = ', '.join(['lower(?)'] * len(chunk))
+                cursor.execute('SELECT rowid, word, videofile FROM \
+                                translation WHERE lower(word) IN ({})'
+                               .format(placeholders), chunk)
+                find.extend(cursor.fetchall())
+        find.sort()  # in the table order
+        translations = {}  # lowercase expression -> (word, videofile)
+        for rowid, word, videofile in find:
+            translations.setdefault(word.lower(), (word, videofile))
+
+        found = []
+        missing = []
+        start = 0
+        while start < len(words):
+            for end in range(min(start + self.maxExprWords, len(words)),
+                             start, -1):
+                expression = ' '.join(words[start:end]).lower()
+                if expression in translations:
+                    found.append(translations[expression])
+                    start = end
+                    break
+            else:
+                missing.append(words[start])
+                start += 1
+        return (self.addSuffixes(found), missing)
+
+    def getVideoMeta(self):
+        """Return the metadata of the video files stored in the 'videometa'
+        table of the database (created by build_cache.py).
+
+        Returns:
+            dict: video file name (str) -> VideoMeta, empty if there's
+                no 'videometa' table
+        """
+        return loadVideoMeta(self.dbpath)
+
     def _findVideoFile(self, videofile):
         """Return the full name of a video file, including suffix.
 
@@ -235,7 +344,7 @@ class SearchEngine():
                 del lengths[-1]
         return altopts
 
-    def signSearch(self, userSign):
+    def signSearch(self, userSign, isCancelled=None):
         """Search the database for signs similar to the sign from user input.
 
         Take a list of all the signs in the database, where each item of the
@@ -260,6 +369,8 @@ class SearchEngine():
         is. We distinguish the cases where the handshapes are exactly the same
         (leading to a shorter distance), and the cases where the shapes are
         similar, i.e. belong to the same group (leads to a longer distance).
+        How similar two handshapes are is given by a similarity matrix
+        stored in the database (see _loadSimilarity()).
 
         Sign Type dimension:
         There are three possible types: 'single hand', 'both the same' and
@@ -288,107 +399,411 @@ class SearchEngine():
                 uPassiveShape (int): describes the shape of the passive hand
                 uPlacement (tuple of floats): describes the sign placement,
                     takes the form of (centerx, centery, a , b, angle)
-        
+            isCancelled: a function without arguments that returns True
+                when the search is no longer needed, it's checked between
+                the stages of the search (default is None)
+
         Returns:
             2-tuple of form (True, a-list) where a-list contains items of form
-            (word (str), videofile (str))
+            (word (str), videofile (str)), or None if the search has been
+            cancelled
         """
 
         # unpack the user's sign input
         uActShape, uSignType, uPassiveShape, uPlacement = userSign
 
-        uActiveShape = set(uActShape)  # a set of ints
-        if len(uActiveShape) == 2 and (0 in uActiveShape):
-            uActiveShape.remove(0)
-        uShapeGroups = set(self.groups[shape] for shape in uActiveShape
-                           if shape != 0)  # a set of strings
+        # a set of ints, 0 stands for no shape
+        uActiveShape = set(uActShape) - {0}
 
-        if uPlacement:
-            # used for comparing the signs placement:
-            uReliefFcn = self._getReliefFcn(*uPlacement)
-            uRelief = self._getRelief(uReliefFcn)  # numpy array
-            uArea = (uRelief == 1).sum()
+        self._loadSigns()
 
-        if self.allsigns == []:
-            # create a list of all the signs in the database - list of tuples:
-            # (videofile, activeShape, signType, passiveShape, placement, area)
-            with sqlite3.connect(self.dbpath) as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT videofile, activeshape, signtype, \
-                    passiveshape, placement, area FROM signs')
-                allsigns = cursor.fetchall()
+        # distances in the Active Hand Shape and the Sign Type dimensions
+        baseDists = self._calcBaseDists(uActiveShape, uSignType,
+                                        uPassiveShape)
+        if isCancelled and isCancelled():
+            return None
+
+        # distances in the Sign Placement dimension, computed only for
+        # the signs that can be among the closest ones
+        placeDists = self._calcPlaceDists(uPlacement,
+                                          self._pruneSigns(baseDists))
+        if isCancelled and isCancelled():
+            return None
 
+        # the total distances (NaN for the pruned signs, sorted last)
+        dists = baseDists + placeDists
+
+        # choose the first 'self.signmax' closest signs
+        order = np.argsort(dists, kind='stable')[:self.signsmax]
         result = []
+        for i in order:
+            videofile = self.allsigns[i][0]
+            # remove duplicates
+            if videofile not in result:
+                result.append(videofile)
 
-        for dbSign in allsigns:
-            # unpack the dbSign's components
-            (videofile, dbActShape, dbSignType, dbPassiveShape, dbPlacement,
-                dbArea) = dbSign
+        # find the words corresponding to individual videofiles
+        signWords = self._findSignWords(result)
+        for i, videofile in enumerate(result):
+            wordslist = signWords.get(videofile, [])
+            text = ', '.join(wordslist)
+            while len(text) > self.maxTextLength:
+                del wordslist[-1]
+                text = ', '.join(wordslist)
+            result[i] = (text, videofile)
 
-            # dbActiveShape is a str of comma separated numbers or None
+        result = self.addSuffixes(result)
+        return (True, result)
+
+    def _loadSigns(self):
+        """Load all the signs from the database, on the first call only.
+
+        'self.allsigns' is a list of tuples: (videofile, activeShape,
+        signType, passiveShape, placement, area). The active shapes,
+        the types and the passive shapes are stored in numpy arrays
+        'self.signShapes', 'self.signTypes' and 'self.passiveShapes',
+        and the placements as arrays of row spans: span k covers the pixels
+        from 'self.spanStarts[k]' to 'self.spanEnds[k]' (exclusive) in the
+        row 'self.spanRows[k]' of the placement of sign 'self.spanSigns[k]'.
+        The active shapes are indexed in the postings lists
+        'self.shapeSigns'. The handshape similarity matrix is loaded
+        as well.
+        """
+        if self.allsigns:
+            return
+        with sqlite3.connect(self.dbpath) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT videofile, activeshape, signtype, \
+                passiveshape, placement, area FROM signs')
+            allsigns = cursor.fetchall()
+
+        signShapes = []
+        shapeSigns = [[] for shape in range(self.SHAPES_COUNT + 1)]
+        spans = []  # 4-tuples (sign, row, start, end)
+        dbAreas = np.zeros(len(allsigns), dtype=int)
+        hasPlacement = np.zeros(len(allsigns), dtype=bool)
+        for i, dbSign in enumerate(allsigns):
+            dbActShape, dbPlacement, dbArea = dbSign[1], dbSign[4], dbSign[5]
+
+            # dbActShape is a str of comma separated numbers or None
             if dbActShape:
-                dbActiveShape = set(int(item) for item in
-                                    dbActShape.split(','))
-                dbShapeGroups = set(self.groups[shape] for shape in
-                                    dbActiveShape)
+                signShapes.append([int(item) for item in
+                                   dbActShape.split(',')])
             else:
-                dbActiveShape = set()
-                dbShapeGroups = set()
+                signShapes.append([])
+            for shape in signShapes[-1]:
+                shapeSigns[shape].append(i)
 
             # dbPlacement is a string of form:
             # "y-coord, # of 0s, # of 1s, # of 0s;
             #  y-coord, # of 0s, # of 1s, # of 0s;
             #  ...                            ..." or None
             if dbPlacement:
-                # get numpy array
-                dbRelief = self._getDbRelief(dbPlacement)  # numpy array
+                hasPlacement[i] = True
+                dbAreas[i] = dbArea
+                for line in dbPlacement.split(';'):
+                    y, n1, n2, n3 = (int(item) for item in line.split(','))
+                    spans.append((i, y, n1, n1 + n2))
+
+        # pad the rows of the active shapes with zeros (no shape)
+        width = max([len(shapes) for shapes in signShapes] + [1])
+        self.signShapes = np.array([shapes + [0] * (width - len(shapes))
+                                    for shapes in signShapes],
+                                   dtype=int).reshape(-1, width)
+        self.signTypes = np.array([dbSign[2] for dbSign in allsigns])
+        self.passiveShapes = np.array(
+            [-1 if dbSign[3] is None else dbSign[3] for dbSign in allsigns])
+        self.shapeSigns = [np.array(signs, dtype=int)
+                           for signs in shapeSigns]
+
+        spans = np.array(spans, dtype=int).reshape(-1, 4)
+        (self.spanSigns, self.spanRows,
+         self.spanStarts, self.spanEnds) = spans.T
+        self.dbAreas = dbAreas
+        self.hasPlacement = hasPlacement
+        self.similarity = self._loadSimilarity()
+        self.allsigns = allsigns
+
+    @classmethod
+    def seedSimilarity(cls):
+        """Return the handshape similarity matrix derived from the groups
+        of visually similar handshapes ('GROUPS').
+
+        Returns:
+            numpy array of shape (SHAPES_COUNT + 1, SHAPES_COUNT + 1), where
+            item [i, j] is the similarity of the handshapes i and j: 1 for
+            the same shape, GROUP_SIMILARITY for the shapes of the same
+            group, 0 otherwise (row and column 0 are unused)
+        """
+        size = cls.SHAPES_COUNT + 1
+        similarity = np.zeros((size, size))
+        for i in range(1, size):
+            for j in range(1, size):
+                if i == j:
+                    similarity[i, j] = 1
+                elif cls.GROUPS[i] == cls.GROUPS[j]:
+                    similarity[i, j] = cls.GROUP_SIMILARITY
+        return similarity
+
+    def _loadSimilarity(self):
+        """Return the handshape similarity matrix stored in the
+        'handshapesimilarity' table of the database.
+
+        The table has the columns (shape1, shape2, similarity), where
+        the similarity is in [0, 1]. A pair of shapes stands for both
+        orders, the missing pairs of different shapes have similarity 0,
+        of the same shape 1. If there's no such table, the matrix is
+        derived from the groups, see seedSimilarity(). The table is
+        created by build_cache.py.
+
+        Returns:
+            numpy array, see seedSimilarity(), where row and column 0
+            (no shape) are -1
+        """
+        with sqlite3.connect(self.dbpath) as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute('SELECT shape1, shape2, similarity \
+                                FROM handshapesimilarity')
+                pairs = cursor.fetchall()
+            except sqlite3.OperationalError:
+                pairs = None
+
+        if pairs is None:
+            similarity = self.seedSimilarity()
+        else:
+            similarity = np.identity(self.SHAPES_COUNT + 1)
+            for shape1, shape2, value in pairs:
+                similarity[shape1, shape2] = value
+                similarity[shape2, shape1] = value
+        # no shape is less similar to any shape than any other shape
+        similarity[0, :] = -1
+        similarity[:, 0] = -1
+        return similarity
+
+    def _calcBaseDists(self, uActiveShape, uSignType, uPassiveShape):
+        """Return a numpy array of the distances between the user sign and
+        all the db signs in the Active Hand Shape and the Sign Type
+        dimensions (summed).
+
+        The distances of the last search are reused when the handshapes
+        and the type of the user sign haven't changed, e.g. while only the
+        placement is being edited.
 
-            # distance in the Active Hand Shape dimension
-            actDist = self._calcActDist(uActiveShape, uShapeGroups,
-                                        dbActiveShape, dbShapeGroups)
+        Arguments:
+            uActiveShape (set of ints): active hand shapes of user sign
+            uSignType (str): the user's sign type
+            uPassiveShape (int): passive hand shape of user's sign
+        """
+        key = (frozenset(uActiveShape), uSignType, uPassiveShape)
+        lastBase = self.lastBase
+        if lastBase is not None and lastBase[0] == key:
+            return lastBase[1]
+
+        dists = (self._calcActDists(uActiveShape) +
+                 self._calcTypeDists(uSignType, uPassiveShape))
+        self.lastBase = (key, dists)
+        return dists
+
+    def _calcActDists(self, uActiveShape):
+        """Return a numpy array of the distances between the user sign and
+        all the db signs in the Active Hand Shape dimension.
+
+        The similarities of the user's shapes to the shapes of all the db
+        signs are gathered from the similarity matrix at once. For each
+        sign, two values are reduced from them:
+            cover - how well the shapes of either sign match the shapes
+                of the other one: the similarity of the worst matched
+                shape to its best match
+            best - the similarity of the best matched pair of shapes
+        The distance is 1 - (cover + min(best, cover + GROUP_SIMILARITY))/2,
+        i.e. a single well matched pair of shapes counts at most as much as
+        one group step above the cover. With the matrix derived from
+        the groups, the distances are those of _calcActDist(): 0 for
+        the same shapes, 0.25 for a common shape and the other shapes
+        similar, 0.5 for all the shapes similar, 0.75 for at least one
+        similar shape, and 1 for completely different shapes.
+
+        Only the candidates found by _findCandidates() are evaluated, the
+        other signs have no shape similar to the user's shapes, so both
+        their values are 0, and their distance is 1.
 
-            # distance in the Sign Type dimension
-            typeDist = self._calcTypeDist(uSignType, uPassiveShape,
-                                          dbSignType, dbPassiveShape)
+        Arguments:
+            uActiveShape (set of ints): active hand shapes of user sign
+        """
+        dists = np.ones(len(self.allsigns))
+        if not uActiveShape:
+            return dists
+        candidates = self._findCandidates(uActiveShape)
+        if not len(candidates):
+            return dists
+
+        uShapes = np.array(sorted(uActiveShape))
+        signShapes = self.signShapes[candidates]
+        # sims[u, i, d] = similarity of user shape u and shape d
+        # of candidate i, -1 for the padding (no shape)
+        sims = self.similarity[uShapes[:, np.newaxis, np.newaxis],
+                               signShapes[np.newaxis, :, :]]
+        valid = signShapes > 0
+        uBest = sims.max(axis=2)  # the best match of each user shape
+        # the best match of each shape of the signs, ignoring the padding
+        dbBest = np.where(valid, sims.max(axis=0), np.inf)
+        cover = np.minimum(uBest.min(axis=0), dbBest.min(axis=1))
+        best = uBest.max(axis=0)
+
+        dists[candidates] = 1 - (cover + np.minimum(
+            best, cover + self.GROUP_SIMILARITY)) / 2
+        return dists
+
+    def _findCandidates(self, uActiveShape):
+        """Find the signs similar to the user sign in the Active Hand Shape
+        dimension by the postings lists.
 
-            # distance in the Sign Placement dimension
-            placeDist = 1
-            if uPlacement and dbPlacement:
-                placeDist = self._calcPlaceDist(uRelief,
-                                                uArea,
-                                                dbRelief,
-                                                dbArea)
+        Arguments:
+            uActiveShape (set of ints): active hand shapes of user sign
 
-            # the total distance
-            dist = actDist + typeDist + placeDist
-            result.append((videofile, dist))
+        Returns:
+            numpy array of the indices of the signs that have a shape
+            similar to one of the user's shapes (similarity > 0)
+        """
+        uShapes = np.array(sorted(uActiveShape))
+        similar = np.flatnonzero((self.similarity[uShapes] > 0).any(axis=0))
+        lists = [self.shapeSigns[shape] for shape in similar]
+        if not lists:
+            return np.array([], dtype=int)
+        return np.unique(np.concatenate(lists))
 
-        # choose the first 'self.signmax' closest signs
-        result = sorted(result, key=lambda x: x[1])
-        result = result[:self.signsmax]
-        # remove the distance values
-        result = tools.listOfTuplesToList(result)
-        # remove duplicates
-        for i in range(len(result)-1, -1, -1):
-            if result[i] in result[:i]:
-                del result[i]
+    def _calcTypeDists(self, uSignType, uPassiveShape):
+        """Return a numpy array of the distances between the user sign and
+        all the db signs in the Sign Type dimension, see _calcTypeDist().
 
-        # find the words corresponding to individual videofiles
-        for i, videofile in enumerate(result):
-            with sqlite3.connect(self.dbpath) as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT word FROM translation WHERE \
-                               videofile=?', (videofile,))
-                words = cursor.fetchall()
-            wordslist = tools.listOfTuplesToList(words)
-            text = ', '.join(wordslist)
-            while len(text) > self.maxTextLength:
-                del wordslist[-1]
-                text = ', '.join(wordslist)
-            result[i] = (text, videofile)
+        Arguments:
+            uSignType (str): the user's sign type
+            uPassiveShape (int): passive hand shape of user's sign
+        """
+        sameType = self.signTypes == uSignType
+        dists = np.where(sameType, 0.0, 1.0)
+        if uSignType == 'passive hand':
+            # the same type, different passive shape
+            dists[sameType & (self.passiveShapes != uPassiveShape)] = 0.5
+        return dists
+
+    def _pruneSigns(self, baseDists):
+        """Return the indices of the signs that can still be among the
+        'self.signsmax' closest signs, whatever their placement distance.
+
+        The placement distance lies in [0, 1], so the total distance of
+        a sign lies in [base, base + 1]. If the lower bound of a sign is
+        greater than the 'self.signsmax'-th smallest upper bound, at least
+        'self.signsmax' signs are closer, and the sign is pruned.
 
-        result = self.addSuffixes(result)
-        return (True, result)
+        Arguments:
+            baseDists (numpy.array): the distances of all the signs in
+                the Active Hand Shape and the Sign Type dimensions
+        """
+        if len(baseDists) <= self.signsmax:
+            return np.arange(len(baseDists))
+        bound = np.partition(baseDists, self.signsmax - 1)[self.signsmax - 1]
+        return np.flatnonzero(baseDists <= bound + 1)
+
+    def _calcPlaceDists(self, uPlacement, signs=None):
+        """Return a numpy array of the distances between the user sign and
+        the db signs in the Sign Placement dimension.
+
+        The overlap of the user's ellipse with a db placement is counted
+        span by span: a cumulative sum along the rows of the user's relief
+        gives the number of its pixels in any span by one subtraction.
+        The result is the same as that of _calcPlaceDist() for each sign,
+        but the db reliefs are never built.
+
+        The cumulative relief and the distances are cached under
+        the placement (the params rounded by the caller). The distances
+        are computed only for the requested signs that haven't been
+        requested for the placement yet, so a search that differs from
+        a recent one only in the handshapes or the type mostly skips
+        the placement stage.
+
+        The cached distances are shared by the searches running
+        in other threads, they are published under 'self.placeLock' once
+        computed, and a copy is returned.
+
+        Arguments:
+            uPlacement (tuple of floats): (centerx, centery, a , b, angle)
+                or None if the user hasn't specified the placement
+            signs (numpy.array): the indices of the signs whose distances
+                are needed, all the signs if None (default is None)
+
+        Returns:
+            numpy array of the distances of all the signs, where those
+            that haven't been computed are NaN
+        """
+        if not uPlacement:
+            return np.ones(len(self.allsigns))
+        if signs is None:
+            signs = np.arange(len(self.allsigns))
+
+        with self.placeLock:
+            entry = self.placeCache.get(uPlacement)
+            if entry is not None:
+                self.placeCache.move_to_end(uPlacement)
+
+        if entry is None:
+            uReliefFcn = self._getReliefFcn(*uPlacement)
+            # numpy array, the function is evaluated on all pixels at once
+            uRelief = self._getRelief(uReliefFcn, vectorized=True)
+            uArea = (uRelief == 1).sum()
+            # counts[y, x] = number of the user's pixels in row y left of x
+            counts = np.zeros((self.canvasHeight, self.canvasWidth + 1),
+                              dtype=np.int16)
+            np.cumsum(uRelief, axis=1, dtype=np.int16, out=counts[:, 1:])
+            entry = (counts, uArea, np.full(len(self.allsigns), np.nan))
+            with self.placeLock:
+                self.placeCache[uPlacement] = entry
+                if len(self.placeCache) > self.placeCacheSize:
+                    # evict the least recently used placement
+                    self.placeCache.popitem(last=False)
+
+        counts, uArea, dists = entry
+        with self.placeLock:
+            missing = signs[np.isnan(dists[signs])]
+        if len(missing):
+            needed = np.zeros(len(self.allsigns), dtype=bool)
+            needed[missing] = True
+            spans = needed[self.spanSigns]  # the spans of the needed signs
+            rows = self.spanRows[spans]
+            spanOverlaps = (counts[rows, self.spanEnds[spans]] -
+                            counts[rows, self.spanStarts[spans]])
+            overlaps = np.bincount(self.spanSigns[spans],
+                                   weights=spanOverlaps,
+                                   minlength=len(self.allsigns))
+
+            # computed aside, another search may be reading 'dists'
+            values = np.ones(len(missing))
+            has = self.hasPlacement[missing]
+            placed = missing[has]
+            values[has] = (1 - (2 * overlaps[placed]) /
+                           (uArea + self.dbAreas[placed]))
+            with self.placeLock:
+                dists[missing] = values
+        with self.placeLock:
+            return dists.copy()
+
+    def _findSignWords(self, videofiles):
+        """Return a dict: videofile -> a list of the words (str) translated
+        by the video file, for the given video files (by one query).
+        """
+        signWords = {}
+        if not videofiles:
+            return signWords
+        with sqlite3.connect(self.dbpath) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT videofile, word FROM translation WHERE \
+                           videofile IN ({})'.format(
+                               ','.join('?' * len(videofiles))),
+                           videofiles)
+            for videofile, word in cursor.fetchall():
+                signWords.setdefault(videofile, []).append(word)
+        return signWords
 
     def _calcActDist(self, uShape, uGroups, dbShape, dbGroups):
         """Calculate the distance between the user sign and the db sign in the
@@ -490,34 +905,42 @@ class SearchEngine():
             the elliptic area, and 0 for points outside of it:
                 f(x, y) = 1     for (x, y) inside the ellipse
                 f(x, y) = 0     for (x, y) outside the ellipse
+            The args may be numpy arrays of the same shape as well, then
+            the function returns an array of ones and zeros.
         """
 
         if a == 0 or b == 0:
-            return (lambda x, y: 0)
+            return (lambda x, y: np.zeros(np.shape(x), dtype=int))
 
         def f(x, y):
-            center = Vect(centerx, centery)
-            point = Vect(x, y)
+            dx = np.subtract(x, centerx)
+            dy = np.subtract(y, centery)
             # angle coord of the point with respect to the ellipse center:
-            phi = point.getAngle(center)
+            phi = np.arctan2(dy, dx) % (2 * math.pi)
             # radial coord of the point with respect to the ellipse center:
-            r = abs(point - center)
+            r = np.hypot(dx, dy)
             # radial coord of the ellipse border at angle phi:
-            elRadius = (a*b) / math.sqrt(a**2 * math.sin(phi - angle)**2 +
-                                         b**2 * math.cos(phi - angle)**2)
+            elRadius = (a*b) / np.sqrt(a**2 * np.sin(phi - angle)**2 +
+                                       b**2 * np.cos(phi - angle)**2)
 
-            if r <= elRadius:
-                # (x, y) is inside
-                return 1
-            else:
-                # (x, y) is outside
-                return 0
+            # 1 if (x, y) is inside, 0 if (x, y) is outside
+            return (r <= elRadius).astype(int)
         return f
 
-    def _getRelief(self, reliefFcn):
+    def _getRelief(self, reliefFcn, vectorized=False):
         """Return a 2D numpy array representing the value of a given function
         at individual pixels of the canvas.
+
+        Arguments:
+            reliefFcn: a function of the pixel coords (x, y)
+            vectorized (bool): whether the function takes numpy arrays
+                of the coords, then it's called only once, with the coords
+                of all the pixels (default is False)
         """
+        if vectorized:
+            y, x = np.mgrid[0:self.canvasHeight, 0:self.canvasWidth]
+            return reliefFcn(x, y)
+
         matrix = []
         for y in range(self.canvasHeight):
             row = []
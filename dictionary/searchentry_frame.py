@@ -1,14 +1,21 @@
 import tkinter as tk
 import os
+import threading
 from autocomplete_entry import AutocompleteEntry
 import tools
+from resource_cache import resources
 
 
 class EntFrm(tk.Frame):
-    """A frame with an entry and a search button."""
+    """A frame with an entry and a search button.
+
+    The list of words offered by the autocomplete entry is loaded
+    in a background thread after the frame is mapped, so that the database
+    query doesn't delay the application startup.
+    """
 
     def __init__(self, parent, imgdir, searchEng, showresultfcn,
-                 **options):
+                 showphrasefcn, **options):
         """Create an AutocompleteEntry and a Search button.
 
         Arguments:
@@ -16,15 +23,23 @@ class EntFrm(tk.Frame):
             searchEng: an object that provides the searching operations
             showresultfcn: function that displays the search result,
                 takes a 2-tuple argument: (boolean-flag, a-list)
+            showphrasefcn: function that plays the translation of a phrase,
+                takes the arguments (playlist, missing) returned by
+                searchEng.searchPhrase()
         """
         super().__init__(parent, **options)
         self.searchEng = searchEng
         self.showResultFcn = showresultfcn
+        self.showPhraseFcn = showphrasefcn
         self.bgcolor = options.get('bg', self['bg'])
         self.defaultText = 'Zadejte výraz'
         self.iconPath = os.path.join(imgdir, 'search_icon.png')
         self.iconSize = 22
+        self.loader = None  # a thread loading the autocomplete entries
+        self.entries = None  # the entries loaded by 'self.loader'
+        self.pollDelay = 50  # how often to check if the loading is finished
         self.makeWidgets()
+        self.bind('<Map>', self.onMap)
 
     def makeWidgets(self):
         """Create the widgets."""
@@ -38,9 +53,9 @@ class EntFrm(tk.Frame):
         bfrm.rowconfigure(0, weight=1)
         bfrm.columnconfigure(0, weight=1)
 
-        self.iconImg = tools.getImage(self.iconPath,
-                                      width=self.iconSize,
-                                      height=self.iconSize)
+        self.iconImg = resources.image(self.iconPath,
+                                       width=self.iconSize,
+                                       height=self.iconSize)
         tk.Button(bfrm,
                   image=self.iconImg,
                   command=self.doSearch,
@@ -49,19 +64,12 @@ class EntFrm(tk.Frame):
                   borderwidth=0).grid(column=0, row=0,
                                       sticky=tk.N+tk.E+tk.S+tk.W)
 
-        # create a list of all the words contained in the database
-        entries = self.searchEng.findAllWords()
-        # The items of 'entries' will be used in AutocompleteEntry's listbox.
-        # In a listbox, there's no option of inner padding, hence
-        # to simmulate the padding on the left side,
-        # add a space at the begining of each line.
-        entries = tools.leftPadItems(entries)
-
-        # create the autocomplete entry
+        # create the autocomplete entry,
+        # its entries are filled in later by 'self.loader'
         self.var = tk.StringVar()
         self.var.set(self.defaultText)
         self.ent = AutocompleteEntry(self,
-                                     entries,
+                                     [],
                                      self.defaultText,
                                      self.doSearch,
                                      maxEntries=10,
@@ -69,6 +77,32 @@ class EntFrm(tk.Frame):
         self.ent.grid(column=0, row=0, sticky=tk.N+tk.E+tk.W, ipady=2)
         self.ent.config(style="Gray.TEntry")
 
+    def onMap(self, event):
+        """Start loading the autocomplete entries in a background thread."""
+        self.unbind('<Map>')
+        self.loader = threading.Thread(target=self.loadEntries, daemon=True)
+        self.loader.start()
+        self.after(self.pollDelay, self.checkEntries)
+
+    def loadEntries(self):
+        """Create a list of all the words contained in the database.
+
+        Runs in 'self.loader' thread, must not touch any tkinter widgets.
+        """
+        entries = self.searchEng.findAllWords()
+        # The items of 'entries' will be used in AutocompleteEntry's listbox.
+        # In a listbox, there's no option of inner padding, hence
+        # to simmulate the padding on the left side,
+        # add a space at the begining of each line.
+        self.entries = tools.leftPadItems(entries)
+
+    def checkEntries(self):
+        """Pass the loaded entries to the autocomplete entry when ready."""
+        if self.loader.is_alive():
+            self.after(self.pollDelay, self.checkEntries)
+        elif self.entries is not None:
+            self.ent.setEntries(self.entries)
+
     def doSearch(self, event=None):
         """Hide listbox and do the search if there's some text in the entry."""
         if self.var.get() in ('', self.defaultText):
@@ -78,5 +112,13 @@ class EntFrm(tk.Frame):
             self.ent.hideListboxWin()
             self.ent.focus_set()
             self.ent.icursor(tk.END)
-            result = self.searchEng.search(self.var.get())
+            text = self.var.get()
+            result = self.searchEng.search(text)
+            if result[0] is False and len(text.split()) > 1:
+                # the phrase is not in the dictionary, translate it
+                # expression by expression
+                playlist, missing = self.searchEng.searchPhrase(text)
+                if playlist:
+                    self.showPhraseFcn(playlist, missing)
+                    return
             self.showResultFcn(result)
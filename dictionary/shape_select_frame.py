@@ -1,9 +1,8 @@
 import tkinter as tk
 from tkinter import ttk
-import tkinter.font as tkFont
 import os
 from scrolled_frame import ScrolledFrame
-import tools
+from resource_cache import resources
 
 
 class ShapeSelectFrm(tk.Frame):
@@ -18,6 +17,10 @@ class ShapeSelectFrm(tk.Frame):
     - 'self.delBut' - Delete button for deleting a handshape from selection
     """
 
+    LAB_WIDTH = 65  # size of the handshape images in the popup window
+    LAB_HEIGHT = 80
+    SHAPES_COUNT = 54  # number of the handshapes, images 01.png - 54.png
+
     def __init__(self, parent, imgdir, **options):
         """Initialize a ShapeSelectFrm. Create 'selectionfrm' and buttons.
 
@@ -45,8 +48,8 @@ class ShapeSelectFrm(tk.Frame):
         self.closeIconPath = os.path.join(imgdir, 'close_icon.png')
         self.popupWinIconSize = 15
 
-        self.labwidth = 65
-        self.labheight = 80
+        self.labwidth = self.LAB_WIDTH
+        self.labheight = self.LAB_HEIGHT
         self.labborder = 3
         self.numcols = 6
         self.numrows = 4
@@ -55,7 +58,7 @@ class ShapeSelectFrm(tk.Frame):
 
         self.images = []     # images of the handshapes
         self.labels = []     # labels with handshape pics in the popup window
-        self.shapes = [i+1 for i in range(54)]
+        self.shapes = [i+1 for i in range(self.SHAPES_COUNT)]
 
         self.title = 'Tvar aktivní ruky'
         self.popuptext = 'Zvolte tvar aktivní ruky'
@@ -126,9 +129,9 @@ class ShapeSelectFrm(tk.Frame):
         self.caption = None
 
         # create Add button
-        self.addImg = tools.getImage(self.addIconPath,
-                                     width=self.iconSize,
-                                     height=self.iconSize)
+        self.addImg = resources.image(self.addIconPath,
+                                      width=self.iconSize,
+                                      height=self.iconSize)
         self.addBut = tk.Button(self,
                                 image=self.addImg,
                                 command=self.openPopup,
@@ -149,9 +152,9 @@ class ShapeSelectFrm(tk.Frame):
         self.addBut.bind('<Leave>', self.onButLeave)
 
         # create Delete button
-        self.delImg = tools.getImage(self.delIconPath,
-                                     width=self.iconSize,
-                                     height=self.iconSize)
+        self.delImg = resources.image(self.delIconPath,
+                                      width=self.iconSize,
+                                      height=self.iconSize)
         self.delBut = tk.Button(self,
                                 image=self.delImg,
                                 command=self.onDelete,
@@ -192,9 +195,8 @@ class ShapeSelectFrm(tk.Frame):
 
         # set hint font if not defined yet
         if not self.captFont:
-            font = tkFont.Font(font=msg['font'])    # the application's font
-            font.configure(size=self.captFontSize)
-            self.captFont = font                    # caption font
+            # the application's font with a changed size
+            self.captFont = resources.font(size=self.captFontSize)
         msg.config(font=self.captFont)
 
         # position the window at the right bottom of mouse cursor
@@ -293,9 +295,9 @@ class ShapeSelectFrm(tk.Frame):
         buttonsfrm.grid(column=0, row=2, sticky=tk.E)
 
         # submit button
-        self.submitImg = tools.getImage(self.submitIconPath,
-                                        width=self.popupWinIconSize,
-                                        height=self.popupWinIconSize)
+        self.submitImg = resources.image(self.submitIconPath,
+                                         width=self.popupWinIconSize,
+                                         height=self.popupWinIconSize)
         submitButton = ttk.Button(buttonsfrm,
                                   text=' Použít',
                                   image=self.submitImg,
@@ -306,9 +308,9 @@ class ShapeSelectFrm(tk.Frame):
         submitButton['compound'] = tk.LEFT  # image to the left of button text
 
         # close button
-        self.closeImg = tools.getImage(self.closeIconPath,
-                                       width=self.popupWinIconSize,
-                                       height=self.popupWinIconSize)
+        self.closeImg = resources.image(self.closeIconPath,
+                                        width=self.popupWinIconSize,
+                                        height=self.popupWinIconSize)
         closeButton = ttk.Button(buttonsfrm,
                                  text=' Zavřít',
                                  image=self.closeImg,
@@ -385,11 +387,13 @@ class ShapeSelectFrm(tk.Frame):
 
     def makeLabels(self):
         """Fill the interior of 'self.scrollfrm' with labels."""
-        # create the images if they are not created yet
+        # create the images if they are not created yet, they are shared
+        # with the other handshape selection frames (and taken from
+        # the handshape atlas, if it is built)
         if self.images == []:
             for i in self.shapes:
                 imgpath = os.path.join(self.imgdir, self.num(i) + '.png')
-                image = tools.getImage(imgpath, self.labwidth, self.labheight)
+                image = resources.image(imgpath, self.labwidth, self.labheight)
                 self.images.append(image)
 
         # create the labels if they are not created yet
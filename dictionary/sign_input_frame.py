@@ -1,4 +1,5 @@
 import tkinter as tk
+from live_search import LiveSearch
 from shape_select_frame import ShapeSelectFrm
 from radio_buttons import RadioFrm
 from placement_frame import PlacementFrm
@@ -18,10 +19,16 @@ class SignInputFrm(tk.Frame):
         the sign is located, and with a Search button that starts a search
         for signs that correspond the best to the sign components specified
         in SignInputFrm
+
+    In the live search mode, the search runs also while the placement
+    ellipse is being edited: when the ellipse hasn't changed for
+    'self.liveDelay' ms, the search is started in a worker thread
+    (see LiveSearch), a search started earlier is cancelled. The result
+    is displayed when it differs from the last one displayed.
     """
 
     def __init__(self, parent, imgdir, signSearchFcn, showResultFcn,
-                 canvasSize, **options):
+                 canvasSize, liveSearch=False, **options):
         """Initialize the SignInputFrm object.
 
         Arguments:
@@ -29,18 +36,28 @@ class SignInputFrm(tk.Frame):
             imgdir (str): a path to the directory with images
             signSearchFcn: a function that does the search to find the most
                 similar signs to the one from the user input,
-                takes a 4-tuple specifying sign components as an argument
+                takes a 4-tuple specifying sign components as an argument,
+                and optionally a function that tells if the search has been
+                cancelled (then it returns None)
             showResultFcn: function that displays the result of the search,
                 takes a 2-tuple argument: (boolean-flag, a-list)
             canvasSize (tuple): a tuple of the form (width (int), height (int))
                 defining the size of a canvas that serves to insert the desired
                 placement of the sign
+            liveSearch (bool): whether the search runs while the placement
+                is being edited (default is False)
         """
         super().__init__(parent, **options)
         self.imgdir = imgdir
         self.signSearchFcn = signSearchFcn
         self.showResultFcn = showResultFcn
         self.canvasSize = canvasSize
+        self.liveSearch = LiveSearch(signSearchFcn) if liveSearch else None
+        self.liveDelay = 150  # ms without a change before the live search
+        self.liveJob = None  # keeps reference to the scheduled live search
+        self.pollDelay = 30  # how often to check if the live search is done
+        self.pollJob = None  # keeps reference to the scheduled check
+        self.lastResult = None  # the result displayed last
         self.bgcolor = options.get('bg', self['bg'])
         self.verticalSpace = 20   # vertical space between the widgets
         self.makeWidgets()
@@ -73,14 +90,21 @@ class SignInputFrm(tk.Frame):
                            pady=(0, self.verticalSpace))
 
         # create canvas for sign-placement input
+        if self.liveSearch:
+            onChange = self.onPlacementChange
+        else:
+            onChange = None
         self.placementfrm = PlacementFrm(self,
                                          self.imgdir,
                                          self.canvasSize,
+                                         onChange=onChange,
                                          bg=self.bgcolor)
         self.placementfrm.grid(column=1, row=3, sticky=tk.N+tk.E+tk.S+tk.W)
 
-    def onSearchPress(self):
-        """Do the search for similar signs and display the result."""
+    def getSignComponents(self):
+        """Return a 4-tuple with the sign components from the user input:
+        (active shapes, sign type, passive shape, ellipse params).
+        """
         if self.placementfrm.canvas.ellipse:
             # an ellipse object exists
             ellipseParams = (round(self.placementfrm.canvas.ellipse.center.x),
@@ -92,10 +116,66 @@ class SignInputFrm(tk.Frame):
             # no ellipse was drawn
             ellipseParams = None
 
-        signComponents = ((self.actshapes.var1.get(),
-                           self.actshapes.var2.get()),
-                          self.radiofrm.var.get(),
-                          self.radiofrm.passhapes.var1.get(),
-                          ellipseParams)
-        result = self.signSearchFcn(signComponents)
+        return ((self.actshapes.var1.get(),
+                 self.actshapes.var2.get()),
+                self.radiofrm.var.get(),
+                self.radiofrm.passhapes.var1.get(),
+                ellipseParams)
+
+    def onSearchPress(self):
+        """Do the search for similar signs and display the result."""
+        if self.liveSearch:
+            # the result of a live search started earlier is out of date
+            if self.liveJob:
+                self.after_cancel(self.liveJob)
+                self.liveJob = None
+            self.liveSearch.cancel()
+        result = self.signSearchFcn(self.getSignComponents())
+        self.showResult(result)
+
+    def showResult(self, result):
+        """Display the result, remember it."""
+        self.lastResult = result
         self.showResultFcn(result)
+
+    def onPlacementChange(self):
+        """Schedule the live search, postpone it if already scheduled."""
+        if self.liveJob:
+            self.after_cancel(self.liveJob)
+        self.liveJob = self.after(self.liveDelay, self.startLiveSearch)
+
+    def startLiveSearch(self):
+        """Start the search in the worker thread, supersede the running one,
+        and start checking for the result.
+        """
+        self.liveJob = None
+        self.liveSearch.submit(self.getSignComponents())
+        if self.pollJob is None:
+            self.pollJob = self.after(self.pollDelay, self.checkLiveResult)
+
+    def destroy(self):
+        """Cancel the scheduled live search and the check for its result,
+        stop the worker thread, and destroy the widget.
+        """
+        if self.liveJob:
+            self.after_cancel(self.liveJob)
+            self.liveJob = None
+        if self.pollJob:
+            self.after_cancel(self.pollJob)
+            self.pollJob = None
+        if self.liveSearch:
+            self.liveSearch.close()
+        super().destroy()
+
+    def checkLiveResult(self):
+        """Display the result of the live search when ready, if it differs
+        from the result displayed last.
+        """
+        self.pollJob = None
+        # (checked before the poll, a search may finish in between)
+        busy = self.liveSearch.busy()
+        result = self.liveSearch.poll()
+        if result is not None and result != self.lastResult:
+            self.showResult(result)
+        if busy:
+            self.pollJob = self.after(self.pollDelay, self.checkLiveResult)
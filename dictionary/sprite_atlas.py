@@ -0,0 +1,102 @@
+import os
+import json
+import tkinter as tk
+import PIL.Image
+
+
+class SpriteAtlas():
+    """Images of the same size packed into one image file.
+
+    The atlas is created by the build_cache.py script from the image files
+    (e.g. the handshapes), resized to the size they are displayed at.
+    It is stored as '<path>.png' and an index '<path>.json' of the form:
+        {"width": 65, "height": 80, "sprites": {"01.png": [0, 0], ...}}
+    where the sprites are listed under the names of the original files
+    with the coordinates of their top left corners in the atlas.
+
+    At runtime, the atlas is loaded at the first request for a sprite,
+    and the sprites are copied out of it by Tk, so no image is resampled.
+
+    Methods:
+        has(name, width, height):
+            Return True if the atlas contains the image at the size.
+        get(name):
+            Return a PhotoImage of a sprite.
+        unload():
+            Release the loaded atlas image.
+        build(paths, width, height, columns):
+            Pack the images into the atlas and store it.
+    """
+
+    def __init__(self, path):
+        """Read the index of the atlas, if present.
+
+        Arguments:
+            path (str): the atlas file path without a suffix
+        """
+        self.path = path
+        self.size = None  # (width, height) of the sprites
+        self.sprites = {}  # image file name -> (x, y)
+        self.atlas = None  # PhotoImage of the whole atlas, loaded lazily
+        if os.path.exists(path + '.json'):
+            with open(path + '.json') as f:
+                index = json.load(f)
+            self.size = (index['width'], index['height'])
+            self.sprites = {name: tuple(corner) for name, corner
+                            in index['sprites'].items()}
+
+    def has(self, name, width, height):
+        """Return True if the atlas contains the image file 'name'
+        at the size 'width' x 'height'.
+        """
+        return name in self.sprites and self.size == (width, height)
+
+    def get(self, name):
+        """Return a PhotoImage of the sprite of the image file 'name'.
+
+        The sprite is copied from the atlas, which is loaded on the first
+        call (a Tk root window must exist).
+        """
+        if self.atlas is None:
+            self.atlas = tk.PhotoImage(file=self.path + '.png')
+        x, y = self.sprites[name]
+        width, height = self.size
+        sprite = tk.PhotoImage(width=width, height=height)
+        sprite.tk.call(sprite, 'copy', self.atlas,
+                       '-from', x, y, x + width, y + height)
+        return sprite
+
+    def unload(self):
+        """Release the atlas image, the sprites copied out of it stay."""
+        self.atlas = None
+
+    def build(self, paths, width, height, columns=8):
+        """Pack the images into the atlas and store it.
+
+        The images are resized to 'width' x 'height' the same way as by
+        tools.getImage() and laid out in rows of 'columns' sprites.
+
+        Arguments:
+            paths: a list of paths to the image files
+            width, height (int): the size of the sprites
+            columns (int): the number of sprites in a row (default is 8)
+        """
+        rows = (len(paths) + columns - 1) // columns
+        atlas = PIL.Image.new('RGBA', (columns * width, rows * height))
+        sprites = {}
+        for i, path in enumerate(paths):
+            corner = ((i % columns) * width, (i // columns) * height)
+            with PIL.Image.open(path) as img:
+                img = img.convert('RGBA')
+                img = img.resize((width, height), PIL.Image.LANCZOS)
+                atlas.paste(img, corner)
+            sprites[os.path.basename(path)] = corner
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        atlas.save(self.path + '.png')
+        with open(self.path + '.json', 'w') as f:
+            json.dump({'width': width, 'height': height,
+                       'sprites': sprites}, f)
+        self.size = (width, height)
+        self.sprites = sprites
+        self.atlas = None
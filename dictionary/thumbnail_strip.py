@@ -0,0 +1,264 @@
+import tkinter as tk
+from tkinter import ttk
+from video_frame import VideoFrm
+
+
+class ThumbnailStrip(tk.Frame):
+    """A horizontally scrollable strip of thumbnail videos.
+
+    The strip shows a list of results, but only the thumbnails that fit
+    in the visible area exist: a small pool of VideoFrm widgets is placed
+    on a canvas and the widgets are rebound to other results as the strip
+    is scrolled. The result number i is always shown by the widget
+    'self.pool[i % len(self.pool)]', so scrolling by one thumbnail rebinds
+    one widget. The first frame of a result is loaded only when the result
+    is bound to a widget, i.e. when it's visible. If it can't be loaded
+    then (all the video files are in use), the thumbnail stays blank and
+    the loading is retried later.
+
+    So the cost of the strip doesn't depend on the number of the results.
+
+    Methods:
+        show(results):
+            Show the thumbnails of the results.
+        widget(index):
+            Return the VideoFrm showing a result, or None if not visible.
+        select(index):
+            Highlight the thumbnail of a result.
+        see(index):
+            Scroll the strip so that the thumbnail of a result is visible.
+        xview(*args):
+            Scroll the strip, called by the scrollbar.
+    """
+
+    def __init__(self, parent, library, scheduler, width, thumbWidth,
+                 thumbHeight, border, padx, onDoubleClick, onHover, onLeave,
+                 **options):
+        """Create the canvas, the scrollbar and the pool of thumbnails.
+
+        Arguments:
+            parent: a parent tkinter widget
+            library: an object that provides the video frames
+            scheduler: a PlaybackScheduler that drives the playback
+            width (int): the width of the visible area of the strip
+            thumbWidth (int): the width of the thumbnail videos
+            thumbHeight (int): the height of the thumbnail videos
+            border (int): a highlight thickness of the thumbnails
+            padx (int): horizontal spacing of the thumbnails
+            onDoubleClick, onHover, onLeave: functions called with
+                the index of a result and the event, when a thumbnail
+                is double-clicked, when the mouse cursor enters or moves
+                across a thumbnail, and when it leaves a thumbnail
+        """
+        super().__init__(parent, **options)
+        bgcolor = options.get('bg', self['bg'])
+        self.width = width
+        self.slotWidth = thumbWidth + 2*border + padx
+        self.results = []  # a list of 2-tuples (word, videofile)
+        self.offset = 0  # the scroll position in pixels
+        self.selected = None  # index of the highlighted result
+        self.retryJob = None  # keeps reference to the scheduled retry
+        self.retryDelay = 200  # ms between the retries of the first frames
+        # the retries stop after a while, a video file may be unreadable
+        self.maxRetries = 25
+        self.retries = 0  # number of retries since the results were shown
+
+        self.canvas = tk.Canvas(self,
+                                width=width,
+                                height=thumbHeight + 2*border,
+                                bg=bgcolor,
+                                highlightthickness=0)
+        self.canvas.grid(column=0, row=0, sticky=tk.N+tk.W)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL,
+                                       command=self.xview)
+
+        # the widgets needed to cover the visible area at any scroll position
+        poolSize = width // self.slotWidth + 2
+        self.pool = []  # the thumbnail VideoFrm widgets
+        self.items = []  # ids of the canvas windows with the thumbnails
+        self.bound = [None] * poolSize  # the result index of each widget
+        for k in range(poolSize):
+            thumb = VideoFrm(self.canvas,
+                             library,
+                             scheduler,
+                             thumbWidth,
+                             thumbHeight,
+                             thumb=True,
+                             border=border,
+                             bg=bgcolor)
+            item = self.canvas.create_window(0, 0,
+                                             window=thumb,
+                                             anchor=tk.NW,
+                                             state='hidden')
+            self.pool.append(thumb)
+            self.items.append(item)
+
+            # the callbacks get the index of the result bound to the widget
+            def handler(k, callback):
+                def onEvent(event):
+                    if self.bound[k] is not None:
+                        callback(self.bound[k], event)
+                return onEvent
+            thumb.canvas.bind('<Double-Button-1>', handler(k, onDoubleClick))
+            thumb.canvas.bind('<Enter>', handler(k, onHover))
+            thumb.canvas.bind('<Motion>', handler(k, onHover))
+            thumb.canvas.bind('<Leave>', handler(k, onLeave))
+
+        # enable scrolling the strip with the mouse wheel
+        self.bind('<Enter>', self.bindToWheel)
+        self.bind('<Leave>', self.unbindWheel)
+
+    def show(self, results):
+        """Show the thumbnails of the results, scrolled to the beginning,
+        the first one highlighted.
+
+        Arguments:
+            results (list): 2-tuples (word (str), videofile (str))
+        """
+        self.results = results
+        self.offset = 0
+        self.selected = 0 if results else None
+        self.retries = 0
+        for k in range(len(self.pool)):
+            self.unbindThumb(k)
+        self.layout()
+
+    def layout(self):
+        """Place the thumbnails of the visible results on the canvas,
+        rebind the widgets whose results have changed, hide the others.
+        """
+        first = self.offset // self.slotWidth
+        last = min(first + len(self.pool), len(self.results))
+        visible = set()
+        for index in range(first, last):
+            k = index % len(self.pool)
+            visible.add(k)
+            if self.bound[k] != index:
+                self.bindThumb(k, index)
+            elif not self.pool[k].frameShown:
+                self.showFirstPic(k)
+            self.canvas.coords(self.items[k],
+                               index*self.slotWidth - self.offset, 0)
+            self.canvas.itemconfig(self.items[k], state='normal')
+        for k in range(len(self.pool)):
+            if k not in visible:
+                self.unbindThumb(k)
+
+        total = len(self.results) * self.slotWidth
+        if total <= self.width:
+            self.scrollbar.grid_remove()
+        else:
+            self.scrollbar.grid(column=0, row=1, sticky=tk.E+tk.W)
+            self.scrollbar.set(self.offset / total,
+                               (self.offset + self.width) / total)
+
+    def bindThumb(self, k, index):
+        """Show the result 'index' in the widget 'self.pool[k]'."""
+        thumb = self.pool[k]
+        thumb.stop()
+        thumb.cancelScrub()
+        self.bound[k] = index
+        self.showFirstPic(k)
+        if index == self.selected:
+            thumb.lightOn()
+        else:
+            thumb.lightOff()
+
+    def showFirstPic(self, k):
+        """Show the first frame of the result bound to the widget
+        'self.pool[k]', retry later if it can't be loaded now.
+        """
+        if not self.pool[k].showFirstPic(self.results[self.bound[k]][1]):
+            if self.retryJob is None and self.retries < self.maxRetries:
+                self.retryJob = self.after(self.retryDelay,
+                                           self.retryFirstPics)
+
+    def retryFirstPics(self):
+        """Show the first frames of the blank thumbnails."""
+        self.retryJob = None
+        self.retries += 1
+        for k, index in enumerate(self.bound):
+            # a thumbnail played or scrubbed meanwhile isn't blank
+            if index is not None and not self.pool[k].frameShown:
+                self.showFirstPic(k)
+
+    def destroy(self):
+        """Cancel the scheduled retry and destroy the widget."""
+        if self.retryJob:
+            self.after_cancel(self.retryJob)
+            self.retryJob = None
+        super().destroy()
+
+    def unbindThumb(self, k):
+        """Stop and hide the widget 'self.pool[k]'."""
+        if self.bound[k] is not None:
+            self.pool[k].stop()
+            self.pool[k].cancelScrub()
+            self.bound[k] = None
+        self.canvas.itemconfig(self.items[k], state='hidden')
+
+    def widget(self, index):
+        """Return the VideoFrm showing the result 'index', or None if
+        the result is not visible.
+        """
+        k = index % len(self.pool)
+        if self.bound[k] == index:
+            return self.pool[k]
+        return None
+
+    def select(self, index):
+        """Highlight the thumbnail of the result 'index', remove
+        the highlighting from the others.
+        """
+        self.selected = index
+        for k, bound in enumerate(self.bound):
+            if bound is None:
+                continue
+            if bound == index:
+                self.pool[k].lightOn()
+            else:
+                self.pool[k].lightOff()
+
+    def see(self, index):
+        """Scroll the strip so that the thumbnail of the result 'index'
+        is visible.
+        """
+        left = index * self.slotWidth
+        if left < self.offset:
+            self.scrollTo(left)
+        elif left + self.slotWidth > self.offset + self.width:
+            self.scrollTo(left + self.slotWidth - self.width)
+
+    def xview(self, *args):
+        """Scroll the strip, the arguments are those of the scrollbar
+        command: ('moveto', fraction) or ('scroll', number, 'units'/'pages').
+        """
+        total = len(self.results) * self.slotWidth
+        if args[0] == 'moveto':
+            self.scrollTo(int(float(args[1]) * total))
+        elif args[0] == 'scroll':
+            if args[2] == 'pages':
+                step = self.width
+            else:
+                step = self.slotWidth // 4
+            self.scrollTo(self.offset + int(args[1]) * step)
+
+    def scrollTo(self, offset):
+        """Scroll the strip to the position 'offset' in pixels."""
+        total = len(self.results) * self.slotWidth
+        offset = min(max(0, offset), max(0, total - self.width))
+        if offset != self.offset:
+            self.offset = offset
+            self.layout()
+
+    def bindToWheel(self, event):
+        """Bind scrolling of the strip to the mouse wheel."""
+        self.canvas.bind_all('<Button-5>', lambda event: self.xview(
+            'scroll', 1, 'units'))
+        self.canvas.bind_all('<Button-4>', lambda event: self.xview(
+            'scroll', -1, 'units'))
+
+    def unbindWheel(self, event):
+        """Unbind the mouse wheel events."""
+        self.canvas.unbind_all('<Button-5>')
+        self.canvas.unbind_all('<Button-4>')
@@ -1,32 +1,103 @@
 """video_frame module
 
+functions:
+    scaleFrame: scale a video frame to a given width
+
 classes:
     VideoFrm: a frame where a video is played
+    FrameProducer: a thread preparing the frames of a video in advance
     MyVideoCapture: class capturing a video source
 """
 
 
 import tkinter as tk
-import cv2
 import PIL.Image
 import PIL.ImageTk
 import os
-import tools
+import time
+import queue
+import threading
+try:  # relative imports used in tests
+    from .playback_scheduler import PlaybackScheduler
+    from .resource_cache import resources
+except:
+    from playback_scheduler import PlaybackScheduler
+    from resource_cache import resources
+
+cv2 = None  # OpenCV is imported on the first video play, see loadCv2()
+
+
+def loadCv2():
+    """Import OpenCV if it is not imported yet.
+
+    Importing OpenCV takes a noticeable time, so it is postponed until
+    a video is played for the first time, to keep it off the startup path.
+    """
+    global cv2
+    if cv2 is None:
+        import cv2 as module
+        cv2 = module
+
+
+def scaleFrame(frame, width):
+    """Scale a video frame to 'width', keeping the aspect ratio.
+
+    A frame is shrunk by area averaging (good quality and fast for large
+    reductions), and enlarged by bilinear interpolation.
+
+    Arguments:
+        frame (numpy array): a frame with 3 color channels
+        width (int): the new width
+    Returns:
+        numpy array
+    """
+    loadCv2()
+    height, oldwidth = frame.shape[:2]
+    newheight = int(height * width / oldwidth)
+    if width < oldwidth:
+        interpolation = cv2.INTER_AREA
+    else:
+        interpolation = cv2.INTER_LINEAR
+    return cv2.resize(frame, (width, newheight), interpolation=interpolation)
 
 
 class VideoFrm(tk.Frame):
     """A frame with a canvas widget for playing a video.
 
     A VideoFrm is used for both the large video screen and the thumbnail
-    videos.
+    videos. The frames to be displayed are provided by a VideoLibrary object.
+
+    The frames are decoded and scaled by a FrameProducer thread (or by
+    a decode worker process), the Tk thread only displays them.
+    The playback is driven by a PlaybackScheduler shared by all the VideoFrm
+    objects, and paced by the frame rate of the video against a monotonic
+    clock: when the display falls behind, the frames that are already late
+    are dropped.
+
+    In the playlist mode (see playPlaylist()), several videos are played
+    back-to-back: while a video is played, the frame source of the next
+    one is already opened and fills its queue, and its first frame is
+    displayed when the next frame of the finished video would be due.
+
+    The frames are displayed in one persistent canvas image item, whose
+    PhotoImage is updated in place. The time spent on rendering the frames
+    is summed up over all VideoFrm objects, see renderCost().
     """
 
-    def __init__(self, parent, width, height, imgdir=None, thumb=False,
-                 border=0, **options):
+    renderedFrames = 0  # number of frames rendered by all VideoFrm objects
+    renderTime = 0.0  # total time spent on rendering them, in seconds
+
+    QUEUE_SIZE = 8  # max number of frames prepared by the producer in advance
+    POLL_DELAY = 5  # ms to wait for the producer when no frame is ready
+
+    def __init__(self, parent, library, scheduler, width, height,
+                 imgdir=None, thumb=False, border=0, **options):
         """Initialize a VideoFrm object. Create a 'self.canvas' widget.
 
         Arguments:
             parent: the parent tkinter widget
+            library: an object that provides the video frames
+            scheduler: a PlaybackScheduler that drives the playback
             width (int): the width of the canvas
             height (int): the height of the canvas
             imgdir (str): a path to the directory with images (default is None)
@@ -37,10 +108,25 @@ class VideoFrm(tk.Frame):
                 (default is 0)
         """
         super().__init__(parent, **options)
+        self.library = library
+        self.scheduler = scheduler
         self.thumb = thumb
         self.border = border
         self.bgcolor = options.get('bg', self['bg'])
-        self.job = None  # keeps reference to a job scheduled with after call
+        self.videoSource = None  # the video being played
+        self.producer = None  # the source of the frames being played
+        self.clips = []  # the videos of the playlist being played
+        self.clip = 0  # index of the video being played in 'self.clips'
+        self.onClip = None  # called with the index of a video when it starts
+        self.nextProducer = None  # the pre-rolled source of the next video
+        self.startTime = None  # monotonic time of the first frame display
+        self.received = 0  # number of frames taken from the producer
+        self.image = None  # PhotoImage displaying the video frames
+        self.imageId = None  # id of the canvas item displaying 'self.image'
+        self.replayShown = False  # whether the replay arrow is displayed
+        self.frameShown = False  # whether a frame of the video is displayed
+        self.scrubTarget = None  # (video_source, x) of the last scrub
+        self.scrubJob = None  # keeps reference to the scheduled scrub
 
         if imgdir:
             self.replayArrowPath = os.path.join(imgdir, 'replay_arrow.png')
@@ -66,46 +152,188 @@ class VideoFrm(tk.Frame):
         Arguments:
             video_source (str): a path to the video file to be played
         """
-        if self.job:
-            self.after_cancel(self.job)
-        self.video = MyVideoCapture(video_source)
-        self.update(video_source)
+        self.stop()
+        self.clips = [video_source]
+        self.clip = 0
+        self.onClip = None
+        self.videoSource = video_source
+        self.producer = self.library.producer(video_source, self.width,
+                                              self.QUEUE_SIZE)
+        self.startTime = None
+        self.received = 0
+        if self.thumb:
+            self.scheduler.register(self, PlaybackScheduler.LOW)
+        else:
+            self.scheduler.register(self, PlaybackScheduler.HIGH)
 
-    def update(self, video_source):
-        """Get a frame from the video source and display it on 'self.canvas'.
+    def playPlaylist(self, video_sources, onClip=None):
+        """Play the videos one after another, without a gap between them.
 
-        After it is called once, the update method will be automatically
-        called every 'self.video.delay' milliseconds until there are no frames
-        left in the video source.
+        Arguments:
+            video_sources (list): paths to the video files to be played
+            onClip: a function called with the index of a video in
+                'video_sources' when the video starts (default is None)
         """
-        flag, frame = self.video.getFrame()
-        if flag:
-            # there is a frame in the video source
-            img = PIL.Image.fromarray(frame)
-            # resize the image
-            newwidth = self.width
-            newheight = int(self.video.height * newwidth / self.video.width)
-            img = img.resize((newwidth, newheight), PIL.Image.BILINEAR)
+        self.play(video_sources[0])
+        self.clips = list(video_sources)
+        self.onClip = onClip
+        if onClip:
+            onClip(0)
+        self.prerollNext()
 
-            # display the image on the canvas
-            self.image = PIL.ImageTk.PhotoImage(img)
-            self.canvas.delete('all')
-            self.canvas.create_image(self.centerX,
-                                     self.centerY,
-                                     image=self.image,
-                                     anchor=tk.CENTER)
-            # after delay, call self.update method again
-            self.job = self.after(self.video.delay,
-                                  lambda: self.update(video_source))
+    def prerollNext(self):
+        """Open the frame source of the next video of the playlist, so that
+        its first frames are decoded while the current video is played.
+        """
+        if self.clip + 1 < len(self.clips):
+            self.nextProducer = self.library.producer(
+                self.clips[self.clip + 1], self.width, self.QUEUE_SIZE)
+
+    def startNextClip(self, startTime):
+        """Continue the playback with the pre-rolled next video.
+
+        Arguments:
+            startTime (float): the monotonic time when the first frame
+                of the next video is due
+        """
+        self.producer = self.nextProducer
+        self.nextProducer = None
+        self.clip += 1
+        self.videoSource = self.clips[self.clip]
+        self.startTime = startTime
+        self.received = 0
+        if self.onClip:
+            self.onClip(self.clip)
+        self.prerollNext()
+
+    def stop(self):
+        """Stop playing the current video, if any."""
+        self.scheduler.unregister(self)
+        if self.producer:
+            self.producer.stop()
+            self.producer = None
+        if self.nextProducer:
+            self.nextProducer.stop()
+            self.nextProducer = None
+
+    def destroy(self):
+        """Stop the playback and destroy the widget.
+
+        Stopping the producer gives the video capture back to the library
+        right away, without waiting for the garbage collector.
+        """
+        self.stop()
+        self.cancelScrub()
+        self.image = None
+        super().destroy()
+
+    def advance(self, now):
+        """Display the frame that is due at the time 'now' on 'self.canvas'.
+
+        Take the frames from 'self.producer' up to the one that is due
+        according to the video frame rate, the late frames are dropped.
+        Called by 'self.scheduler' until there are no frames left
+        in the video source.
+
+        Arguments:
+            now (float): the current monotonic time
+        Returns:
+            the monotonic time when the next frame is due (float), or None
+            if the video has finished
+        """
+        fps = self.library.frameRate(self.videoSource, self.width)
+        if self.startTime is None:
+            due = 0  # the playback starts with the first frame produced
         else:
-            # there are no more frames in the video source
-            self.showFirstPic(video_source)
-            if not self.thumb:
-                # the object is the large video, not a thumbnail
-                # draw a replay arrow and replay the video on a mouse click
-                self.drawReplayArrow()
-                self.canvas.bind('<Button-1>', (lambda event: self.onVideoClick
-                                                (video_source)))
+            due = int((now - self.startTime) * fps)
+
+        frame = None
+        finished = False
+        while self.received <= due:
+            try:
+                item = self.producer.get()
+            except queue.Empty:
+                # the producer is behind
+                break
+            if item is FrameProducer.END:
+                finished = True
+                break
+            frame = item
+            self.received += 1
+
+        if frame is not None:
+            if self.startTime is None:
+                self.startTime = now
+            self.showFrame(frame)
+
+        if not finished:
+            if self.startTime is None or frame is None:
+                # no frame ready yet, check the producer again shortly
+                return now + self.POLL_DELAY / 1000
+            # the time when the next frame is due
+            return self.startTime + self.received / fps
+
+        if self.nextProducer:
+            # the next video of the playlist starts when the next frame
+            # of the finished one would be due
+            startTime = None
+            if self.startTime is not None:
+                startTime = self.startTime + self.received / fps
+            self.startNextClip(startTime)
+            return self.advance(now)
+
+        # there are no more frames in the video source
+        self.producer = None
+        clips, onClip = self.clips, self.onClip
+        self.showFirstPic(clips[0])
+        if not self.thumb:
+            # the object is the large video, not a thumbnail
+            # draw a replay arrow and replay the video on a mouse click
+            self.drawReplayArrow()
+            if len(clips) == 1:
+                self.canvas.bind('<Button-1>', (lambda event:
+                                                self.onVideoClick(clips[0])))
+            else:
+                self.canvas.bind('<Button-1>', (lambda event:
+                                                self.onPlaylistClick(clips,
+                                                                     onClip)))
+        return None
+
+    def scrub(self, video_source, x):
+        """Stop the playback and display the frame of the video that
+        corresponds to the horizontal position 'x' on 'self.canvas',
+        the canvas width spans the whole video.
+
+        The frame is displayed when Tk gets idle, so that a burst of mouse
+        motion events costs one frame lookup.
+
+        Arguments:
+            video_source (str): a path to the video file
+            x (int): the x coordinate on the canvas
+        """
+        self.stop()
+        self.scrubTarget = (video_source, x)
+        if self.scrubJob is None:
+            self.scrubJob = self.after_idle(self.showScrubFrame)
+
+    def cancelScrub(self):
+        """Cancel the display of the frame of the last scrub, if pending."""
+        if self.scrubJob:
+            self.after_cancel(self.scrubJob)
+            self.scrubJob = None
+
+    def showScrubFrame(self):
+        """Display the frame at the position of the last scrub."""
+        self.scrubJob = None
+        video_source, x = self.scrubTarget
+        count = self.library.frameCount(video_source, self.width)
+        if count == 0:
+            return
+        position = (x - self.border) / self.width
+        index = min(count - 1, max(0, int(position * count)))
+        frame = self.library.frameAt(video_source, self.width, index)
+        if frame is not None:
+            self.showFrame(frame)
 
     def onVideoClick(self, video_source):
         """Replay the video."""
@@ -114,6 +342,11 @@ class VideoFrm(tk.Frame):
         # on the first click
         self.canvas.unbind('<Button-1>')
 
+    def onPlaylistClick(self, video_sources, onClip):
+        """Replay the playlist."""
+        self.playPlaylist(video_sources, onClip)
+        self.canvas.unbind('<Button-1>')
+
     def lightOn(self):
         """Highlight the canvas."""
         self.canvas.config(highlightbackground='red')
@@ -123,24 +356,68 @@ class VideoFrm(tk.Frame):
         self.canvas.config(highlightbackground=self.bgcolor)
 
     def showFirstPic(self, video_source):
-        """Display the first frame from the video source on self.canvas.
+        """Display the first frame from the video source on self.canvas,
+        blank the canvas if the frame can't be loaded now.
 
         Arguments:
             video_source (str): a path to the video file
+        Returns:
+            True if the frame has been displayed
+        """
+        frame = self.library.firstFrame(video_source, self.width)
+        if frame is None:
+            self.clearFrame()
+            return False
+        self.showFrame(frame)
+        return True
+
+    def clearFrame(self):
+        """Hide the displayed frame and the replay arrow, if any."""
+        if self.frameShown:
+            self.canvas.itemconfig(self.imageId, state='hidden')
+            self.frameShown = False
+        if self.replayShown:
+            self.canvas.delete('replay')
+            self.replayShown = False
+
+    def showFrame(self, frame):
+        """Display a frame on self.canvas, remove the replay arrow if present.
+
+        The pixels of the frame are written into the existing 'self.image',
+        a new PhotoImage is created only if the frame size has changed.
+
+        Arguments:
+            frame (numpy array): an RGB frame
         """
-        vid = MyVideoCapture(video_source)
-        flag, frame = vid.getFrame()
+        start = time.perf_counter()
         img = PIL.Image.fromarray(frame)
-        # resize the image
-        newwidth = self.width
-        newheight = int(vid.height * newwidth / vid.width)
-        img = img.resize((newwidth, newheight), PIL.Image.BILINEAR)
-        # display the image on the canvas
-        self.image = PIL.ImageTk.PhotoImage(img)
-        self.canvas.create_image(self.centerX,
-                                 self.centerY,
-                                 image=self.image,
-                                 anchor=tk.CENTER)
+        if self.image and (self.image.width(),
+                           self.image.height()) == img.size:
+            self.image.paste(img)
+        else:
+            self.image = PIL.ImageTk.PhotoImage(img)
+            if self.imageId:
+                self.canvas.itemconfig(self.imageId, image=self.image)
+        if self.imageId is None:
+            self.imageId = self.canvas.create_image(self.centerX,
+                                                    self.centerY,
+                                                    image=self.image,
+                                                    anchor=tk.CENTER)
+        elif not self.frameShown:
+            self.canvas.itemconfig(self.imageId, state='normal')
+        self.frameShown = True
+        if self.replayShown:
+            self.canvas.delete('replay')
+            self.replayShown = False
+        VideoFrm.renderTime += time.perf_counter() - start
+        VideoFrm.renderedFrames += 1
+
+    @classmethod
+    def renderCost(cls):
+        """Return the average time of rendering one frame in milliseconds."""
+        if cls.renderedFrames == 0:
+            return 0
+        return cls.renderTime / cls.renderedFrames * 1000
 
     def drawReplayArrow(self):
         """Draw a replay arrow over the video on self.canvas
@@ -151,39 +428,161 @@ class VideoFrm(tk.Frame):
                                      self.width,
                                      self.height,
                                      fill='black',
-                                     stipple='gray25')
-        self.arrow = tools.getImage(self.replayArrowPath,
-                                    width=self.arrowSize,
-                                    height=self.arrowSize)
+                                     stipple='gray25',
+                                     tags='replay')
+        # the image is loaded once and shared by all the VideoFrm objects
+        arrow = resources.image(self.replayArrowPath,
+                                width=self.arrowSize,
+                                height=self.arrowSize)
         self.canvas.create_image(self.centerX,
                                  self.centerY,
-                                 image=self.arrow,
-                                 anchor=tk.CENTER)
+                                 image=arrow,
+                                 anchor=tk.CENTER,
+                                 tags='replay')
+        self.replayShown = True
+
+
+class FrameProducer(threading.Thread):
+    """A thread that fills a bounded queue with display-ready frames.
+
+    The frames are taken from an iterator (usually a generator that decodes
+    and scales the frames of a video) until it is exhausted or the producer
+    is stopped. After the last frame, FrameProducer.END is put in the queue.
+    """
+
+    END = object()  # marks the end of the frames in the queue
+
+    def __init__(self, frames, queueSize):
+        """Initialize the thread, it is started by the start() method.
+
+        Arguments:
+            frames: an iterator over the frames (numpy arrays)
+            queueSize (int): max number of frames waiting in the queue
+        """
+        super().__init__(daemon=True)
+        self.frames = frames
+        self.queue = queue.Queue(maxsize=queueSize)
+        self.stopped = threading.Event()
+        self.timeout = 0.1  # how often to check if the producer was stopped
+
+    def run(self):
+        """Put the frames in the queue, block while the queue is full."""
+        for frame in self.frames:
+            if not self.put(frame):
+                break
+        else:
+            self.put(self.END)
+        if hasattr(self.frames, 'close'):
+            # a closed generator releases the video source immediately
+            self.frames.close()
+
+    def put(self, item):
+        """Put 'item' in the queue, return False if the producer was
+        stopped before there was a free place in the queue.
+        """
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=self.timeout)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(self):
+        """Return the next item from the queue without blocking.
+
+        Raises queue.Empty if no item is ready.
+        """
+        return self.queue.get_nowait()
+
+    def stop(self):
+        """Make the thread finish without producing the remaining frames."""
+        self.stopped.set()
 
 
 class MyVideoCapture:
     """A class capturing a video source using an OpenCV VideoCapture."""
 
     def __init__(self, video_source):
+        loadCv2()
         # open the video source
+        self.videoSource = video_source
         self.vid = cv2.VideoCapture(video_source)
+        # the number of the next frame read, tracked so that the capture
+        # can be left in the CapturePool and continued from where it was
+        self.position = 0
 
-        # get the video source width and height
-        self.width = self.vid.get(cv2.CAP_PROP_FRAME_WIDTH)
-        self.height = self.vid.get(cv2.CAP_PROP_FRAME_HEIGHT)
+    # the properties of the video source are probed only when asked for,
+    # they are usually known from the 'videometa' table of the database
 
-        self.delay = 20
+    @property
+    def width(self):
+        """The width of the video frames."""
+        return self.vid.get(cv2.CAP_PROP_FRAME_WIDTH)
+
+    @property
+    def height(self):
+        """The height of the video frames."""
+        return self.vid.get(cv2.CAP_PROP_FRAME_HEIGHT)
+
+    @property
+    def fps(self):
+        """The frame rate (0 if it is unknown)."""
+        return self.vid.get(cv2.CAP_PROP_FPS)
+
+    @property
+    def frameCount(self):
+        """The number of frames according to the file header."""
+        return int(self.vid.get(cv2.CAP_PROP_FRAME_COUNT))
 
     def __del__(self):
         """Release the video source when the object is destroyed."""
+        self.release()
+
+    def release(self):
+        """Release the video source."""
         if self.vid.isOpened():
             self.vid.release()
 
-    def getFrame(self):
-        """Return a tuple of a boolean success flag and the current frame."""
+    def rewind(self):
+        """Seek to the first frame, return False if it is not possible."""
+        return self.seek(0)
+
+    def seek(self, index):
+        """Seek to the frame 'index' (0-based), return False if it is not
+        possible. The seek is cheap if the frame is a keyframe.
+        """
+        if not self.vid.isOpened():
+            return False
+        if not self.vid.set(cv2.CAP_PROP_POS_FRAMES, index):
+            return False
+        self.position = index
+        return True
+
+    def skipFrames(self, count):
+        """Skip 'count' frames without converting them, return False
+        if the video has ended before.
+        """
+        for i in range(count):
+            if not self.vid.isOpened() or not self.vid.grab():
+                return False
+            self.position += 1
+        return True
+
+    def getFrame(self, width=None):
+        """Return a tuple of a boolean success flag and the current frame.
+
+        The frame is an RGB numpy array. If 'width' is given, the frame is
+        scaled to it. The scaling is done on the decoded BGR array before
+        the color conversion, so that the conversion of a thumbnail frame
+        runs on the smaller array.
+        """
         if self.vid.isOpened():
             flag, frame = self.vid.read()
             if flag:
+                self.position += 1
+                if width:
+                    frame = scaleFrame(frame, width)
                 return (flag, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
             else:
                 return (flag, None)
@@ -0,0 +1,497 @@
+import os
+import threading
+try:  # relative imports used in tests
+    from .decode_pool import DecodePool
+    from .frame_cache import FrameCache
+    from .keyframe_index import KeyframeIndex
+    from .video_meta import canonicalNames
+    from .poster_cache import PosterCache
+    from .preview_strips import PreviewStrips
+    from .capture_pool import CapturePool
+    from .video_frame import FrameProducer
+except:
+    from decode_pool import DecodePool
+    from frame_cache import FrameCache
+    from keyframe_index import KeyframeIndex
+    from video_meta import canonicalNames
+    from poster_cache import PosterCache
+    from preview_strips import PreviewStrips
+    from capture_pool import CapturePool
+    from video_frame import FrameProducer
+
+
+class VideoLibrary():
+    """A class that provides the video frames displayed in VideoFrm objects.
+
+    The frames are decoded from the video files and scaled to the width
+    of the canvas they are displayed on. The scaled frames of the videos
+    that were played to the end are kept in a shared frame cache, so that
+    replaying a video or playing it again in a thumbnail doesn't require
+    decoding the video file again. The first frames of the videos
+    (posters) are taken from a poster cache precomputed by build_cache.py.
+    The thumbnail-sized frames are taken from memory-mapped preview strips,
+    if they were built by build_cache.py as well. The video files are
+    opened through a bounded CapturePool, and released as soon as they
+    have been read.
+
+    The video files with the same content (see the 'videometa' table) are
+    all played from one canonical file, so that all the caches are keyed by
+    the content of the videos, and a video is decoded and cached only once
+    whatever its file name is.
+
+    The beginnings of the videos that are likely to be played next can be
+    decoded in advance by a Prefetcher thread (see prefetch()). They are
+    kept in a separate prefix cache, a video whose beginning is there
+    starts playing without waiting for the decoder.
+
+    Single frames can be taken from any position of a video (see frameAt()),
+    to let the user scrub through a video. If a frame has to be decoded,
+    the decoding starts at the nearest keyframe found in the keyframe index
+    precomputed by build_cache.py.
+
+    Optionally, the videos that have to be decoded are decoded by a pool
+    of worker processes into shared memory (see DecodePool), instead of
+    a FrameProducer thread of the UI process.
+
+    Methods:
+        producer(video_source, width, queueSize):
+            Return a started source of the frames of a video.
+        frames(video_source, width):
+            Generate the frames of a video scaled to a given width.
+        prefetch(video_sources, width):
+            Decode the beginnings of videos in the background.
+        frameRate(video_source, width):
+            Return the frame rate of a video played at a given width.
+        firstFrame(video_source, width):
+            Return the first frame of a video scaled to a given width.
+        frameCount(video_source, width):
+            Return the number of frames of a video played at a given width.
+        frameAt(video_source, width, index):
+            Return a frame of a video scaled to a given width.
+        close():
+            Stop the decode worker processes, close the video files.
+    """
+
+    def __init__(self, frameCacheSize, cachedir, decodeProcesses=0,
+                 prefixCacheSize=32 * 2**20, maxCaptures=8, videoMeta=None,
+                 thumbWidth=0, thumbFrameStep=1):
+        """Initialize the attributes.
+
+        Arguments:
+            frameCacheSize (int): memory budget of the frame cache in bytes
+            cachedir (str): a path to the directory with precomputed caches
+            decodeProcesses (int): the number of decode worker processes,
+                0 means decoding in threads (default is 0)
+            prefixCacheSize (int): memory budget of the cache of prefetched
+                video beginnings in bytes (default is 32 MiB)
+            maxCaptures (int): the maximal number of video files open
+                at a time (default is 8)
+            videoMeta (dict): video file name -> VideoMeta, the metadata
+                of the videos (default is None)
+            thumbWidth (int): the max width of the videos played as
+                thumbnails (default is 0)
+            thumbFrameStep (int): only every n-th frame of the thumbnail
+                videos is decoded, 2 halves their decoding (default is 1)
+        """
+        self.cachedir = cachedir
+        self.frameCache = FrameCache(frameCacheSize)
+        # the open video files, reused by rewinding
+        self.captures = CapturePool(maxCaptures)
+        # the first frames of the videos, decoded by the prefetcher
+        self.prefixCache = FrameCache(prefixCacheSize)
+        self.prefetcher = None
+        self.prefetchFrames = 12  # number of frames prefetched per video
+        self.posterCache = PosterCache(os.path.join(cachedir, 'posters.db'))
+        self.strips = PreviewStrips(os.path.join(cachedir, 'strips'))
+        self.keyframes = KeyframeIndex(os.path.join(cachedir,
+                                                    'keyframes.json'))
+        # the metadata of the videos, so that they don't have to be probed
+        self.videoMeta = videoMeta or {}
+        # duplicate video file name -> name of the file with the same
+        # content that is played and cached in its place
+        self.canonicalNames = canonicalNames(self.videoMeta)
+        # frame rates of the videos that are not in 'self.videoMeta'
+        # and have been opened, in frames/second
+        self.frameRates = {}
+        # frame rate used for the videos that have not been opened yet
+        self.defaultFrameRate = 50
+        self.thumbWidth = thumbWidth
+        self.thumbFrameStep = thumbFrameStep
+        # number of frames in the shared-memory ring buffer of a video
+        self.ringSize = 8
+        self.decodePool = None
+        if decodeProcesses and DecodePool.available():
+            self.decodePool = DecodePool(decodeProcesses, self.ringSize)
+
+    def producer(self, video_source, width, queueSize):
+        """Return a started source of the frames of a video scaled
+        to 'width'.
+
+        The source is a SharedFrameSource if the video has to be decoded
+        and a decode worker process is idle, or a FrameProducer thread
+        otherwise. Both have the methods get() and stop().
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the frames
+            queueSize (int): max number of frames prepared in advance
+                by a FrameProducer
+        """
+        video_source = self.canonical(video_source)
+        key = (video_source, width)
+        if (self.decodePool and key not in self.frameCache and
+                key not in self.prefixCache and
+                self.strips.get(video_source, width) is None):
+            def onOpen(fps):
+                self.frameRates[video_source] = fps
+
+            def onEnd(frames):
+                self.frameCache.put(key, frames)
+
+            source = self.decodePool.open(video_source, width,
+                                          self.frameStep(video_source, width),
+                                          onOpen, onEnd)
+            if source:
+                return source
+        source = FrameProducer(self.frames(video_source, width), queueSize)
+        source.start()
+        return source
+
+    def frames(self, video_source, width):
+        """Generate the frames of a video scaled to 'width'.
+
+        If the frames are cached or there is a preview strip of the video
+        with frames of the given width, no decoding is done. Otherwise
+        the video file is decoded, and if all its frames are generated,
+        they are stored in the frame cache.
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the generated frames
+        Yields:
+            numpy arrays of shape (height, width, 3) with RGB frames
+        """
+        video_source = self.canonical(video_source)
+        key = (video_source, width)
+        cached = self.frameCache.get(key)
+        if cached is not None:
+            yield from cached
+            return
+        strip = self.strips.get(video_source, width)
+        if strip is not None:
+            yield from strip
+            return
+
+        decoded = []
+        prefix = self.prefixCache.get(key)
+        if prefix is not None:
+            # the beginning was prefetched, decode only the rest
+            yield from prefix
+            decoded.extend(prefix)
+        video = self.captures.acquire(video_source)
+        try:
+            self.learnFrameRate(video_source, video)
+            step = self.frameStep(video_source, width)
+            if not video.skipFrames(len(decoded) * step):
+                return
+            while True:
+                flag, frame = video.getFrame(width)
+                if not flag:
+                    break
+                decoded.append(frame)
+                yield frame
+                if step > 1:
+                    video.skipFrames(step - 1)
+        finally:
+            # also when the generator is closed before the end
+            self.captures.release(video)
+        self.frameCache.put(key, decoded)
+
+    def prefetch(self, video_sources, width):
+        """Decode the first frames of the videos in a background thread
+        and store them in the prefix cache.
+
+        The prefetching that is in progress is cancelled first, so calling
+        prefetch([], width) just cancels it.
+
+        Arguments:
+            video_sources (list): paths to the video files, in the order
+                in which they are prefetched
+            width (int): the width of the frames
+        """
+        if self.prefetcher:
+            self.prefetcher.stop()
+            self.prefetcher = None
+        # the duplicates are prefetched once
+        video_sources = list(dict.fromkeys(self.canonical(video_source)
+                                           for video_source in video_sources))
+        if video_sources:
+            self.prefetcher = Prefetcher(self, video_sources, width)
+            self.prefetcher.start()
+
+    def prefetchVideo(self, video_source, width, stopped):
+        """Decode the first 'self.prefetchFrames' frames of a video into
+        the prefix cache, unless they are available without decoding.
+
+        A video shorter than that is stored in the frame cache as a whole.
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the frames
+            stopped (threading.Event): stops the decoding when set
+        """
+        video_source = self.canonical(video_source)
+        key = (video_source, width)
+        if (key in self.frameCache or key in self.prefixCache or
+                self.strips.get(video_source, width) is not None):
+            return
+        video = self.captures.acquire(video_source)
+        try:
+            self.learnFrameRate(video_source, video)
+            step = self.frameStep(video_source, width)
+            frames = []
+            while len(frames) < self.prefetchFrames:
+                if stopped.is_set():
+                    return
+                flag, frame = video.getFrame(width)
+                if not flag:
+                    self.frameCache.put(key, frames)
+                    return
+                frames.append(frame)
+                if step > 1:
+                    video.skipFrames(step - 1)
+        finally:
+            self.captures.release(video)
+        self.prefixCache.put(key, frames)
+
+    def firstFrame(self, video_source, width):
+        """Return the first frame of a video scaled to 'width', or None
+        if the video can't be read.
+
+        The video file is opened only if the frame is neither in the frame
+        cache, the prefix cache nor in the poster cache. Called in the Tk
+        thread, so None is returned also if all the captures are in use.
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the frame
+        """
+        video_source = self.canonical(video_source)
+        key = (video_source, width)
+        for frames in (self.frameCache.get(key), self.prefixCache.get(key)):
+            if frames:
+                return frames[0]
+        poster = self.posterCache.get(video_source, width)
+        if poster is not None:
+            return poster
+        video = self.captures.acquire(video_source, block=False)
+        if video is None:
+            return None
+        try:
+            self.learnFrameRate(video_source, video)
+            flag, frame = video.getFrame(width)
+        finally:
+            self.captures.release(video)
+        return frame
+
+    def frameRate(self, video_source, width):
+        """Return the frame rate of a video played at 'width' in frames
+        per second.
+
+        If the video is played from a preview strip, the frame rate of
+        the strip is returned, if it is known. Otherwise the frame rate
+        is taken from the video metadata. For the videos without metadata,
+        the frame rate is known once the video has been opened, for
+        the videos that have not been opened yet a default rate is
+        returned.
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the played frames
+        """
+        video_source = self.canonical(video_source)
+        if self.strips.get(video_source, width) is not None:
+            rate = self.strips.frameRate(video_source)
+            if rate:
+                return rate
+            # every step-th frame of the video is in the strip
+            step = self.strips.step
+        else:
+            step = self.frameStep(video_source, width)
+        meta = self.meta(video_source)
+        if meta is not None and meta.fps:
+            rate = meta.fps
+        else:
+            rate = self.frameRates.get(video_source) or self.defaultFrameRate
+        return rate / step
+
+    def frameStep(self, video_source, width):
+        """Return n, if every n-th frame of a video played at 'width'
+        is decoded.
+
+        Only every 'self.thumbFrameStep'-th frame of the videos played
+        at thumbnail widths is decoded, unless they are played from
+        a preview strip.
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the played frames
+        """
+        if (width <= self.thumbWidth and
+                self.strips.get(video_source, width) is None):
+            return self.thumbFrameStep
+        return 1
+
+    def canonical(self, video_source):
+        """Return the path of the canonical video file with the same content
+        as 'video_source' (see video_meta.findDuplicates()), or
+        'video_source' itself if it has no duplicates.
+
+        Arguments:
+            video_source (str): a path to the video file
+        """
+        name = self.canonicalNames.get(os.path.basename(video_source))
+        if name is None:
+            return video_source
+        return os.path.join(os.path.dirname(video_source), name)
+
+    def meta(self, video_source):
+        """Return the VideoMeta of a video, or None if it is not known.
+
+        Arguments:
+            video_source (str): a path to the video file
+        """
+        return self.videoMeta.get(os.path.basename(video_source))
+
+    def learnFrameRate(self, video_source, video):
+        """Record the frame rate of an opened video, unless it is known
+        from the metadata.
+
+        Arguments:
+            video_source (str): a path to the video file
+            video: the MyVideoCapture of the video
+        """
+        if self.meta(video_source) is None:
+            self.frameRates[video_source] = video.fps
+
+    def frameCount(self, video_source, width):
+        """Return the number of frames of a video played at 'width', or 0
+        if the video can't be read (or has to be opened while all
+        the captures are in use, this is called in the Tk thread).
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the played frames
+        """
+        video_source = self.canonical(video_source)
+        cached = self.frameCache.get((video_source, width))
+        if cached:
+            return len(cached)
+        strip = self.strips.get(video_source, width)
+        if strip is not None:
+            return len(strip)
+        meta = self.meta(video_source)
+        if meta is not None:
+            count = meta.frames
+        else:
+            count = self.keyframes.frameCount(video_source)
+        if count is None:
+            video = self.captures.acquire(video_source, block=False)
+            if video is None:
+                return 0
+            try:
+                count = video.frameCount
+            finally:
+                self.captures.release(video)
+        # only every step-th frame is played
+        step = self.frameStep(video_source, width)
+        return (count + step - 1) // step
+
+    def frameAt(self, video_source, width, index):
+        """Return the frame number 'index' of a video played at 'width',
+        or None if the video can't be read.
+
+        The frame is taken from the frame cache, the preview strip, or the
+        prefix cache if possible. Otherwise it is decoded, starting from
+        the position where an idle capture of the video was left if the
+        frame lies ahead of it, or from the nearest keyframe before
+        the frame. The capture goes back to the pool after each frame.
+
+        Called in the Tk thread, so None is returned also if all
+        the captures are in use.
+
+        Arguments:
+            video_source (str): a path to the video file
+            width (int): the width of the frame
+            index (int): a 0-based frame number, of the strip frames
+                if the video is played from a preview strip
+        """
+        video_source = self.canonical(video_source)
+        key = (video_source, width)
+        for frames in (self.frameCache.get(key),
+                       self.strips.get(video_source, width),
+                       self.prefixCache.get(key)):
+            if frames is not None and index < len(frames):
+                return frames[index]
+        # the number of the frame in the video
+        index *= self.frameStep(video_source, width)
+
+        video = self.captures.acquire(video_source, block=False,
+                                      rewind=False)
+        if video is None:
+            return None
+        try:
+            keyframe = self.keyframes.keyframeBefore(video_source, index)
+            if not keyframe <= video.position <= index:
+                if not video.seek(keyframe):
+                    return None
+            if not video.skipFrames(index - video.position):
+                return None
+            flag, frame = video.getFrame(width)
+        finally:
+            self.captures.release(video)
+        return frame
+
+    def close(self):
+        """Stop the decode worker processes, if any, close the video files."""
+        self.prefetch([], None)
+        self.captures.close()
+        if self.decodePool:
+            self.decodePool.close()
+
+
+class Prefetcher(threading.Thread):
+    """A thread that decodes the beginnings of videos into the prefix
+    cache of a VideoLibrary, until it is stopped.
+    """
+
+    def __init__(self, library, video_sources, width):
+        """Initialize the thread, it is started by the start() method.
+
+        Arguments:
+            library: the VideoLibrary to be filled
+            video_sources (list): paths to the video files
+            width (int): the width of the frames
+        """
+        super().__init__(daemon=True)
+        self.library = library
+        self.videoSources = video_sources
+        self.width = width
+        self.stopped = threading.Event()
+        # s to wait before decoding, to leave the CPU to the video that
+        # has just started playing
+        self.startDelay = 0.2
+
+    def run(self):
+        """Prefetch the videos one by one."""
+        if self.stopped.wait(self.startDelay):
+            return
+        for video_source in self.videoSources:
+            if self.stopped.is_set():
+                return
+            self.library.prefetchVideo(video_source, self.width,
+                                       self.stopped)
+
+    def stop(self):
+        """Make the thread finish without prefetching the other videos."""
+        self.stopped.set()
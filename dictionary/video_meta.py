@@ -0,0 +1,106 @@
+import collections
+import hashlib
+import os
+import sqlite3
+try:  # relative imports used in tests
+    from .video_frame import MyVideoCapture
+except:
+    from video_frame import MyVideoCapture
+
+
+# metadata of a video file, as stored in the 'videometa' table of
+# the database:
+#     width, height (int): the frame size in pixels
+#     fps (float): the frame rate in frames per second
+#     frames (int): the number of frames
+#     duration (float): the duration in seconds
+#     size (int): the file size in bytes
+#     hash (str): SHA-1 hex digest of the file content
+VideoMeta = collections.namedtuple('VideoMeta', ['width', 'height', 'fps',
+                                                 'frames', 'duration',
+                                                 'size', 'hash'])
+
+
+def loadVideoMeta(dbpath):
+    """Return the metadata of the video files stored in the 'videometa'
+    table of the database (created by build_cache.py).
+
+    Arguments:
+        dbpath (str): the database file path
+    Returns:
+        dict: video file name (str) -> VideoMeta, empty if there's
+            no 'videometa' table
+    """
+    with sqlite3.connect(dbpath) as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute('SELECT videofile, width, height, fps, frames, \
+                            duration, size, hash FROM videometa')
+        except sqlite3.OperationalError:
+            return {}
+        find = cursor.fetchall()
+    return {row[0]: VideoMeta(*row[1:]) for row in find}
+
+
+def probeVideo(video_source):
+    """Return a 2-tuple (video file name, VideoMeta) of a video file.
+
+    The frames are counted by decoding the video, the frame count stored
+    in the file header may be inaccurate.
+
+    Arguments:
+        video_source (str): a path to the video file
+    """
+    video = MyVideoCapture(video_source)
+    width, height, fps = int(video.width), int(video.height), video.fps
+    frames = 0
+    while video.skipFrames(1):
+        frames += 1
+    video.release()
+    duration = frames / fps if fps else 0
+    meta = VideoMeta(width, height, fps, frames, duration,
+                     os.path.getsize(video_source), fileHash(video_source))
+    return os.path.basename(video_source), meta
+
+
+def fileHash(path):
+    """Return the SHA-1 hex digest of the content of a file."""
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(2**16), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def findDuplicates(videoMeta):
+    """Group the video files with the same content.
+
+    The canonical file of a group is the first one of its files in sorted
+    order, it stands for the other files in all the caches.
+
+    Arguments:
+        videoMeta (dict): video file name -> VideoMeta
+    Returns:
+        dict: canonical file name -> a list of the names of the other
+            files with the same content, only for the groups with
+            at least one duplicate
+    """
+    groups = {}  # hash -> list of file names
+    for name in sorted(videoMeta):
+        groups.setdefault(videoMeta[name].hash, []).append(name)
+    return {names[0]: names[1:] for names in groups.values()
+            if len(names) > 1}
+
+
+def canonicalNames(videoMeta):
+    """Return a dict that maps the names of the duplicate video files
+    to the names of their canonical files (see findDuplicates()).
+
+    Arguments:
+        videoMeta (dict): video file name -> VideoMeta
+    """
+    canonical = {}
+    for name, duplicates in findDuplicates(videoMeta).items():
+        for duplicate in duplicates:
+            canonical[duplicate] = name
+    return canonical
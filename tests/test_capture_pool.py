@@ -0,0 +1,82 @@
+import unittest
+from unittest import mock
+
+from dictionary.capture_pool import CapturePool
+
+
+def fakeCapture(video_source):
+    """Return a mocked MyVideoCapture of 'video_source'."""
+    capture = mock.Mock()
+    capture.videoSource = video_source
+    capture.rewind.return_value = True
+    return capture
+
+
+@mock.patch('dictionary.capture_pool.MyVideoCapture', side_effect=fakeCapture)
+class CapturePoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = CapturePool(2, timeout=0.01)
+
+    def test_released_capture_is_reused(self, mock_capture):
+        first = self.pool.acquire('a.mp4')
+        self.pool.release(first)
+        second = self.pool.acquire('a.mp4')
+        self.assertIs(second, first)
+        second.rewind.assert_called_once_with()
+        self.assertEqual(self.pool.stats()['reused'], 1)
+        self.assertEqual(mock_capture.call_count, 1)
+
+    def test_capture_that_cant_rewind_is_reopened(self, mock_capture):
+        first = self.pool.acquire('a.mp4')
+        first.rewind.return_value = False
+        self.pool.release(first)
+        second = self.pool.acquire('a.mp4')
+        self.assertIsNot(second, first)
+        first.release.assert_called_once_with()
+        self.assertEqual(len(self.pool), 1)
+
+    def test_least_recently_released_idle_capture_closed(self, mock_capture):
+        a = self.pool.acquire('a.mp4')
+        b = self.pool.acquire('b.mp4')
+        self.pool.release(a)
+        self.pool.release(b)
+        self.pool.acquire('c.mp4')
+        a.release.assert_called_once_with()
+        b.release.assert_not_called()
+        self.assertEqual(len(self.pool), 2)
+
+    def test_limit_exceeded_when_all_busy(self, mock_capture):
+        self.pool.acquire('a.mp4')
+        self.pool.acquire('b.mp4')
+        c = self.pool.acquire('c.mp4')
+        stats = self.pool.stats()
+        self.assertEqual(stats['overflows'], 1)
+        self.assertEqual(stats['peak'], 3)
+        # over the limit, the released capture is closed
+        self.pool.release(c)
+        c.release.assert_called_once_with()
+        self.assertEqual(len(self.pool), 2)
+
+    def test_nonblocking_acquire_when_all_busy(self, mock_capture):
+        self.pool.timeout = 5
+        self.pool.acquire('a.mp4')
+        self.pool.acquire('b.mp4')
+        self.assertIsNone(self.pool.acquire('c.mp4', block=False))
+        stats = self.pool.stats()
+        self.assertEqual(stats['open'], 2)
+        self.assertEqual(stats['overflows'], 0)
+
+    def test_acquire_without_rewind(self, mock_capture):
+        first = self.pool.acquire('a.mp4')
+        self.pool.release(first)
+        second = self.pool.acquire('a.mp4', block=False, rewind=False)
+        self.assertIs(second, first)
+        first.rewind.assert_not_called()
+
+    def test_close_releases_idle_captures(self, mock_capture):
+        a = self.pool.acquire('a.mp4')
+        self.pool.release(a)
+        self.pool.close()
+        a.release.assert_called_once_with()
+        self.assertEqual(self.pool.stats()['open'], 0)
@@ -0,0 +1,75 @@
+import unittest
+import os
+import queue
+import time
+
+from dictionary.decode_pool import DecodePool
+from dictionary.video_frame import MyVideoCapture
+
+VIDEO = os.path.join(os.path.dirname(__file__), os.pardir, 'dictionary',
+                     'videofiles', '0:0.mp4')
+
+
+@unittest.skipUnless(DecodePool.available(), 'no shared_memory module')
+class DecodePoolTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = DecodePool(1, numSlots=4)
+        cls.pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def readAll(self, source, timeout=20):
+        """Read the frames from the source until the end, copy them."""
+        frames = []
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                item = source.get()
+            except queue.Empty:
+                time.sleep(0.005)
+                continue
+            if item is source.END:
+                return frames
+            frames.append(item.copy())
+        self.fail('the worker has not finished in time')
+
+    def test_frames_match_decoding_in_process(self):
+        video = MyVideoCapture(VIDEO)
+        expected = []
+        flag, frame = video.getFrame(100)
+        while flag:
+            expected.append(frame)
+            flag, frame = video.getFrame(100)
+
+        rates = []
+        ended = []
+        source = self.pool.open(VIDEO, 100, onOpen=rates.append,
+                                onEnd=ended.append)
+        frames = self.readAll(source)
+        self.assertEqual(len(frames), len(expected))
+        self.assertTrue((frames[-1] == expected[-1]).all())
+        self.assertEqual(rates, [video.fps])
+        self.assertEqual(len(ended[0]), len(expected))
+
+    def test_worker_is_busy_until_source_stops(self):
+        source = self.pool.open(VIDEO, 100)
+        self.assertIsNone(self.pool.open(VIDEO, 100))
+        source.stop()
+        second = self.pool.open(VIDEO, 100)
+        self.assertIsNotNone(second)
+        # the report of the cancelled job is skipped
+        self.assertGreater(len(self.readAll(second)), 0)
+
+    def test_unreadable_video_ends_immediately(self):
+        source = self.pool.open('nonexistent.mp4', 100)
+        self.assertEqual(self.readAll(source), [])
+
+    def test_step_skips_frames(self):
+        source = self.pool.open(VIDEO, 100, step=2)
+        frames = self.readAll(source)
+        self.assertEqual(len(frames), (MyVideoCapture(VIDEO).frameCount
+                                       + 1) // 2)
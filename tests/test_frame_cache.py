@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+
+from dictionary.frame_cache import FrameCache
+
+
+def makeFrames(num, nbytes=100):
+    """Return a list of 'num' frames, each of size 'nbytes'."""
+    return [np.zeros(nbytes, dtype=np.uint8) for _ in range(num)]
+
+
+class FrameCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = FrameCache(1000)
+
+    def test_get_missing_key(self):
+        self.assertIsNone(self.cache.get(('box.mp4', 160)))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_put_and_get(self):
+        frames = makeFrames(3)
+        self.cache.put(('box.mp4', 160), frames)
+        self.assertIs(self.cache.get(('box.mp4', 160)), frames)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.size, 300)
+
+    def test_key_includes_width(self):
+        self.cache.put(('box.mp4', 160), makeFrames(1))
+        self.assertIsNone(self.cache.get(('box.mp4', 540)))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put(('a.mp4', 160), makeFrames(4))
+        self.cache.put(('b.mp4', 160), makeFrames(4))
+        self.cache.get(('a.mp4', 160))  # 'b.mp4' is now the least recent
+        self.cache.put(('c.mp4', 160), makeFrames(4))
+        self.assertIn(('a.mp4', 160), self.cache)
+        self.assertNotIn(('b.mp4', 160), self.cache)
+        self.assertIn(('c.mp4', 160), self.cache)
+        self.assertEqual(self.cache.size, 800)
+
+    def test_too_large_frames_not_stored(self):
+        self.cache.put(('a.mp4', 160), makeFrames(11))
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size, 0)
+
+    def test_put_replaces_existing_entry(self):
+        self.cache.put(('a.mp4', 160), makeFrames(4))
+        self.cache.put(('a.mp4', 160), makeFrames(2))
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.size, 200)
@@ -0,0 +1,72 @@
+import unittest
+import os
+import struct
+import tempfile
+
+from dictionary.keyframe_index import KeyframeIndex, readMp4Index
+
+VIDEO = os.path.join(os.path.dirname(__file__), os.pardir, 'dictionary',
+                     'videofiles', '0:0.mp4')
+
+
+def box(boxType, content):
+    """Return an mp4 box of type 'boxType' with 'content'."""
+    return struct.pack('>I4s', 8 + len(content), boxType) + content
+
+
+def makeMp4(frames, syncSamples):
+    """Return an mp4 file content with a video track with 'frames' samples,
+    and a stss box with 'syncSamples' (1-based), if not None.
+    """
+    stsz = box(b'stsz', struct.pack('>III', 0, 0, frames))
+    stbl = stsz
+    if syncSamples is not None:
+        stss = struct.pack('>II', 0, len(syncSamples))
+        stss += struct.pack('>{}I'.format(len(syncSamples)), *syncSamples)
+        stbl += box(b'stss', stss)
+    hdlr = box(b'hdlr', struct.pack('>II4s', 0, 0, b'vide'))
+    mdia = box(b'mdia', hdlr + box(b'minf', box(b'stbl', stbl)))
+    return box(b'ftyp', b'isom') + box(b'moov', box(b'trak', mdia))
+
+
+class KeyframeIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def writeMp4(self, frames, syncSamples):
+        path = os.path.join(self.tmpdir.name, 'sign.mp4')
+        with open(path, 'wb') as f:
+            f.write(makeMp4(frames, syncSamples))
+        return path
+
+    def test_readMp4Index_sync_samples(self):
+        path = self.writeMp4(100, [1, 41, 81])
+        self.assertEqual(readMp4Index(path), (100, [0, 40, 80]))
+
+    def test_readMp4Index_all_keyframes_without_stss(self):
+        path = self.writeMp4(3, None)
+        self.assertEqual(readMp4Index(path), (3, [0, 1, 2]))
+
+    def test_readMp4Index_real_video(self):
+        frames, keyframes = readMp4Index(VIDEO)
+        self.assertEqual(frames, 95)
+        self.assertEqual(keyframes[0], 0)
+
+    def test_build_and_keyframeBefore(self):
+        path = self.writeMp4(100, [1, 41, 81])
+        index = KeyframeIndex(os.path.join(self.tmpdir.name, 'index.json'))
+        index.build([path])
+        index = KeyframeIndex(index.path)
+        self.assertEqual(index.frameCount('videofiles/sign.mp4'), 100)
+        self.assertEqual(index.keyframeBefore(path, 39), 0)
+        self.assertEqual(index.keyframeBefore(path, 40), 40)
+        self.assertEqual(index.keyframeBefore(path, 99), 80)
+
+    def test_missing_video(self):
+        index = KeyframeIndex(os.path.join(self.tmpdir.name, 'index.json'))
+        self.assertIsNone(index.frameCount('box.mp4'))
+        self.assertEqual(index.keyframeBefore('box.mp4', 50), 0)
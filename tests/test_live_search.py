@@ -0,0 +1,71 @@
+import unittest
+import threading
+import time
+
+from dictionary.live_search import LiveSearch
+
+
+class LiveSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = []  # (query, cancelled at the end of the search)
+
+    def tearDown(self):
+        self.release.set()
+        self.live.close()
+
+    def blockingSearch(self, query, isCancelled):
+        """Wait for 'self.release' in the first search only."""
+        if not self.calls:
+            self.started.set()
+            self.release.wait(5)
+        self.calls.append((query, isCancelled()))
+        return None if isCancelled() else query.upper()
+
+    def waitForResult(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            result = self.live.poll()
+            if result is not None:
+                return result
+            time.sleep(0.005)
+        self.fail('no result in time')
+
+    def test_result(self):
+        self.live = LiveSearch(lambda query, isCancelled: query.upper())
+        self.live.submit('abc')
+        self.assertEqual(self.waitForResult(), 'ABC')
+        # the result is returned only once
+        self.assertIsNone(self.live.poll())
+        self.assertFalse(self.live.busy())
+
+    def test_superseded_search_is_cancelled(self):
+        self.live = LiveSearch(self.blockingSearch)
+        self.live.submit('first')
+        self.assertTrue(self.started.wait(5))
+        self.live.submit('second')
+        self.live.submit('third')
+        self.assertTrue(self.live.busy())
+        self.release.set()
+        self.assertEqual(self.waitForResult(), 'THIRD')
+        # the running search saw the cancellation, the waiting one
+        # was replaced without being searched
+        self.assertEqual(self.calls, [('first', True), ('third', False)])
+
+    def test_cancel(self):
+        self.live = LiveSearch(self.blockingSearch)
+        self.live.submit('first')
+        self.assertTrue(self.started.wait(5))
+        self.live.cancel()
+        self.release.set()
+        deadline = time.monotonic() + 5
+        while self.live.busy() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertIsNone(self.live.poll())
+        self.assertEqual(self.calls, [('first', True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import time
+
+from dictionary.playback_scheduler import PlaybackScheduler
+
+
+class FakeWidget():
+    """Records the callbacks scheduled with after() instead of running
+    them."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, delay, callback):
+        self.jobs.append(callback)
+        return len(self.jobs)
+
+    def after_cancel(self, job):
+        pass
+
+
+class FakePlayer():
+    """A player that records when it was advanced."""
+
+    def __init__(self, name, log, frames=2, cost=0):
+        self.name = name
+        self.log = log
+        self.frames = frames
+        self.cost = cost  # seconds that advancing takes
+
+    def advance(self, now):
+        self.log.append(self.name)
+        time.sleep(self.cost)
+        self.frames -= 1
+        if self.frames == 0:
+            return None
+        return now
+
+
+class PlaybackSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.scheduler = PlaybackScheduler(self.widget, frameBudget=10)
+        self.log = []
+
+    def test_one_timer_for_all_players(self):
+        self.scheduler.register(FakePlayer('a', self.log), 0)
+        self.scheduler.register(FakePlayer('b', self.log), 1)
+        self.assertEqual(len(self.widget.jobs), 1)
+        self.scheduler.tick()
+        self.assertEqual(sorted(self.log), ['a', 'b'])
+
+    def test_players_advanced_in_deadline_order(self):
+        first = FakePlayer('first', self.log)
+        second = FakePlayer('second', self.log)
+        self.scheduler.register(second, 0)
+        self.scheduler.register(first, 0)
+        self.scheduler.players[first][0] -= 1
+        self.scheduler.tick()
+        self.assertEqual(self.log, ['first', 'second'])
+
+    def test_finished_player_unregistered(self):
+        player = FakePlayer('a', self.log, frames=1)
+        self.scheduler.register(player, 0)
+        self.scheduler.tick()
+        self.assertNotIn(player, self.scheduler)
+
+    def test_thumbnails_throttled_over_budget(self):
+        main = FakePlayer('main', self.log, frames=10, cost=0.02)
+        thumb = FakePlayer('thumb', self.log, frames=10)
+        self.scheduler.register(main, PlaybackScheduler.HIGH)
+        self.scheduler.register(thumb, PlaybackScheduler.LOW)
+        self.scheduler.players[main][0] -= 1  # make main go first
+        self.scheduler.tick()
+        self.assertEqual(self.log, ['main'])
+        self.assertEqual(self.scheduler.players[thumb][2], 1)
+
+    def test_throttled_player_not_starved(self):
+        main = FakePlayer('main', self.log, frames=10, cost=0.02)
+        thumb = FakePlayer('thumb', self.log, frames=10)
+        self.scheduler.register(main, PlaybackScheduler.HIGH)
+        self.scheduler.register(thumb, PlaybackScheduler.LOW)
+        for i in range(self.scheduler.maxSkips + 1):
+            self.scheduler.players[main][0] = 0
+            self.scheduler.players[thumb][0] = 1
+            self.scheduler.tick()
+        self.assertIn('thumb', self.log)
+
+    def test_unregister(self):
+        player = FakePlayer('a', self.log)
+        self.scheduler.register(player, 0)
+        self.scheduler.unregister(player)
+        self.scheduler.tick()
+        self.assertEqual(self.log, [])
@@ -0,0 +1,34 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+
+from dictionary.poster_cache import PosterCache
+
+
+class PosterCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dbpath = os.path.join(self.tmpdir.name, 'posters.db')
+        self.cache = PosterCache(self.dbpath)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_missing_database(self):
+        self.assertIsNone(self.cache.get('videofiles/box.mp4', 160))
+
+    def test_build_and_get(self):
+        small = np.arange(10 * 16 * 3, dtype=np.uint8).reshape(10, 16, 3)
+        large = np.ones((20, 32, 3), dtype=np.uint8)
+        self.cache.build([('videofiles/box.mp4', small),
+                          ('videofiles/box.mp4', large)])
+
+        # the posters are looked up by the video file name
+        poster = self.cache.get('/other/dir/box.mp4', 16)
+        self.assertTrue(np.array_equal(poster, small))
+        poster = PosterCache(self.dbpath).get('box.mp4', 32)
+        self.assertTrue(np.array_equal(poster, large))
+        self.assertIsNone(self.cache.get('box.mp4', 540))
+        self.assertIsNone(self.cache.get('gulas.mp4', 16))
@@ -0,0 +1,46 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+
+from dictionary.preview_strips import PreviewStrips
+
+
+class PreviewStripsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.stripdir = os.path.join(self.tmpdir.name, 'strips')
+        self.frames = np.arange(4 * 10 * 16 * 3,
+                                dtype=np.uint8).reshape(4, 10, 16, 3)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_missing_strips(self):
+        strips = PreviewStrips(self.stripdir)
+        self.assertIsNone(strips.get('videofiles/box.mp4', 16))
+        self.assertIsNone(strips.frameRate('videofiles/box.mp4'))
+
+    def test_build_and_get(self):
+        PreviewStrips(self.stripdir).build(
+            [('videofiles/box.mp4', 25.0, self.frames)], width=16, step=2)
+
+        strips = PreviewStrips(self.stripdir)
+        strip = strips.get('/other/dir/box.mp4', 16)
+        self.assertIsInstance(strip, np.memmap)
+        self.assertTrue(np.array_equal(strip, self.frames))
+        self.assertEqual(strips.frameRate('box.mp4'), 12.5)
+
+    def test_unknown_frame_rate(self):
+        PreviewStrips(self.stripdir).build(
+            [('box.mp4', 0, self.frames)], width=16, step=2)
+        strips = PreviewStrips(self.stripdir)
+        self.assertIsNotNone(strips.get('box.mp4', 16))
+        self.assertIsNone(strips.frameRate('box.mp4'))
+
+    def test_other_width_not_served(self):
+        strips = PreviewStrips(self.stripdir)
+        strips.build([('box.mp4', 25.0, self.frames)], width=16, step=1)
+        self.assertIsNone(strips.get('box.mp4', 540))
+        self.assertIsNone(strips.get('gulas.mp4', 16))
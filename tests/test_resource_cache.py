@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+from dictionary.resource_cache import ResourceCache
+
+
+class ResourceCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.resources = ResourceCache(defaultFamily='DejaVu Sans')
+
+    @mock.patch('dictionary.resource_cache.tools.getImage')
+    def test_image_loaded_once_per_size(self, mock_getImage):
+        mock_getImage.side_effect = lambda path, width, height: object()
+        first = self.resources.image('arrow.png', 35, 35)
+        self.assertIs(self.resources.image('arrow.png', 35, 35), first)
+        self.assertIsNot(self.resources.image('arrow.png', 20, 20), first)
+        self.assertEqual(mock_getImage.call_count, 2)
+        self.assertEqual(self.resources.loads, 2)
+
+    @mock.patch('dictionary.resource_cache.tkFont.Font')
+    def test_font_created_once(self, mock_font):
+        mock_font.side_effect = lambda **options: object()
+        bold = self.resources.font(size=20, weight='bold')
+        self.assertIs(self.resources.font('DejaVu Sans', 20, 'bold'), bold)
+        mock_font.assert_called_once_with(family='DejaVu Sans', size=20,
+                                          weight='bold')
+
+    @mock.patch('dictionary.resource_cache.tkFont.Font')
+    def test_configure_default_family(self, mock_font):
+        resources = ResourceCache()
+        resources.configure(defaultFamily='Ubuntu')
+        resources.font(size=11)
+        mock_font.assert_called_once_with(family='Ubuntu', size=11,
+                                          weight='normal')
+        # too late, a font of the family has been created
+        with self.assertRaises(RuntimeError):
+            resources.configure(defaultFamily='DejaVu Sans')
+
+    @mock.patch('dictionary.resource_cache.tools.getImage')
+    def test_clear_releases_references(self, mock_getImage):
+        self.resources.image('arrow.png', 35, 35)
+        self.resources.clear()
+        self.resources.image('arrow.png', 35, 35)
+        self.assertEqual(mock_getImage.call_count, 2)
+
+    @mock.patch('dictionary.resource_cache.tools.getImage')
+    def test_image_taken_from_atlas(self, mock_getImage):
+        atlas = mock.Mock()
+        atlas.has.side_effect = lambda name, width, height: name == '01.png'
+        self.resources.addAtlas(atlas)
+        sprite = self.resources.image('images/01.png', 65, 80)
+        self.assertIs(sprite, atlas.get.return_value)
+        atlas.get.assert_called_once_with('01.png')
+        self.resources.image('images/add_icon.png', 32, 32)
+        mock_getImage.assert_called_once_with('images/add_icon.png', 32, 32)
@@ -0,0 +1,79 @@
+import unittest
+import tkinter as tk
+from unittest import mock
+
+from dictionary.scrolledlist_frame import ScrolledList
+
+
+class ScrolledListTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            cls.root = tk.Tk()
+        except tk.TclError:
+            raise unittest.SkipTest('no display')
+        cls.root.withdraw()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.root.destroy()
+
+    def setUp(self):
+        self.handler = mock.Mock()
+        self.slist = ScrolledList(self.root, self.handler, 4, virtual=True)
+        self.slist.setOptions(['word{}'.format(i) for i in range(20)])
+
+    def tearDown(self):
+        self.slist.destroy()
+
+    def displayed(self):
+        """Return the texts of the rows displayed by the treeview."""
+        treeview = self.slist.treeview
+        return [treeview.item(iid, option='text')
+                for iid in treeview.get_children()]
+
+    def test_render_only_visible_rows(self):
+        self.assertEqual(len(self.slist.treeview.get_children()), 4)
+        self.assertEqual(self.displayed(),
+                         ['word0', 'word1', 'word2', 'word3'])
+        self.slist.setOptions(['a', 'b'])
+        self.assertEqual(self.displayed(), ['a', 'b'])
+
+    def test_scrollTo_clamped(self):
+        self.slist.scrollTo(10)
+        self.assertEqual(self.displayed()[0], 'word10')
+        self.slist.scrollTo(100)
+        self.assertEqual(self.slist.top, 16)
+        self.slist.scrollTo(-5)
+        self.assertEqual(self.slist.top, 0)
+
+    def test_yview(self):
+        self.slist.yview('moveto', '0.5')
+        self.assertEqual(self.slist.top, 10)
+        self.slist.yview('scroll', '1', 'pages')
+        self.assertEqual(self.slist.top, 14)
+        self.slist.yview('scroll', '-2', 'units')
+        self.assertEqual(self.slist.top, 12)
+
+    def test_wheel_small_deltas(self):
+        # macOS reports small deltas
+        self.slist.onWheel(mock.Mock(delta=-1))
+        self.assertEqual(self.slist.top, ScrolledList.WHEEL_ROWS)
+        self.slist.onWheel(mock.Mock(delta=1))
+        self.assertEqual(self.slist.top, 0)
+        self.slist.onWheel(mock.Mock(delta=-120))
+        self.assertEqual(self.slist.top, ScrolledList.WHEEL_ROWS)
+
+    def test_moveSelection_scrolls(self):
+        self.slist.moveSelection(1)
+        self.assertEqual(self.slist.selected, 0)
+        self.slist.moveSelection(5)
+        self.assertEqual(self.slist.selected, 5)
+        self.assertEqual(self.slist.top, 2)
+        self.slist.moveSelection(100)
+        self.assertEqual((self.slist.selected, self.slist.top), (19, 16))
+        self.assertEqual(self.slist.treeview.selection(),
+                         (self.slist.rows[3],))
+        self.slist.handler(None)
+        self.handler.assert_called_once_with('word19')
@@ -1,6 +1,10 @@
 import unittest
+import os
+import sqlite3
+import tempfile
 from unittest import mock
 import math
+import threading
 import numpy as np
 
 import dictionary.search_engine
@@ -244,3 +248,238 @@ class SearchEngineTest(unittest.TestCase):
             np.array_equal(self.searchEng._getDbRelief(test_input),
             expected_output)
         )
+
+    def test_getVideoMeta(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.searchEng.dbpath = os.path.join(tmpdir, 'test.db')
+            self.assertEqual(self.searchEng.getVideoMeta(), {})
+
+            with sqlite3.connect(self.searchEng.dbpath) as conn:
+                conn.execute('CREATE TABLE videometa(videofile, width, \
+                              height, fps, frames, duration, size, hash)')
+                conn.execute('INSERT INTO videometa VALUES \
+                              (?, ?, ?, ?, ?, ?, ?, ?)',
+                             ('box.mp4', 400, 250, 25.0, 95, 3.8, 7322, 'ab'))
+            meta = self.searchEng.getVideoMeta()
+            self.assertEqual(meta['box.mp4'].fps, 25.0)
+            self.assertEqual(meta['box.mp4'].frames, 95)
+
+    def test_searchPhrase_longest_expressions_first(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.searchEng.dbpath = os.path.join(tmpdir, 'test.db')
+            with sqlite3.connect(self.searchEng.dbpath) as conn:
+                conn.execute('CREATE TABLE translation(word, videofile)')
+                conn.executemany('INSERT INTO translation VALUES (?, ?)',
+                                 [('box', 'box'),
+                                  ('aljaška', 'aljaska_1'),
+                                  ('box aljaška', '0:0'),
+                                  ('Aljaška', 'aljaska_2')])
+            playlist, missing = self.searchEng.searchPhrase(
+                'Aljaška, box aljaška nic box.')
+        self.assertEqual(playlist, [('aljaška', 'vfdirectory/aljaska_1.mkv'),
+                                    ('box aljaška', 'vfdirectory/0:0.mp4'),
+                                    ('box', 'vfdirectory/box.mp4')])
+        self.assertEqual(missing, ['nic'])
+
+    def test_searchPhrase_many_queries(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.searchEng.dbpath = os.path.join(tmpdir, 'test.db')
+            with sqlite3.connect(self.searchEng.dbpath) as conn:
+                conn.execute('CREATE TABLE translation(word, videofile)')
+                conn.executemany('INSERT INTO translation VALUES (?, ?)',
+                                 [('box', 'box'),
+                                  ('aljaška', 'aljaska_1'),
+                                  ('Aljaška', 'aljaska_2')])
+            self.searchEng.maxQueryParams = 2
+            words = ['slovo{}'.format(i) for i in range(30)]
+            playlist, missing = self.searchEng.searchPhrase(
+                ' '.join(words + ['box', 'Aljaška']))
+        # the first translation in the table is used
+        self.assertEqual(playlist, [('box', 'vfdirectory/box.mp4'),
+                                    ('aljaška', 'vfdirectory/aljaska_1.mkv')])
+        self.assertEqual(missing, words)
+
+    def test_searchPhrase_empty(self):
+        self.assertEqual(self.searchEng.searchPhrase(' , '), ([], []))
+
+    def createSignsDb(self, tmpdir):
+        """Create a database with three signs on the 3x2 canvas."""
+        self.searchEng.dbpath = os.path.join(tmpdir, 'test.db')
+        with sqlite3.connect(self.searchEng.dbpath) as conn:
+            conn.execute('CREATE TABLE signs(videofile, activeshape, \
+                          signtype, passiveshape, placement, area)')
+            conn.executemany('INSERT INTO signs VALUES (?, ?, ?, ?, ?, ?)',
+                             [('box', '1', 'single hand', None,
+                               '0,0,3,0', 3),
+                              ('0:0', '30', 'both the same', None,
+                               None, None),
+                              ('aljaska_1', '1,2', 'single hand', None,
+                               '0,1,1,1;1,0,2,1', 3)])
+            conn.execute('CREATE TABLE translation(word, videofile)')
+            conn.executemany('INSERT INTO translation VALUES (?, ?)',
+                             [('box', 'box'),
+                              ('krabice', 'box'),
+                              ('aljaška', 'aljaska_1')])
+
+    def test_signSearch(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.createSignsDb(tmpdir)
+            # a circle covering the first row and the middle of the second
+            result = self.searchEng.signSearch(
+                ((1, 0), 'single hand', 0, (1, 0, 1, 1, 0)))
+        self.assertEqual(result, (True, [
+            ('box, krabice', 'vfdirectory/box.mp4'),
+            ('aljaška', 'vfdirectory/aljaska_1.mkv'),
+            ('', 'vfdirectory/0:0.mp4')]))
+
+    def test_signSearch_cancelled(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.createSignsDb(tmpdir)
+            result = self.searchEng.signSearch(
+                ((1, 0), 'single hand', 0, None), lambda: True)
+        self.assertIsNone(result)
+
+    def test_calcPlaceDists_match_calcPlaceDist(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.createSignsDb(tmpdir)
+            self.searchEng._loadSigns()
+        uPlacement = (1, 1, 1.5, 1, 0.3)
+        dists = self.searchEng._calcPlaceDists(uPlacement)
+
+        uRelief = self.searchEng._getRelief(
+            self.searchEng._getReliefFcn(*uPlacement))
+        uArea = (uRelief == 1).sum()
+        for i, dbSign in enumerate(self.searchEng.allsigns):
+            dbPlacement, dbArea = dbSign[4], dbSign[5]
+            if dbPlacement:
+                dbRelief = self.searchEng._getDbRelief(dbPlacement)
+                expected = self.searchEng._calcPlaceDist(uRelief, uArea,
+                                                         dbRelief, dbArea)
+            else:
+                expected = 1
+            self.assertAlmostEqual(dists[i], expected)
+
+    def createShapesDb(self, tmpdir, shapes):
+        """Create a database with signs of the given active shapes."""
+        self.searchEng.dbpath = os.path.join(tmpdir, 'test.db')
+        with sqlite3.connect(self.searchEng.dbpath) as conn:
+            conn.execute('CREATE TABLE signs(videofile, activeshape, \
+                          signtype, passiveshape, placement, area)')
+            conn.executemany('INSERT INTO signs VALUES (?, ?, ?, ?, ?, ?)',
+                             [(str(i), activeshape, 'single hand', None,
+                               None, None)
+                              for i, activeshape in enumerate(shapes)])
+
+    def test_calcActDists_match_calcActDist(self):
+        # shapes 1-5 are in group I, 6-8 in group II, 9 in group III
+        shapeSets = [{1}, {2}, {6}, {9}, {1, 2}, {1, 6}, {2, 6}, {6, 7},
+                     {1, 9}, {6, 9}, set()]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.createShapesDb(tmpdir, [','.join(map(str, sorted(shapes)))
+                                         for shapes in shapeSets])
+            self.searchEng._loadSigns()
+
+        def groups(shapes):
+            return set(self.searchEng.GROUPS[shape] for shape in shapes)
+
+        for uShape in shapeSets:
+            dists = self.searchEng._calcActDists(uShape)
+            for i, dbShape in enumerate(shapeSets):
+                expected = self.searchEng._calcActDist(
+                    uShape, groups(uShape), dbShape, groups(dbShape))
+                self.assertEqual(dists[i], expected, (uShape, dbShape))
+
+    def test_loadSimilarity_from_table(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.createShapesDb(tmpdir, ['1', '9', '54'])
+            with sqlite3.connect(self.searchEng.dbpath) as conn:
+                conn.execute('CREATE TABLE handshapesimilarity(shape1, \
+                              shape2, similarity)')
+                conn.execute('INSERT INTO handshapesimilarity VALUES \
+                              (1, 9, 0.75)')
+            self.searchEng._loadSigns()
+        similarity = self.searchEng.similarity
+        self.assertEqual(similarity[9, 1], 0.75)
+        self.assertEqual(similarity[54, 54], 1)
+        # shapes 1 and 2 are in the same group, but not in the table
+        self.assertEqual(similarity[1, 2], 0)
+        self.assertEqual(list(self.searchEng._calcActDists({1})),
+                         [0, 0.25, 1])
+
+    def test_findCandidates(self):
+        # shapes 1-5 are in group I, 6-8 in group II
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.createShapesDb(tmpdir, ['1', '2,6', '6', '', '7,9'])
+            self.searchEng._loadSigns()
+        self.assertEqual(list(self.searchEng._findCandidates({3})), [0, 1])
+        self.assertEqual(list(self.searchEng._findCandidates({8})),
+                         [1, 2, 4])
+        self.assertEqual(len(self.searchEng._findCandidates({53})), 0)
+        # the signs that aren't candidates are completely different
+        self.assertEqual(list(self.searchEng._calcActDists({3})),
+                         [0.5, 0.75, 1, 1, 1])
+
+    def test_pruneSigns(self):
+        self.searchEng.signsmax = 2
+        baseDists = np.array([2, 0.5, 1.75, 0, 1.5])
+        # the total distance of the second closest sign is at most 1.5
+        self.assertEqual(list(self.searchEng._pruneSigns(baseDists)),
+                         [1, 3, 4])
+
+    def test_calcPlaceDists_cached(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.createSignsDb(tmpdir)
+            self.searchEng._loadSigns()
+        self.searchEng.placeCacheSize = 2
+        dists = self.searchEng._calcPlaceDists((1, 0, 1, 1, 0))
+        with mock.patch.object(self.searchEng, '_getRelief') as getRelief:
+            # the same placement, only the handshapes have changed
+            np.testing.assert_array_equal(
+                self.searchEng._calcPlaceDists((1, 0, 1, 1, 0)), dists)
+            getRelief.assert_not_called()
+
+        self.searchEng._calcPlaceDists((0, 0, 1, 1, 0))
+        self.searchEng._calcPlaceDists((2, 1, 1, 1, 0))
+        # the least recently used placement has been evicted
+        self.assertEqual(list(self.searchEng.placeCache),
+                         [(0, 0, 1, 1, 0), (2, 1, 1, 1, 0)])
+
+    def test_calcPlaceDists_in_threads(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.createSignsDb(tmpdir)
+            self.searchEng._loadSigns()
+        uPlacement = (1, 0, 1, 1, 0)
+        expected = self.searchEng._calcPlaceDists(uPlacement)
+        self.searchEng.placeCache.clear()
+        paused = threading.Event()
+        resumed = threading.Event()
+        dbAreas = self.searchEng.dbAreas
+
+        class PausingAreas():
+            """Pause the first search when it reads the db areas, until
+            the second one is over.
+            """
+            def __getitem__(self, key):
+                if threading.current_thread() is first:
+                    paused.set()
+                    resumed.wait(5)
+                return dbAreas[key]
+
+        self.searchEng.dbAreas = PausingAreas()
+        results = {}
+
+        def search(signs):
+            dists = self.searchEng._calcPlaceDists(uPlacement, signs)
+            results[tuple(signs)] = dists[signs]
+
+        # two searches of the same placement with different pruned signs
+        first = threading.Thread(target=search, args=(np.array([0, 2]),))
+        first.start()
+        self.assertTrue(paused.wait(5))
+        search(np.array([1, 2]))
+        resumed.set()
+        first.join()
+        # the second search didn't take the distances being computed
+        # by the first one for computed ones
+        for signs, dists in results.items():
+            np.testing.assert_array_equal(dists, expected[list(signs)])
@@ -0,0 +1,32 @@
+import unittest
+import os
+import tempfile
+import PIL.Image
+
+from dictionary.sprite_atlas import SpriteAtlas
+
+
+class SpriteAtlasTest(unittest.TestCase):
+
+    def test_build_packs_resized_images(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for i, color in enumerate(['red', 'blue', 'green']):
+                path = os.path.join(tmpdir, '0{}.png'.format(i + 1))
+                PIL.Image.new('RGBA', (20, 40), color).save(path)
+                paths.append(path)
+            atlasPath = os.path.join(tmpdir, 'cache', 'shapes')
+            SpriteAtlas(atlasPath).build(paths, 10, 20, columns=2)
+
+            atlas = SpriteAtlas(atlasPath)
+            self.assertTrue(atlas.has('03.png', 10, 20))
+            self.assertFalse(atlas.has('03.png', 20, 40))
+            self.assertFalse(atlas.has('04.png', 10, 20))
+            self.assertEqual(atlas.sprites['03.png'], (0, 20))
+            with PIL.Image.open(atlasPath + '.png') as img:
+                self.assertEqual(img.size, (20, 40))
+                self.assertEqual(img.getpixel((15, 5)), (0, 0, 255, 255))
+
+    def test_missing_atlas_is_empty(self):
+        atlas = SpriteAtlas('nonexistent')
+        self.assertFalse(atlas.has('01.png', 65, 80))
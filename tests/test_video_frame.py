@@ -0,0 +1,60 @@
+import unittest
+import queue
+import numpy as np
+
+from dictionary.video_frame import FrameProducer, scaleFrame
+
+
+class FrameProducerTest(unittest.TestCase):
+
+    def getAll(self, producer):
+        """Collect the items from the producer's queue until the end mark."""
+        items = []
+        while True:
+            item = producer.queue.get(timeout=1)
+            if item is FrameProducer.END:
+                return items
+            items.append(item)
+
+    def test_produces_all_frames_then_end(self):
+        producer = FrameProducer(iter(range(20)), queueSize=4)
+        producer.start()
+        self.assertEqual(self.getAll(producer), list(range(20)))
+        producer.join(1)
+        self.assertFalse(producer.is_alive())
+
+    def test_queue_is_bounded(self):
+        producer = FrameProducer(iter(range(20)), queueSize=4)
+        producer.start()
+        producer.join(0.3)
+        self.assertEqual(producer.queue.qsize(), 4)
+        producer.stop()
+        producer.join(1)
+        self.assertFalse(producer.is_alive())
+
+    def test_get_raises_when_nothing_ready(self):
+        producer = FrameProducer(iter([]), queueSize=4)
+        self.assertRaises(queue.Empty, producer.get)
+
+    def test_stop_closes_generator(self):
+        closed = []
+
+        def frames():
+            try:
+                yield from range(20)
+            finally:
+                closed.append(True)
+
+        producer = FrameProducer(frames(), queueSize=2)
+        producer.start()
+        producer.stop()
+        producer.join(1)
+        self.assertEqual(closed, [True])
+
+
+class ScaleFrameTest(unittest.TestCase):
+
+    def test_keeps_aspect_ratio(self):
+        frame = np.zeros((250, 400, 3), dtype=np.uint8)
+        self.assertEqual(scaleFrame(frame, 160).shape, (100, 160, 3))
+        self.assertEqual(scaleFrame(frame, 800).shape, (500, 800, 3))
@@ -0,0 +1,206 @@
+import unittest
+import threading
+import time
+import tempfile
+from unittest import mock
+import numpy as np
+
+from dictionary.capture_pool import CapturePool
+from dictionary.preview_strips import PreviewStrips
+from dictionary.video_library import VideoLibrary
+from dictionary.video_meta import VideoMeta
+
+
+class VideoLibraryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.videoLib = VideoLibrary(10**7, 'cachedirectory')
+        # three 'decoded' frames of size 20x40
+        self.decoded = [np.full((20, 40, 3), i, dtype=np.uint8)
+                        for i in range(3)]
+
+    def mockCapture(self, mock_capture):
+        """Make the mocked MyVideoCapture return 'self.decoded' frames."""
+        results = [(True, frame) for frame in self.decoded] + [(False, None)]
+        mock_capture.return_value.getFrame.side_effect = results
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_frames_decodes_and_caches(self, mock_capture):
+        self.mockCapture(mock_capture)
+        frames = list(self.videoLib.frames('box.mp4', 20))
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[2][0, 0, 0], 2)
+        self.assertIn(('box.mp4', 20), self.videoLib.frameCache)
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_replay_does_no_decoding(self, mock_capture):
+        self.mockCapture(mock_capture)
+        first = list(self.videoLib.frames('box.mp4', 20))
+        second = list(self.videoLib.frames('box.mp4', 20))
+        self.assertEqual(mock_capture.call_count, 1)
+        self.assertEqual(len(second), len(first))
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_interrupted_playback_not_cached(self, mock_capture):
+        self.mockCapture(mock_capture)
+        frames = self.videoLib.frames('box.mp4', 20)
+        next(frames)
+        frames.close()
+        self.assertNotIn(('box.mp4', 20), self.videoLib.frameCache)
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_firstFrame_uses_cache(self, mock_capture):
+        self.mockCapture(mock_capture)
+        list(self.videoLib.frames('box.mp4', 20))
+        frame = self.videoLib.firstFrame('box.mp4', 20)
+        self.assertEqual(frame[0, 0, 0], 0)
+        self.assertEqual(mock_capture.call_count, 1)
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_prefetched_beginning_is_not_decoded_again(self, mock_capture):
+        self.mockCapture(mock_capture)
+        self.videoLib.prefetchFrames = 2
+        self.videoLib.prefetchVideo('box.mp4', 20, threading.Event())
+        self.assertIn(('box.mp4', 20), self.videoLib.prefixCache)
+
+        self.mockCapture(mock_capture)
+        mock_capture.return_value.getFrame.side_effect = [
+            (True, self.decoded[2]), (False, None)]
+        frames = list(self.videoLib.frames('box.mp4', 20))
+        mock_capture.return_value.skipFrames.assert_called_with(2)
+        self.assertEqual([f[0, 0, 0] for f in frames], [0, 1, 2])
+        self.assertIn(('box.mp4', 20), self.videoLib.frameCache)
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_short_video_prefetched_whole(self, mock_capture):
+        self.mockCapture(mock_capture)
+        self.videoLib.prefetchVideo('box.mp4', 20, threading.Event())
+        self.assertIn(('box.mp4', 20), self.videoLib.frameCache)
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_stopped_prefetch_stores_nothing(self, mock_capture):
+        self.mockCapture(mock_capture)
+        stopped = threading.Event()
+        stopped.set()
+        self.videoLib.prefetchVideo('box.mp4', 20, stopped)
+        self.assertEqual(len(self.videoLib.prefixCache), 0)
+        self.assertEqual(len(self.videoLib.frameCache), 0)
+
+    def test_new_prefetch_cancels_previous(self):
+        with mock.patch.object(self.videoLib, 'prefetchVideo'):
+            self.videoLib.prefetch(['a.mp4', 'b.mp4'], 20)
+            first = self.videoLib.prefetcher
+            self.videoLib.prefetch([], 20)
+            self.assertTrue(first.stopped.is_set())
+            self.assertIsNone(self.videoLib.prefetcher)
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_frameAt_uses_cache(self, mock_capture):
+        self.mockCapture(mock_capture)
+        list(self.videoLib.frames('box.mp4', 20))
+        frame = self.videoLib.frameAt('box.mp4', 20, 1)
+        self.assertEqual(frame[0, 0, 0], 1)
+        self.assertEqual(mock_capture.call_count, 1)
+
+    def trackPosition(self, capture):
+        """Make the mocked MyVideoCapture track its 'position'."""
+        capture.position = 0
+
+        def seek(index):
+            capture.position = index
+            return True
+
+        def skipFrames(count):
+            capture.position += count
+            return True
+
+        def getFrame(width=None):
+            capture.position += 1
+            return (True, self.decoded[0])
+
+        capture.seek.side_effect = seek
+        capture.skipFrames.side_effect = skipFrames
+        capture.getFrame.side_effect = getFrame
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_frameAt_decodes_forward_without_seeking(self, mock_capture):
+        capture = mock_capture.return_value
+        capture.videoSource = 'box.mp4'
+        self.trackPosition(capture)
+        self.videoLib.frameAt('box.mp4', 20, 1)
+        capture.skipFrames.assert_called_with(1)
+        self.videoLib.frameAt('box.mp4', 20, 5)
+        capture.skipFrames.assert_called_with(3)
+        capture.seek.assert_not_called()
+        # backwards, from the keyframe
+        self.videoLib.frameAt('box.mp4', 20, 2)
+        capture.seek.assert_called_once_with(0)
+        capture.skipFrames.assert_called_with(2)
+        # the capture is back in the pool between the frames
+        self.assertEqual(self.videoLib.captures.stats()['busy'], 0)
+        self.assertEqual(mock_capture.call_count, 1)
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_frameAt_does_not_wait_for_busy_captures(self, mock_capture):
+        self.videoLib.captures = CapturePool(1, timeout=5)
+        playing = self.videoLib.captures.acquire('crate.mp4')
+        start = time.monotonic()
+        self.assertIsNone(self.videoLib.frameAt('box.mp4', 20, 3))
+        self.assertIsNone(self.videoLib.firstFrame('box.mp4', 20))
+        self.assertEqual(self.videoLib.frameCount('box.mp4', 20), 0)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(mock_capture.call_count, 1)
+        self.videoLib.captures.release(playing)
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_metadata_known_before_opening(self, mock_capture):
+        meta = VideoMeta(40, 20, 30.0, 120, 4.0, 1000, 'ab')
+        self.videoLib.videoMeta = {'box.mp4': meta}
+        self.assertEqual(self.videoLib.frameRate('vfdir/box.mp4', 20), 30.0)
+        self.assertEqual(self.videoLib.frameCount('vfdir/box.mp4', 20), 120)
+        mock_capture.assert_not_called()
+
+    def test_strip_with_unknown_frame_rate(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.videoLib.strips = PreviewStrips(tmpdir)
+            self.videoLib.strips.build(
+                [('box.mp4', 0, np.stack(self.decoded))], width=20, step=2)
+            # every other frame of the video is in the strip
+            self.assertEqual(self.videoLib.frameRate('vfdir/box.mp4', 20),
+                             self.videoLib.defaultFrameRate / 2)
+            meta = VideoMeta(40, 20, 30.0, 6, 0.2, 1000, 'ab')
+            self.videoLib.videoMeta = {'box.mp4': meta}
+            self.assertEqual(self.videoLib.frameRate('vfdir/box.mp4', 20),
+                             15.0)
+            # a strip index with a zero rate
+            self.videoLib.strips.rates['box.mp4'] = 0
+            self.assertEqual(self.videoLib.frameRate('vfdir/box.mp4', 20),
+                             15.0)
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_duplicates_decoded_once(self, mock_capture):
+        self.mockCapture(mock_capture)
+        meta = VideoMeta(40, 20, 30.0, 3, 0.1, 1000, 'ab')
+        self.videoLib = VideoLibrary(10**7, 'cachedirectory',
+                                     videoMeta={'box.mp4': meta,
+                                                'crate.mp4': meta})
+        list(self.videoLib.frames('vfdir/box.mp4', 20))
+        frames = list(self.videoLib.frames('vfdir/crate.mp4', 20))
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(mock_capture.call_count, 1)
+        self.assertEqual(self.videoLib.canonical('vfdir/crate.mp4'),
+                         'vfdir/box.mp4')
+
+    @mock.patch('dictionary.capture_pool.MyVideoCapture')
+    def test_thumbnails_decode_every_nth_frame(self, mock_capture):
+        self.mockCapture(mock_capture)
+        meta = VideoMeta(40, 20, 30.0, 5, 0.2, 1000, 'ab')
+        self.videoLib = VideoLibrary(10**7, 'cachedirectory',
+                                     videoMeta={'box.mp4': meta},
+                                     thumbWidth=20, thumbFrameStep=2)
+        list(self.videoLib.frames('box.mp4', 20))
+        mock_capture.return_value.skipFrames.assert_called_with(1)
+        self.assertEqual(self.videoLib.frameRate('box.mp4', 20), 15.0)
+        self.assertEqual(self.videoLib.frameCount('box.mp4', 20), 3)
+        # the main video plays every frame
+        self.assertEqual(self.videoLib.frameRate('box.mp4', 40), 30.0)
@@ -0,0 +1,46 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+
+from dictionary.video_meta import (VideoMeta, loadVideoMeta, probeVideo,
+                                    fileHash, findDuplicates,
+                                    canonicalNames)
+
+VIDEO = os.path.join(os.path.dirname(__file__), os.pardir, 'dictionary',
+                     'videofiles', '0:0.mp4')
+
+
+class VideoMetaTest(unittest.TestCase):
+
+    def test_probeVideo(self):
+        name, meta = probeVideo(VIDEO)
+        self.assertEqual(name, '0:0.mp4')
+        self.assertEqual((meta.width, meta.height), (400, 250))
+        self.assertEqual(meta.frames, 95)
+        self.assertAlmostEqual(meta.duration, meta.frames / meta.fps)
+        self.assertEqual(meta.size, os.path.getsize(VIDEO))
+        self.assertEqual(meta.hash, fileHash(VIDEO))
+        self.assertEqual(len(meta.hash), 40)
+
+    def test_loadVideoMeta(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dbpath = os.path.join(tmpdir, 'test.db')
+            self.assertEqual(loadVideoMeta(dbpath), {})
+            with sqlite3.connect(dbpath) as conn:
+                conn.execute('CREATE TABLE videometa(videofile, width, \
+                              height, fps, frames, duration, size, hash)')
+                conn.execute('INSERT INTO videometa VALUES \
+                              (?, ?, ?, ?, ?, ?, ?, ?)',
+                             ('box.mp4', 400, 250, 25.0, 95, 3.8, 7322, 'ab'))
+            self.assertEqual(loadVideoMeta(dbpath),
+                             {'box.mp4': VideoMeta(400, 250, 25.0, 95, 3.8,
+                                                   7322, 'ab')})
+
+    def test_findDuplicates(self):
+        meta = {name: VideoMeta(400, 250, 25.0, 95, 3.8, 100, digest)
+                for name, digest in [('c.mp4', 'x'), ('a.mp4', 'x'),
+                                     ('b.mp4', 'y'), ('d.mp4', 'x')]}
+        self.assertEqual(findDuplicates(meta), {'a.mp4': ['c.mp4', 'd.mp4']})
+        self.assertEqual(canonicalNames(meta), {'c.mp4': 'a.mp4',
+                                                'd.mp4': 'a.mp4'})